@@ -6,7 +6,116 @@ import streamlit as st
 from langchain.prompts import ChatPromptTemplate, MessagesPlaceholder
 from langchain.chains import ConversationChain
 from langchain.chains.conversation.memory import ConversationBufferWindowMemory
-from config.settings import CONFIDENCE_THRESHOLDS
+from langchain_core.callbacks import BaseCallbackHandler
+from configuration.settings import CONVERSATION_MEMORY_LENGTH, RESPONSE_CACHE, LLM_SCHEDULER
+from LLM_models.response_cache import ResponseCache, CachedLLM
+from LLM_models.scheduler import ScheduledLLM, get_llm_scheduler
+import os
+import re
+
+THINK_OPEN = '<think>'
+THINK_CLOSE = '</think>'
+
+
+def strip_reasoning(text):
+    """Remove <think>...</think> reasoning blocks (including an unterminated one) from a completion"""
+    text = re.sub(r'<think>.*?(?:</think>|$)', '', text, flags=re.DOTALL)
+    return text.strip()
+
+
+class ReasoningFilter:
+    """
+    Incrementally strips <think>...</think> reasoning blocks from streamed output.
+    Text that might be the start of a tag is held back until the next chunk decides it.
+    """
+
+    def __init__(self):
+        self._buffer = ''
+        self._in_think = False
+        self._started = False
+
+    def feed(self, chunk):
+        """Consume a chunk and return the newly visible text"""
+        self._buffer += chunk
+        visible = []
+        while self._buffer:
+            if self._in_think:
+                idx = self._buffer.find(THINK_CLOSE)
+                if idx == -1:
+                    # Keep only what could be the beginning of the closing tag
+                    self._buffer = self._buffer[-(len(THINK_CLOSE) - 1):]
+                    break
+                self._buffer = self._buffer[idx + len(THINK_CLOSE):]
+                self._in_think = False
+            else:
+                idx = self._buffer.find(THINK_OPEN)
+                if idx != -1:
+                    visible.append(self._buffer[:idx])
+                    self._buffer = self._buffer[idx + len(THINK_OPEN):]
+                    self._in_think = True
+                    continue
+                held = self._partial_tag_length(self._buffer)
+                visible.append(self._buffer[:len(self._buffer) - held])
+                self._buffer = self._buffer[len(self._buffer) - held:]
+                break
+        return self._emit(''.join(visible))
+
+    def flush(self):
+        """Return any held-back text once the stream has ended"""
+        remaining = '' if self._in_think else self._buffer
+        self._buffer = ''
+        return self._emit(remaining)
+
+    def _emit(self, text):
+        # Drop the whitespace models leave between the reasoning block and the answer
+        if not self._started:
+            text = text.lstrip()
+            self._started = bool(text)
+        return text
+
+    @staticmethod
+    def _partial_tag_length(text):
+        for size in range(min(len(THINK_OPEN) - 1, len(text)), 0, -1):
+            if THINK_OPEN.startswith(text[-size:]):
+                return size
+        return 0
+
+
+class StreamingTextHandler(BaseCallbackHandler):
+    """
+    LangChain callback that forwards streamed tokens, minus reasoning blocks,
+    to on_text(text_so_far). Used for chains such as the conversation chain.
+    """
+
+    def __init__(self, on_text):
+        self.on_text = on_text
+        self.text = ''
+        self._filter = ReasoningFilter()
+
+    def on_llm_new_token(self, token, **kwargs):
+        visible = self._filter.feed(token)
+        if visible:
+            self.text += visible
+            self.on_text(self.text)
+
+    def on_llm_end(self, response, **kwargs):
+        visible = self._filter.flush()
+        if visible:
+            self.text += visible
+            self.on_text(self.text)
+
+
+def get_groq_api_key():
+    """GROQ_API_KEY from the environment, else from the Streamlit secrets"""
+    api_key = os.environ.get('GROQ_API_KEY')
+    if api_key:
+        return api_key
+    try:
+        return st.secrets["GROQ_API_KEY"]
+    except Exception:
+        # Outside Streamlit there may be no secrets file at all
+        raise RuntimeError("GROQ_API_KEY is not set in the environment or the Streamlit secrets")
+
 
 class LLMManager:
     """
@@ -14,6 +123,41 @@ class LLMManager:
     Provides centralized control over LLM creation and caching.
     """
     _instances: Dict[str, ChatGroq] = {}
+    _cached_instances: Dict[str, CachedLLM] = {}
+    _response_cache: Optional[ResponseCache] = None
+    _client_factory = None  # Stand-in for ChatGroq, e.g. the fake backend used by benchmarks
+    
+    # Define base configurations for different LLM types
+    _base_configs = {
+        'evaluation': {
+            'temperature': 0.4,
+            'max_tokens': 4028,
+            'top_p': 0.95,
+            'presence_penalty': 0.6,
+            'frequency_penalty': 0.3
+        },
+        'conversation': {
+            'temperature': 0.7,
+            'max_tokens': 2000,
+            'top_p': 1.0,
+            'presence_penalty': 0.0,
+            'frequency_penalty': 0.0
+        },
+        'recommendation': {
+            'temperature': 0.5,
+            'max_tokens': 4028,
+            'top_p': 0.9,
+            'presence_penalty': 0.4,
+            'frequency_penalty': 0.4
+        },
+        'report': {
+            'temperature': 0.3,
+            'max_tokens': 4028,
+            'top_p': 0.8,
+            'presence_penalty': 0.2,
+            'frequency_penalty': 0.2
+        }
+    }
     
     @classmethod
     def get_llm(cls, llm_type: str, **kwargs) -> ChatGroq:
@@ -27,64 +171,130 @@ class LLMManager:
         Returns:
             ChatGroq: Configured LLM instance
         """
-        # Define base configurations for different LLM types
-        base_configs = {
-            'evaluation': {
-                'temperature': 0.4,
-                'max_tokens': 4028,
-                'top_p': 0.95,
-                'presence_penalty': 0.6,
-                'frequency_penalty': 0.3
-            },
-            'conversation': {
-                'temperature': 0.7,
-                'max_tokens': 2000,
-                'top_p': 1.0,
-                'presence_penalty': 0.0,
-                'frequency_penalty': 0.0
-            },
-            'recommendation': {
-                'temperature': 0.5,
-                'max_tokens': 4028,
-                'top_p': 0.9,
-                'presence_penalty': 0.4,
-                'frequency_penalty': 0.4
-            },
-            'report': {
-                'temperature': 0.3,
-                'max_tokens': 4028,
-                'top_p': 0.8,
-                'presence_penalty': 0.2,
-                'frequency_penalty': 0.2
-            }
-        }
-        
         # Create cache key based on configuration
-        config = {**base_configs.get(llm_type, {}), **kwargs}
+        config = {**cls._base_configs.get(llm_type, {}), **kwargs}
         cache_key = f"{llm_type}_{hash(frozenset(config.items()))}"
         
         # Return cached instance if it exists
         if cache_key in cls._instances:
             return cls._instances[cache_key]
         
+        # Model can be overridden per call, e.g. the conversation chain runs on llama
+        model_name = config.pop('model_name', "deepseek-r1-distill-llama-70b")
+        
         try:
             # Create new instance with provided configuration
-            llm = ChatGroq(
-                api_key=st.secrets["GROQ_API_KEY"],
-                # model_name='llama-3.3-70b-versatile',
-                model_name="deepseek-r1-distill-llama-70b",
-                **config
-            )
+            if cls._client_factory is not None:
+                llm = cls._client_factory(llm_type=llm_type, model_name=model_name, **config)
+            else:
+                if LLM_SCHEDULER['enabled']:
+                    # Retries are handled by the scheduler, with backoff shared across sessions
+                    config.setdefault('max_retries', 0)
+                llm = ChatGroq(
+                    api_key=get_groq_api_key(),
+                    model_name=model_name,
+                    **config
+                )
             cls._instances[cache_key] = llm
             return llm
             
         except Exception as e:
             raise RuntimeError(f"Failed to create LLM instance: {str(e)}")
     
+    @classmethod
+    def set_client_factory(cls, factory):
+        """
+        Replace ChatGroq as the client class, e.g. with a local fake backend.
+        factory(llm_type=..., model_name=..., **config) must return a LangChain chat model.
+        Pass None to go back to Groq.
+        """
+        cls._client_factory = factory
+        cls.clear_cache()
+    
+    @classmethod
+    def get_config(cls, llm_type: str, **kwargs) -> Dict[str, Any]:
+        """Return the effective configuration for an llm_type, e.g. to read its max_tokens budget"""
+        return {**cls._base_configs.get(llm_type, {}), **kwargs}
+    
+    @classmethod
+    def get_response_cache(cls) -> ResponseCache:
+        """Return the process-wide persistent LLM response cache"""
+        if cls._response_cache is None:
+            cls._response_cache = ResponseCache(
+                path=RESPONSE_CACHE['path'],
+                ttl_seconds=RESPONSE_CACHE['ttl_seconds'],
+                max_bytes=RESPONSE_CACHE['max_bytes']
+            )
+        return cls._response_cache
+    
+    @classmethod
+    def get_cached_llm(cls, llm_type: str, **kwargs):
+        """
+        Get an LLM whose predict() calls are served from the persistent response cache.
+        Calls that reach the model go through the process-wide LLM scheduler.
+        
+        Args:
+            llm_type: Type of LLM configuration, as for get_llm()
+            **kwargs: Optional override parameters for the LLM configuration
+            
+        Returns:
+            CachedLLM wrapping the scheduled instance, or the scheduled instance alone
+            if the response cache is disabled
+        """
+        llm = ScheduledLLM(cls.get_llm(llm_type, **kwargs), llm_type, get_llm_scheduler())
+        if not RESPONSE_CACHE['enabled']:
+            return llm
+        
+        config = {**cls._base_configs.get(llm_type, {}), **kwargs}
+        cache_key = f"{llm_type}_{hash(frozenset(config.items()))}"
+        if cache_key not in cls._cached_instances:
+            cls._cached_instances[cache_key] = CachedLLM(llm, llm_type, config, cls.get_response_cache())
+        return cls._cached_instances[cache_key]
+    
+    @classmethod
+    def stream(cls, llm, prompt, on_text=None):
+        """
+        Stream a completion token by token with reasoning blocks removed.
+        
+        Args:
+            llm: Instance from get_llm() or get_cached_llm()
+            prompt: Prompt to send
+            on_text: Optional callback receiving the visible text so far after each token
+            
+        Yields:
+            str: Newly visible text
+        """
+        reasoning_filter = ReasoningFilter()
+        text = ''
+        for chunk in llm.stream(prompt):
+            visible = reasoning_filter.feed(getattr(chunk, 'content', chunk))
+            if visible:
+                text += visible
+                if on_text:
+                    on_text(text)
+                yield visible
+        visible = reasoning_filter.flush()
+        if visible:
+            text += visible
+            if on_text:
+                on_text(text)
+            yield visible
+    
+    @classmethod
+    def predict(cls, llm, prompt, on_text=None):
+        """
+        Return the completion for prompt without reasoning blocks. When on_text is
+        given the completion is streamed and on_text receives the text so far.
+        """
+        if on_text is None:
+            return strip_reasoning(llm.predict(prompt))
+        return ''.join(cls.stream(llm, prompt, on_text)).strip()
+    
     @classmethod
     def clear_cache(cls):
         """Clear all cached LLM instances"""
         cls._instances.clear()
+        cls._cached_instances.clear()
 
 
 def determine_optimal_persona(candidate_info):
@@ -166,3 +376,43 @@ def get_persona_prompt(persona):
     ]),
 }
     return personas.get(persona, personas['Default'])
+
+
+def get_session_conversation(candidate_info, state=None):
+    """
+    Return the conversation chain for the current session, building it only once.
+    
+    The chain (and its window memory) is kept in the session state and reused
+    across reruns. It is rebuilt only when the persona selected for the
+    candidate changes, e.g. once the candidate information has been submitted.
+    
+    Args:
+        candidate_info: Candidate details used to select the persona
+        state: Mapping holding the session state (defaults to st.session_state)
+        
+    Returns:
+        ConversationChain: Session-scoped conversation chain
+    """
+    if state is None:
+        state = st.session_state
+    
+    persona = determine_optimal_persona(candidate_info)
+    conversation = state.get('conversation')
+    if conversation is not None and state.get('selected_persona') == persona:
+        return conversation
+    
+    # Streaming client so callers can render questions as they are generated
+    llm = LLMManager.get_llm('conversation', model_name='llama-3.3-70b-versatile', streaming=True)
+    memory = ConversationBufferWindowMemory(
+        k=CONVERSATION_MEMORY_LENGTH,
+        return_messages=True
+    )
+    conversation = ConversationChain(
+        llm=llm,
+        memory=memory,
+        prompt=get_persona_prompt(persona)
+    )
+    
+    state['conversation'] = conversation
+    state['selected_persona'] = persona
+    return conversation
@@ -0,0 +1,179 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+from utility.tracing import get_tracer
+
+
+class ResponseCache:
+    """
+    Persistent, content-addressed cache for LLM responses.
+    
+    Responses are stored in a local SQLite database keyed by a digest of the
+    model name, the llm_type configuration and the exact prompt. Entries expire
+    after a TTL and the least recently used ones are evicted once the store
+    grows past its size budget.
+    """
+
+    def __init__(self, path: str, ttl_seconds: float, max_bytes: int):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                response TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_last_access ON responses (last_access)")
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(model_name: str, llm_type: str, config: Dict[str, Any], prompt: str) -> str:
+        """Build the content address for a prompt sent with a given model configuration"""
+        payload = json.dumps(
+            {'model': model_name, 'llm_type': llm_type, 'config': config, 'prompt': prompt},
+            sort_keys=True,
+            default=str
+        )
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached response for key, or None if missing or expired"""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response, created FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or now - row[1] > self.ttl_seconds:
+                if row is not None:
+                    self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                    self._conn.commit()
+                self.misses += 1
+                return None
+            
+            self._conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.hits += 1
+            return row[0]
+
+    def set(self, key: str, response: str):
+        """Store a response and evict least recently used entries above the size budget"""
+        now = time.time()
+        size = len(response.encode('utf-8'))
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, response, size, created, last_access) VALUES (?, ?, ?, ?, ?)",
+                (key, response, size, now, now)
+            )
+            total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+            if total > self.max_bytes:
+                rows = self._conn.execute(
+                    "SELECT key, size FROM responses ORDER BY last_access ASC"
+                ).fetchall()
+                evicted = []
+                for old_key, old_size in rows:
+                    if total <= self.max_bytes:
+                        break
+                    evicted.append((old_key,))
+                    total -= old_size
+                self._conn.executemany("DELETE FROM responses WHERE key = ?", evicted)
+            self._conn.commit()
+
+    def invalidate(self, key: str):
+        """Drop a single entry, e.g. a response that turned out to be unusable"""
+        with self._lock:
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            self._conn.commit()
+
+    def clear(self):
+        """Remove all entries and reset the counters"""
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and current store size"""
+        with self._lock:
+            entries, total = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'entries': entries,
+            'bytes': total
+        }
+
+
+class CachedLLM:
+    """
+    Wraps an LLM returned by LLMManager and serves repeated prompts from a ResponseCache.
+    Attributes other than predict() and stream() are delegated to the wrapped LLM.
+    """
+
+    def __init__(self, llm, llm_type: str, config: Dict[str, Any], cache: ResponseCache):
+        self._llm = llm
+        self._llm_type = llm_type
+        self._config = config
+        self._cache = cache
+
+    def cache_key(self, prompt: str) -> str:
+        return self._cache.make_key(self._llm.model_name, self._llm_type, self._config, prompt)
+
+    def _record_hit(self):
+        get_tracer().record({'name': f'llm.{self._llm_type}', 'model': self._llm.model_name, 'cache_hit': True})
+
+    def predict(self, prompt: str, **kwargs) -> str:
+        key = self.cache_key(prompt)
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._record_hit()
+            return cached
+        
+        response = self._llm.predict(prompt, **kwargs)
+        if response:
+            self._cache.set(key, response)
+        return response
+
+    def stream(self, prompt: str, **kwargs):
+        """Yield the response in chunks; a cache hit is yielded in one piece"""
+        key = self.cache_key(prompt)
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._record_hit()
+            yield cached
+            return
+        
+        parts = []
+        for chunk in self._llm.stream(prompt, **kwargs):
+            parts.append(chunk.content)
+            yield chunk.content
+        response = ''.join(parts)
+        if response:
+            self._cache.set(key, response)
+
+    def invalidate(self, prompt: str):
+        """Forget the cached response for prompt so the next call goes to the model"""
+        self._cache.invalidate(self.cache_key(prompt))
+
+    def __getattr__(self, name):
+        return getattr(self._llm, name)
@@ -0,0 +1,267 @@
+import heapq
+import itertools
+import random
+import threading
+import time
+from collections import Counter
+from configuration.settings import LLM_SCHEDULER
+from utility.tracing import get_tracer
+
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+RETRYABLE_ERRORS = {'RateLimitError', 'APITimeoutError', 'APIConnectionError', 'InternalServerError'}
+
+
+class SchedulerBusyError(RuntimeError):
+    """Raised when the wait queue is full or a call waited too long for a slot"""
+
+
+class TokenBucket:
+    """Token bucket refilled continuously at per_minute / 60 per second"""
+
+    def __init__(self, per_minute):
+        self.capacity = per_minute
+        self.rate = per_minute / 60.0
+        self.level = float(per_minute)
+        self.updated = time.monotonic()
+
+    def wait_time(self, amount, now):
+        """Seconds until amount can be taken (0 if it can be taken now)"""
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+        # A call larger than the whole bucket still runs once the bucket is full
+        amount = min(amount, self.capacity)
+        return 0.0 if self.level >= amount else (amount - self.level) / self.rate
+
+    def adjust(self, amount):
+        """Take (positive) or return (negative) tokens; the level may go into debt"""
+        self.level = min(self.capacity, self.level - amount)
+
+
+def estimate_tokens(text):
+    return len(text) // LLM_SCHEDULER['chars_per_token'] + 1
+
+
+def is_retryable(error):
+    """Rate limits, timeouts and transient server errors are worth retrying"""
+    response = getattr(error, 'response', None)
+    status = getattr(error, 'status_code', None) or getattr(response, 'status_code', None)
+    if status in RETRYABLE_STATUS_CODES or type(error).__name__ in RETRYABLE_ERRORS:
+        return True
+    message = str(error).lower()
+    return 'rate limit' in message or '429' in message
+
+
+def retry_after(error):
+    """Seconds from a Retry-After header on the error's response, if any"""
+    headers = getattr(getattr(error, 'response', None), 'headers', None) or {}
+    try:
+        return float(headers.get('retry-after'))
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _record_usage(span, result):
+    """Token counts reported with the response if available, else estimated from its text"""
+    usage = getattr(result, 'usage_metadata', None)
+    if usage:
+        span['prompt_tokens'] = usage.get('input_tokens', span['prompt_tokens'])
+        span['completion_tokens'] = usage.get('output_tokens', 0)
+    else:
+        span['completion_tokens'] = estimate_tokens(_response_text(result))
+        span['estimated_tokens'] = True
+
+
+def _response_text(result):
+    if isinstance(result, str):
+        return result
+    content = getattr(result, 'content', '')
+    return content if isinstance(content, str) else ''
+
+
+class LLMScheduler:
+    """
+    Process-wide admission control for LLM calls.
+
+    Each model has a requests/minute and a tokens/minute bucket. A call reserves
+    one request and an estimate of its tokens (prompt plus an expected response
+    size, corrected once the response is in) before it is sent. Waiting calls are
+    admitted by priority class, then in arrival order, subject to a cap on calls
+    in flight. The wait queue is bounded. Calls that fail with a rate limit or a
+    transient error are retried with jittered exponential backoff. Every call is
+    traced as an llm.<llm_type> span with its token counts.
+    """
+
+    def __init__(self, settings):
+        self.settings = settings
+        self.stats = Counter()
+        self._condition = threading.Condition()
+        self._waiting = []  # Heap of (priority, arrival, model)
+        self._arrivals = itertools.count()
+        self._active = 0
+        self._buckets = {}
+
+    def _buckets_for(self, model_name):
+        if model_name not in self._buckets:
+            self._buckets[model_name] = (
+                TokenBucket(self.settings['requests_per_minute']),
+                TokenBucket(self.settings['tokens_per_minute'])
+            )
+        return self._buckets[model_name]
+
+    def _priority(self, llm_type):
+        priorities = self.settings['priorities']
+        return priorities.get(llm_type, max(priorities.values(), default=0))
+
+    def acquire(self, llm_type, model_name, tokens):
+        """Block until the call may be sent. Raises SchedulerBusyError."""
+        entry = (self._priority(llm_type), next(self._arrivals), model_name)
+        started = time.monotonic()
+        deadline = started + self.settings['queue_timeout_seconds']
+        with self._condition:
+            if len(self._waiting) >= self.settings['max_queue']:
+                self.stats['rejected'] += 1
+                raise SchedulerBusyError("Too many LLM calls waiting; try again shortly")
+            heapq.heappush(self._waiting, entry)
+            try:
+                while True:
+                    now = time.monotonic()
+                    wait = None
+                    # Only the first waiter for this model may take its budget
+                    first_for_model = min(waiter for waiter in self._waiting if waiter[2] == model_name)
+                    if first_for_model == entry and self._active < self.settings['max_concurrent']:
+                        requests, token_budget = self._buckets_for(model_name)
+                        wait = max(requests.wait_time(1, now), token_budget.wait_time(tokens, now))
+                        if wait == 0:
+                            requests.adjust(1)
+                            token_budget.adjust(tokens)
+                            self._active += 1
+                            self.stats['admitted'] += 1
+                            self.stats['wait_ms'] += int((now - started) * 1000)
+                            return
+                    if now >= deadline:
+                        self.stats['timed_out'] += 1
+                        raise SchedulerBusyError("Timed out waiting for an LLM slot")
+                    self._condition.wait(min(wait, deadline - now) if wait else deadline - now)
+            finally:
+                self._waiting.remove(entry)
+                heapq.heapify(self._waiting)
+                self._condition.notify_all()
+
+    def release(self, model_name, reserved_tokens, used_tokens):
+        """Free the call's slot and correct its token reservation"""
+        with self._condition:
+            self._active -= 1
+            self._buckets_for(model_name)[1].adjust(used_tokens - reserved_tokens)
+            self._condition.notify_all()
+
+    def _backoff(self, attempt, error):
+        ceiling = min(self.settings['backoff_max_seconds'], self.settings['backoff_base_seconds'] * 2 ** attempt)
+        self.stats['retries'] += 1
+        time.sleep(max(random.uniform(0, ceiling), retry_after(error)))
+
+    def call(self, llm_type, model_name, prompt_text, fn, *args, **kwargs):
+        """Run fn(*args, **kwargs), an LLM request for prompt_text, under the limits"""
+        prompt_tokens = estimate_tokens(prompt_text)
+        with get_tracer().span(f'llm.{llm_type}', model=model_name, prompt_tokens=prompt_tokens) as span:
+            if not self.settings['enabled']:
+                result = fn(*args, **kwargs)
+                _record_usage(span, result)
+                return result
+            
+            reserved = prompt_tokens + self.settings['completion_tokens_estimate']
+            for attempt in range(self.settings['max_retries'] + 1):
+                self.acquire(llm_type, model_name, reserved)
+                used = reserved
+                try:
+                    result = fn(*args, **kwargs)
+                    _record_usage(span, result)
+                    used = span['prompt_tokens'] + span['completion_tokens']
+                    return result
+                except Exception as e:
+                    if attempt == self.settings['max_retries'] or not is_retryable(e):
+                        raise
+                    error = e
+                finally:
+                    self.release(model_name, reserved, used)
+                span['retries'] = attempt + 1
+                self._backoff(attempt, error)
+
+    def stream(self, llm_type, model_name, prompt_text, fn, *args, **kwargs):
+        """
+        Iterate fn(*args, **kwargs), a streaming LLM request, under the limits. The
+        slot is held until the stream ends; only failures before the first chunk are retried.
+        """
+        prompt_tokens = estimate_tokens(prompt_text)
+        with get_tracer().span(f'llm.{llm_type}', model=model_name, prompt_tokens=prompt_tokens) as span:
+            if not self.settings['enabled']:
+                produced = []
+                for chunk in fn(*args, **kwargs):
+                    produced.append(_response_text(chunk))
+                    yield chunk
+                span['completion_tokens'] = estimate_tokens(''.join(produced))
+                return
+            
+            reserved = prompt_tokens + self.settings['completion_tokens_estimate']
+            for attempt in range(self.settings['max_retries'] + 1):
+                self.acquire(llm_type, model_name, reserved)
+                produced = []
+                try:
+                    for chunk in fn(*args, **kwargs):
+                        produced.append(_response_text(chunk))
+                        yield chunk
+                    return
+                except Exception as e:
+                    if produced or attempt == self.settings['max_retries'] or not is_retryable(e):
+                        raise
+                    error = e
+                finally:
+                    span['completion_tokens'] = estimate_tokens(''.join(produced)) if produced else 0
+                    self.release(model_name, reserved, prompt_tokens + span['completion_tokens'])
+                span['retries'] = attempt + 1
+                self._backoff(attempt, error)
+
+    def snapshot(self):
+        """Counters plus the current queue depth and calls in flight"""
+        with self._condition:
+            return {**self.stats, 'waiting': len(self._waiting), 'active': self._active}
+
+
+class ScheduledLLM:
+    """
+    Wraps an LLM returned by LLMManager so predict(), stream() and invoke() go
+    through the scheduler. Other attributes are delegated to the wrapped LLM.
+    """
+
+    def __init__(self, llm, llm_type, scheduler):
+        self._llm = llm
+        self._llm_type = llm_type
+        self._scheduler = scheduler
+
+    def predict(self, prompt, **kwargs):
+        return self._scheduler.call(self._llm_type, self._llm.model_name, prompt, self._llm.predict, prompt, **kwargs)
+
+    def stream(self, prompt, **kwargs):
+        return self._scheduler.stream(self._llm_type, self._llm.model_name, prompt, self._llm.stream, prompt, **kwargs)
+
+    def invoke(self, messages, **kwargs):
+        prompt_text = messages if isinstance(messages, str) else ''.join(
+            str(getattr(message, 'content', message)) for message in messages
+        )
+        return self._scheduler.call(self._llm_type, self._llm.model_name, prompt_text, self._llm.invoke, messages, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self._llm, name)
+
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def get_llm_scheduler():
+    """Return the process-wide LLM scheduler"""
+    global _scheduler
+    if _scheduler is None:
+        with _scheduler_lock:
+            if _scheduler is None:
+                _scheduler = LLMScheduler(LLM_SCHEDULER)
+    return _scheduler
@@ -1,26 +1,28 @@
 import streamlit as st # type: ignore
-from configuration.settings import CONFIDENCE_THRESHOLDS, CONVERSATION_MEMORY_LENGTH
-from utility.validators import validate_email, validate_phone, validate_tech_stack
-from utility.resume_processing import extract_text_from_resume, analyze_resume_consistency
+from configuration.settings import CONFIDENCE_THRESHOLDS
+from utility.validators import validate_email, validate_phone, validate_tech_stack, normalize_tech_stack
+from utility.resume_processing import screen_resume
+from utility.session_store import load_session, checkpoint_session, StaleSessionError
 from components.sidebar import render_sidebar
 from components.progress import create_progress_container, update_assessment_progress
-from technical_assessment.question_generation import generate_technical_questions, generate_focused_question, similar_questions
+from components.diagnostics import render_diagnostics
+from technical_assessment.question_generation import get_initial_questions, generate_focused_question
+from technical_assessment.question_dedup import DuplicateQuestionIndex
+from technical_assessment.question_bank import warm_up_question_bank
+from technical_assessment.async_evaluation import submit_evaluation, collect_evaluations, settle_pending_in_batch
+from technical_assessment.prefetch import QuestionPrefetcher
+from technical_assessment.confidence import AssessmentState
 from technical_assessment.evaluation import (
     evaluate_answer_with_llm,
     fallback_evaluation,
     generate_detailed_feedback_with_llm,
     generate_final_recommendation_with_llm,
     generate_fallback_recommendation,
-    assess_confidence_level,
     determine_focus_areas,
     extract_technical_terms
 )
-from report.report_generator import generate_report
-from LLM_models.llm_manager import determine_optimal_persona, get_persona_prompt, LLMManager
-from langchain.prompts import ChatPromptTemplate, MessagesPlaceholder
-from langchain.chains import ConversationChain
-from langchain.chains.conversation.memory import ConversationBufferWindowMemory
-from langchain_groq import ChatGroq
+from report.report_generator import generate_report, generate_text_report, assessment_digest
+from LLM_models.llm_manager import get_session_conversation, get_groq_api_key
 from datetime import datetime
 import os
 import json
@@ -28,6 +30,7 @@ import re
 import PyPDF2
 import docx
 import io
+import uuid
 
 
 # Initialize Streamlit page configuration
@@ -41,12 +44,12 @@ st.set_page_config(
 
 
 # Load environment variables securely
-if 'GROQ_API_KEY' not in st.secrets:
-    st.error('Please set the GROQ_API_KEY in your Streamlit secrets.')
+try:
+    GROQ_API_KEY = get_groq_api_key()
+except RuntimeError:
+    st.error('Please set the GROQ_API_KEY in your Streamlit secrets or environment.')
     st.stop()
 
-GROQ_API_KEY = st.secrets["GROQ_API_KEY"]
-CONVERSATION_MEMORY_LENGTH = 10
 # Initialize session state variables
 def initialize_session_state():
     session_vars = {
@@ -62,7 +65,13 @@ def initialize_session_state():
         'technical_questions': [],
         'current_question_index': 0,
         'current_answer': '',  # Add this new state variable
-        'questions_asked': 0  # Add the missing questions_asked variable
+        'questions_asked': 0,  # Add the missing questions_asked variable
+        'pending_evaluations': {},  # question -> Future for evaluations still running
+        'evaluation_feedback': {},
+        'evaluation_diagnostics': {},  # question -> problems met while evaluating the answer
+        'last_submitted_question': None,
+        'question_prefetcher': QuestionPrefetcher(),
+        'question_index': DuplicateQuestionIndex()  # Questions asked so far, for duplicate checks
     }
     
     for var, default in session_vars.items():
@@ -70,15 +79,90 @@ def initialize_session_state():
             st.session_state[var] = default
 
 
+def restore_session():
+    """
+    Resume the session named in the page URL from the session store, or start a
+    new one and put its id in the URL so a reconnect (to any replica) resumes it.
+    """
+    if 'session_id' in st.session_state:
+        return
+    session_id = st.query_params.get('session')
+    snapshot = load_session(session_id)
+    if snapshot is None:
+        session_id = uuid.uuid4().hex
+        st.query_params['session'] = session_id
+    else:
+        revision, state = snapshot
+        st.session_state.update(state)
+        st.session_state.session_revision = revision
+        # Evaluations still running when the checkpoint was taken are run again
+        for question, answer in st.session_state.answers.items():
+            if question not in st.session_state.evaluation_scores:
+                submit_evaluation(
+                    st.session_state.pending_evaluations,
+                    question,
+                    answer,
+                    st.session_state.candidate_info["Tech Stack"]
+                )
+    st.session_state.session_id = session_id
+
+
+def save_checkpoint():
+    """
+    Persist the session's progress (see utility.session_store). If the stored
+    session is ahead of this one (it was continued in another tab or replica),
+    this copy is dropped and the page reloads the stored one.
+    """
+    try:
+        checkpoint_session(st.session_state.get('session_id'), st.session_state)
+    except StaleSessionError:
+        st.session_state.clear()
+        st.rerun()
+
+
+def get_assessment():
+    """
+    The session's running confidence assessment. It is not checkpointed; after
+    a restore it is rebuilt by replaying the stored scores and answers.
+    """
+    if 'assessment' not in st.session_state:
+        st.session_state.assessment = AssessmentState.replay(
+            st.session_state.evaluation_scores,
+            st.session_state.answers,
+            resume_consistency_score=st.session_state.get('resume_consistency_score', 1.0),
+            resume_findings=st.session_state.get('resume_findings', [])
+        )
+    return st.session_state.assessment
+
+
+def collect_pending_evaluations(wait_for_all):
+    """
+    Pull finished background evaluations into the session.
+    With wait_for_all=False only the evaluations older than the most recent
+    answer are waited on, so the latest one can keep running.
+    """
+    pending = st.session_state.pending_evaluations
+    if wait_for_all:
+        wait_for = list(pending)
+    else:
+        wait_for = [q for q in pending if q != st.session_state.last_submitted_question]
+    collect_evaluations(
+        pending,
+        st.session_state.evaluation_scores,
+        st.session_state.evaluation_feedback,
+        st.session_state.answers,
+        wait_for=wait_for,
+        assessment=get_assessment(),
+        diagnostics=st.session_state.evaluation_diagnostics
+    )
+
+
 def main():
 
+    # Started once per process; the first sessions do not wait for it
+    warm_up_question_bank()
     initialize_session_state()
-    # Add at the beginning of main()
-    try:
-        llm = LLMManager.get_llm('conversation')
-    except Exception as e:
-        st.error(f"Failed to initialize AI components: {str(e)}")
-        st.stop()
+    restore_session()
     # Determine current stage for sidebar
     if not st.session_state.get('candidate_info'):
         current_stage = 'info'
@@ -102,54 +186,9 @@ def main():
     st.markdown("I'm here to help gather your profile info and ask a few technical questions based on your expertise.")
     st.markdown("Let's get started !")
 
-    # Initialize LangChain components with automated persona selection
+    # Reuse the session's conversation chain; it is rebuilt only when the persona changes
     try:
-        llm = ChatGroq(
-            api_key=GROQ_API_KEY,
-            model_name='llama-3.3-70b-versatile',
-            temperature=0.7,
-            max_tokens=2000
-        )
-
-        memory = ConversationBufferWindowMemory(
-            k=CONVERSATION_MEMORY_LENGTH,
-            return_messages=True
-        )
-
-        # Automatically select persona based on candidate's experience and position
-        def determine_optimal_persona(candidate_info):
-            if not candidate_info:
-                return 'Default'
-            
-            years_exp = candidate_info.get('Years of Experience', 0)
-            position = candidate_info.get('Desired Position', '').lower()
-            tech_stack = candidate_info.get('Tech Stack', [])
-            
-            # Senior/Architect positions or 8+ years experience get Expert persona
-            if years_exp >= 8 or any(role in position for role in ['senior', 'lead', 'architect', 'principal']):
-                return 'Expert'
-            
-            # Research/Innovation roles or complex tech stack get Analytical persona
-            if any(role in position for role in ['research', 'data', 'ml', 'ai']) or \
-               any(tech in ['machine learning', 'ai', 'data science'] for tech in tech_stack):
-                return 'Analytical'
-            
-            # Design/UI/Creative roles get Creative persona
-            if any(role in position for role in ['design', 'ui', 'ux', 'frontend', 'creative']):
-                return 'Creative'
-            
-            # Default for other cases
-            return 'Default'
-
-        # Set the persona based on candidate info
-        selected_persona = determine_optimal_persona(st.session_state.get('candidate_info', {}))
-        st.session_state.selected_persona = selected_persona
-        
-        conversation = ConversationChain(
-            llm=llm,
-            memory=memory,
-            prompt=get_persona_prompt(selected_persona)
-        )
+        conversation = get_session_conversation(st.session_state.get('candidate_info', {}))
     except Exception as e:
         st.error(f"Error initializing AI components: {str(e)}")
         st.stop()
@@ -193,30 +232,32 @@ def main():
                 if validation_errors:
                     st.error("Please fix the following errors:\n" + "\n".join(validation_errors))
                 else:
-                    resume_text = extract_text_from_resume(uploaded_file)
-                    if resume_text:
-                        consistency_score, findings = analyze_resume_consistency(
-                            resume_text,
-                            {
-                                "Full Name": full_name,
-                                "Tech Stack": [tech.strip() for tech in tech_stack.split(',') if tech.strip()],
-                                "Years of Experience": years_exp,
-                                "Desired Position": desired_position
-                            }
-                        )
-                    st.session_state.resume_consistency_score = consistency_score
-                    st.session_state.resume_findings = findings    
-                    st.session_state.candidate_info = {
-                        "Full Name": full_name,
-                        "Email": email,
-                        "Phone": phone,
-                        "Years of Experience": years_exp,
-                        "Desired Position": desired_position,
-                        "Location": location,
-                        "Tech Stack": [tech.strip() for tech in tech_stack.split(',') if tech.strip()]
-                    }
-                    st.success('Information submitted successfully! 🎉')
-                    st.rerun()
+                    # Resubmissions of the same file are served from the resume cache
+                    resume_text, consistency_score, findings, diagnostics = screen_resume(
+                        uploaded_file,
+                        {
+                            "Full Name": full_name,
+                            "Tech Stack": normalize_tech_stack(tech_stack),
+                            "Years of Experience": years_exp,
+                            "Desired Position": desired_position
+                        }
+                    )
+                    render_diagnostics(diagnostics)
+                    if consistency_score is not None:
+                        st.session_state.resume_consistency_score = consistency_score
+                        st.session_state.resume_findings = findings    
+                        st.session_state.candidate_info = {
+                            "Full Name": full_name,
+                            "Email": email,
+                            "Phone": phone,
+                            "Years of Experience": years_exp,
+                            "Desired Position": desired_position,
+                            "Location": location,
+                            "Tech Stack": normalize_tech_stack(tech_stack)
+                        }
+                        save_checkpoint()
+                        st.success('Information submitted successfully! 🎉')
+                        st.rerun()
 
         st.markdown("*Required fields are marked with an asterisk (\*)")
 
@@ -237,17 +278,24 @@ def main():
         # Add early completion option with hidden confidence
         if st.session_state.questions_asked > 0:
             if st.button('Complete Assessment Early 🎯', help='Finish the assessment now with current results'):
-                confidence, decision, _, _, reasoning = assess_confidence_level(
+                # Score any answers still queued in a single batched call
+                settle_pending_in_batch(
+                    st.session_state.pending_evaluations,
                     st.session_state.evaluation_scores,
+                    st.session_state.evaluation_feedback,
                     st.session_state.answers,
-                    conversation
+                    st.session_state.candidate_info["Tech Stack"],
+                    assessment=get_assessment(),
+                    diagnostics=st.session_state.evaluation_diagnostics
                 )
+                confidence, decision, _, _, reasoning = get_assessment().assess()
                 
                 # Update internal state without displaying
                 st.session_state.confidence_level = confidence
                 st.session_state.current_decision = decision
                 st.session_state.assessment_completed = True
                 st.session_state.final_reasoning = reasoning
+                save_checkpoint()
                 
                 # Show completion confirmation without revealing confidence
                 st.success("Assessment completed successfully!")
@@ -260,21 +308,25 @@ def main():
         if not st.session_state.current_question:
             if st.session_state.questions_asked == 0:
                 # Initial questions generation
-                tech_stack_str = ', '.join(st.session_state.candidate_info["Tech Stack"])
-                technical_questions = generate_technical_questions(tech_stack_str, conversation)
+                # Served from the question bank when it covers the stack, else generated
+                technical_questions, diagnostics = get_initial_questions(
+                    st.session_state.candidate_info["Tech Stack"], conversation
+                )
                 if not technical_questions:
+                    render_diagnostics(diagnostics)
                     st.error("No technical questions generated. Please check the tech stack and try again.")
                     st.stop()
                 st.session_state.technical_questions = technical_questions
                 st.session_state.current_question_index = 0
                 st.session_state.current_question = technical_questions[0]
+                save_checkpoint()
             else:
+                # Scores from earlier answers are needed now; the latest answer
+                # may still be evaluating while the next question is prepared
+                collect_pending_evaluations(wait_for_all=False)
+                
                 # Generate focused question based on confidence assessment
-                confidence, decision, need_more, focus_areas, reasoning = assess_confidence_level(
-                    st.session_state.evaluation_scores,
-                    st.session_state.answers,
-                    conversation
-                )
+                confidence, decision, need_more, focus_areas, reasoning = get_assessment().assess()
                 
                 # Update internal state without displaying
                 st.session_state.confidence_level = confidence
@@ -284,18 +336,58 @@ def main():
                 if not need_more or st.session_state.questions_asked >= 15:
                     st.session_state.assessment_completed = True
                     st.session_state.final_reasoning = reasoning
+                    save_checkpoint()
                     st.success("Assessment completed successfully!")
                     st.rerun()
                 
-                # Generate next question
+                # Use the prefetched question when it matches, otherwise generate it now
                 previous_questions = list(st.session_state.answers.keys())
-                new_question = generate_focused_question(
-                    st.session_state.candidate_info["Tech Stack"],
+                new_question = st.session_state.question_prefetcher.take(
                     focus_areas,
                     previous_questions,
-                    conversation
+                    conversation,
+                    duplicate_index=st.session_state.question_index
                 )
+                if new_question is None:
+                    # Stream the question while it is generated
+                    question_placeholder = st.empty()
+                    new_question = generate_focused_question(
+                        st.session_state.candidate_info["Tech Stack"],
+                        focus_areas,
+                        previous_questions,
+                        conversation,
+                        on_text=question_placeholder.markdown,
+                        duplicate_index=st.session_state.question_index
+                    )
+                    question_placeholder.empty()
                 st.session_state.current_question = new_question
+                save_checkpoint()
+        
+        # Prepare the likely next question while the candidate types their answer
+        if st.session_state.questions_asked + 1 < 15:
+            st.session_state.question_prefetcher.schedule(
+                st.session_state.current_question,
+                st.session_state.candidate_info["Tech Stack"],
+                st.session_state.evaluation_scores,
+                st.session_state.answers,
+                conversation
+            )
+        
+        # Show feedback for the previous answer once its evaluation has landed
+        last_question = st.session_state.last_submitted_question
+        if last_question in st.session_state.evaluation_feedback:
+            render_diagnostics(st.session_state.evaluation_diagnostics.get(last_question, []))
+            score = st.session_state.evaluation_scores[last_question]
+            if score >= 0.8:
+                st.success("Excellent answer! 🌟")
+            elif score >= 0.6:
+                st.info("Good answer with room for improvement.")
+            else:
+                st.warning("The answer needs more detail and technical depth.")
+            
+            with st.expander("View Detailed Feedback"):
+                for point in st.session_state.evaluation_feedback[last_question]:
+                    st.write(f"• {point}")
         
         # Display current question and handle response
         st.subheader(f'Question {st.session_state.questions_asked + 1}')
@@ -314,31 +406,22 @@ def main():
                 else:
                     question = st.session_state.current_question
                     st.session_state.answers[question] = answer
+                    get_assessment().record_answer(question, answer)
                     
-                    # Evaluate answer
-                    score, feedback = evaluate_answer_with_llm(
+                    # Evaluate answer in the background and move on to the next question
+                    submit_evaluation(
+                        st.session_state.pending_evaluations,
                         question,
                         answer,
                         st.session_state.candidate_info["Tech Stack"]
                     )
-                    st.session_state.evaluation_scores[question] = score
-                    
-                    # Show feedback
-                    if score >= 0.8:
-                        st.success("Excellent answer! 🌟")
-                    elif score >= 0.6:
-                        st.info("Good answer with room for improvement.")
-                    else:
-                        st.warning("The answer needs more detail and technical depth.")
-                    
-                    with st.expander("View Detailed Feedback"):
-                        for point in feedback:
-                            st.write(f"• {point}")
+                    st.session_state.last_submitted_question = question
                     
                     # Update assessment state
                     st.session_state.questions_asked += 1
                     st.session_state.current_question = None
                     st.session_state.current_answer = ''
+                    save_checkpoint()
                     st.rerun()
         
         with col2:
@@ -346,21 +429,25 @@ def main():
                 question = st.session_state.current_question
                 st.session_state.answers[question] = "Skipped"
                 st.session_state.evaluation_scores[question] = 0.0
+                get_assessment().record_answer(question, "Skipped")
+                get_assessment().record_score(question, 0.0)
                 st.session_state.questions_asked += 1
                 st.session_state.current_question = None
                 st.session_state.current_answer = ''
                 
-                # Count skipped questions
-                skipped_count = sum(1 for ans in st.session_state.answers.values() if ans == "Skipped")
-                if skipped_count >= CONFIDENCE_THRESHOLDS['skip_threshold']:
+                if get_assessment().skipped_count >= CONFIDENCE_THRESHOLDS['skip_threshold']:
                     st.warning("Too many questions skipped. Completing assessment.")
                     st.session_state.current_decision = "No Hire"
                     st.session_state.assessment_completed = True
+                save_checkpoint()
                 st.rerun()
     # Phase 3: Final Report and Recommendation
     else:
         st.header('📈 Assessment Report')
 
+        # The report needs every score, so wait for any evaluations still running
+        collect_pending_evaluations(wait_for_all=True)
+
         # Calculate overall metrics
         if st.session_state.evaluation_scores:
             total_score = sum(st.session_state.evaluation_scores.values())
@@ -369,17 +456,17 @@ def main():
         else:
             avg_score = 0
 
-        # Generate recommendation based on comprehensive evaluation
-        if len(st.session_state.evaluation_scores) > 0:
-            recommendation = generate_final_recommendation_with_llm(
-                st.session_state.candidate_info,
-                st.session_state.answers,
-                st.session_state.evaluation_scores
-            )
-        else:
-            recommendation = "No questions evaluated yet."
+        # Recommendation and reports are generated once per assessment; reruns (e.g. the
+        # download buttons) are served from the report-stage cache
+        digest = assessment_digest(
+            st.session_state.candidate_info,
+            st.session_state.answers,
+            st.session_state.evaluation_scores
+        )
+        report_cache = st.session_state.get('report_cache')
+        if report_cache and report_cache['digest'] != digest:
+            report_cache = None
 
-        st.session_state.recommendation = recommendation
         # Display candidate information
         st.subheader('👤 Candidate Information')
         for key, value in st.session_state.candidate_info.items():
@@ -423,48 +510,59 @@ def main():
                 st.progress(score)
                 st.write(f"Score: {score*100:.1f}%")
 
-        # Display recommendation
+        # Display recommendation, streaming it the first time it is generated
         st.subheader('🎯 Recommendation')
-        st.write(recommendation)
-
-        # Generate and offer report download
-        report = generate_report(
-            st.session_state.candidate_info,
-            st.session_state.answers,
-            st.session_state.evaluation_scores,
-            st.session_state.recommendation
-        )
+        if report_cache is None:
+            recommendation_placeholder = st.empty()
+            if len(st.session_state.evaluation_scores) > 0:
+                recommendation = generate_final_recommendation_with_llm(
+                    st.session_state.candidate_info,
+                    st.session_state.answers,
+                    st.session_state.evaluation_scores,
+                    on_text=recommendation_placeholder.markdown
+                )
+            else:
+                recommendation = "No questions evaluated yet."
+            recommendation_placeholder.write(recommendation)
+
+            with st.spinner('Preparing report...'):
+                report_cache = {
+                    'digest': digest,
+                    'recommendation': recommendation,
+                    'report': generate_report(
+                        st.session_state.candidate_info,
+                        st.session_state.answers,
+                        st.session_state.evaluation_scores,
+                        recommendation
+                    ),
+                    'text_report': generate_text_report(
+                        st.session_state.candidate_info,
+                        st.session_state.answers,
+                        st.session_state.technical_questions,
+                        avg_score,
+                        recommendation
+                    )
+                }
+            st.session_state.report_cache = report_cache
+            save_checkpoint()
+        else:
+            st.write(report_cache['recommendation'])
+        st.session_state.recommendation = report_cache['recommendation']
 
-        # Add download buttons for different formats
+        # Offer report download in different formats
         col1, col2 = st.columns(2)
         with col1:
             st.download_button(
                 label='Download JSON Report 📥',
-                data=report,
+                data=report_cache['report'],
                 file_name=f"{st.session_state.candidate_info['Full Name'].replace(' ', '_')}_Assessment_Report.json",
                 mime='application/json'
             )
 
         with col2:
-            # Create PDF-friendly format
-            pdf_report = f"""
-            TalentScout Assessment Report
-            Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-
-            Candidate Information:
-            {json.dumps(st.session_state.candidate_info, indent=2)}
-
-            Technical Assessment Results:
-            Average Score: {avg_score*100:.1f}%
-            Questions Completed: {len(st.session_state.answers)}/{len(st.session_state.technical_questions)}
-
-            Recommendation:
-            {recommendation}
-            """
-
             st.download_button(
                 label='Download Text Report 📄',
-                data=pdf_report,
+                data=report_cache['text_report'],
                 file_name=f"{st.session_state.candidate_info['Full Name'].replace(' ', '_')}_Assessment_Report.txt",
                 mime='text/plain'
             )
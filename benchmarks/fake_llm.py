@@ -0,0 +1,124 @@
+"""
+Local stand-in for ChatGroq used by the load-testing harness.
+
+Responses are canned per prompt type (question sets, focused questions,
+evaluations, recommendations, reports) so the app's parsing code runs as it
+would against Groq. Latency, jitter, error rate and an optional <think>
+preamble are configurable.
+"""
+import json
+import random
+import time
+from typing import Any, Iterator, List, Optional
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+
+class FakeRateLimitError(Exception):
+    """Raised to simulate Groq rejecting a request"""
+
+
+class FakeChatGroq(BaseChatModel):
+    model_name: str = 'fake-groq'
+    temperature: float = 0.7
+    max_tokens: int = 2000
+    streaming: bool = False
+    latency_ms: float = 300.0
+    jitter_ms: float = 100.0
+    error_rate: float = 0.0
+    reasoning_words: int = 0
+    words_per_chunk: int = 3
+
+    @property
+    def _llm_type(self) -> str:
+        return 'fake-groq'
+
+    def _respond(self, messages: List[BaseMessage]) -> str:
+        delay = max(0.0, random.gauss(self.latency_ms, self.jitter_ms)) / 1000
+        time.sleep(delay)
+        if random.random() < self.error_rate:
+            raise FakeRateLimitError('Rate limit reached for model (429)')
+
+        response = canned_response(messages[-1].content if messages else '')
+        if self.reasoning_words:
+            response = '<think>\n' + ' '.join(['hmm'] * self.reasoning_words) + '\n</think>\n\n' + response
+        return response
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                  run_manager=None, **kwargs: Any) -> ChatResult:
+        if self.streaming:
+            text = ''.join(chunk.text for chunk in self._stream(messages, stop, run_manager, **kwargs))
+        else:
+            text = self._respond(messages)
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=text))])
+
+    def _stream(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                run_manager=None, **kwargs: Any) -> Iterator[ChatGenerationChunk]:
+        words = self._respond(messages).split(' ')
+        for start in range(0, len(words), self.words_per_chunk):
+            piece = ' '.join(words[start:start + self.words_per_chunk])
+            if start + self.words_per_chunk < len(words):
+                piece += ' '
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=piece))
+            if run_manager:
+                run_manager.on_llm_new_token(piece, chunk=chunk)
+            yield chunk
+
+
+def _rubric(index=None):
+    evaluation = {
+        key: {'score': random.randint(40, 98), 'feedback': f'Simulated feedback on {key.replace("_", " ")}.'}
+        for key in ('technical_accuracy', 'completeness', 'clarity', 'best_practices')
+    }
+    evaluation['overall_feedback'] = 'Simulated overall feedback.'
+    if index is not None:
+        evaluation = {'index': index, **evaluation}
+    return evaluation
+
+
+def canned_response(prompt: str) -> str:
+    """Pick a plausible response for the kind of prompt the app sent"""
+    if 'generate 5 questions' in prompt:
+        return '\n'.join(
+            f'Question {n}: Simulated question {n} about algorithm design and database performance?'
+            for n in range(1, 6)
+        )
+    if 'ONE focused technical question' in prompt:
+        return f'How would you approach scalability testing for scenario {random.randint(1, 10**6)}?'
+    if 'JSON array with one object per answer' in prompt:
+        count = prompt.count("Candidate's Answer:")
+        return json.dumps([_rubric(n) for n in range(1, count + 1)], indent=2)
+    if 'exact JSON format' in prompt:
+        return '```json\n' + json.dumps(_rubric(), indent=4) + '\n```'
+    if 'hiring recommendation' in prompt:
+        return (
+            '1. RECOMMENDATION: Hire\n\n2. JUSTIFICATION:\n- Simulated justification\n\n'
+            '3. KEY STRENGTHS:\n- One\n- Two\n- Three\n\n4. AREAS FOR IMPROVEMENT:\n- One\n- Two\n\n'
+            '5. SUGGESTED NEXT STEPS:\n- One\n- Two\n- Three'
+        )
+    if 'assessment report' in prompt:
+        return json.dumps({
+            'Executive Summary': 'Simulated summary.',
+            'Technical Evaluation': 'Simulated evaluation.',
+            'Key Observations': ['Simulated observation.'],
+            'Next Steps': ['Simulated next step.']
+        })
+    return 'Simulated response.'
+
+
+def make_client_factory(**options):
+    """
+    Build a factory for LLMManager.set_client_factory() with the given latency/error
+    options. Clients report fake-<model> so their responses never share a response
+    cache key with the real model.
+    """
+    def factory(llm_type, model_name, **config):
+        return FakeChatGroq(
+            model_name=f'fake-{model_name}',
+            temperature=config.get('temperature', 0.7),
+            max_tokens=config.get('max_tokens', 2000),
+            streaming=config.get('streaming', False),
+            **options
+        )
+    return factory
@@ -0,0 +1,239 @@
+"""
+Load test for the assessment pipeline against a local fake LLM backend.
+
+Drives N simulated candidates concurrently through information gathering
+(resume analysis), question generation, answer evaluation and the report
+phase, with ChatGroq replaced by benchmarks.fake_llm.FakeChatGroq behind
+LLMManager. Reports throughput, p50/p95/p99 latency per phase and memory
+retained per session, plus the LLM scheduler's admission and retry
+counters. No Groq quota is used.
+
+Every persistent store (response cache, resume cache, question bank and
+pools, session store, trace files) is pointed at a temporary directory for
+the run, and fake clients report a fake-<model> name, so simulated output can
+never be served to real candidates.
+
+Usage:
+    python -m benchmarks.load_test --candidates 50 --concurrency 10 --latency-ms 400 --error-rate 0.02
+"""
+import argparse
+import json
+import os
+import random
+import tempfile
+import threading
+import time
+import tracemalloc
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from configuration.settings import (
+    RESPONSE_CACHE, RESUME_CACHE, QUESTION_BANK, QUESTION_POOLS, SESSION_STORE, TRACING, LLM_SCHEDULER
+)
+from LLM_models.llm_manager import LLMManager, get_session_conversation
+from LLM_models.scheduler import get_llm_scheduler
+from utility.tracing import percentile
+from benchmarks.fake_llm import make_client_factory
+from utility.resume_processing import analyze_resume_consistency
+from technical_assessment.question_generation import generate_technical_questions, generate_focused_question
+from technical_assessment.evaluation import (
+    evaluate_answer,
+    generate_final_recommendation_with_llm
+)
+from technical_assessment.confidence import AssessmentState
+from report.report_generator import generate_report
+
+TECH_STACKS = [
+    ['Python', 'Django', 'PostgreSQL'],
+    ['JavaScript', 'React', 'Node.js'],
+    ['Java', 'Spring', 'Kubernetes'],
+    ['Go', 'Docker', 'AWS']
+]
+
+SAMPLE_ANSWER = (
+    "I would start by profiling the slow path, then pick an algorithm with better complexity, "
+    "add an index to the database query and cache results, and verify the optimization with tests."
+)
+
+
+class PhaseTimer:
+    """Thread-safe collection of per-phase latencies"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.samples = defaultdict(list)
+
+    def record(self, phase, seconds):
+        with self._lock:
+            self.samples[phase].append(seconds)
+
+    def time(self, phase, fn, *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            self.record(phase, time.perf_counter() - started)
+
+
+def synthetic_resume(candidate_info):
+    """Resume text roughly the size of a two-page CV"""
+    skills = ', '.join(candidate_info['Tech Stack'])
+    return (
+        f"{candidate_info['Full Name']}\nSenior Software Engineer with {candidate_info['Years of Experience']} "
+        f"years of experience building backend services.\nSkills: {skills}, git, docker\n"
+        "Experience\nAcme Corp, Software Engineer, 2018 - present\n"
+        + "Designed and operated distributed systems handling high traffic. " * 60
+    )
+
+
+def run_candidate(candidate_id, questions, timer):
+    """Simulate one candidate end to end; returns the session state kept by the app"""
+    state = {}
+    candidate_info = {
+        "Full Name": f"Candidate {candidate_id}",
+        "Tech Stack": random.choice(TECH_STACKS),
+        "Years of Experience": random.randint(1, 12),
+        "Desired Position": random.choice(['Backend Engineer', 'Senior Developer', 'Data Engineer'])
+    }
+
+    # Phase 1: information gathering
+    state['resume_consistency_score'], state['resume_findings'] = timer.time(
+        'resume_analysis', analyze_resume_consistency, synthetic_resume(candidate_info), candidate_info
+    )
+    state['candidate_info'] = candidate_info
+
+    # Phase 2: question generation and evaluation
+    conversation = get_session_conversation(candidate_info, state)
+    technical_questions = timer.time(
+        'question_generation', generate_technical_questions, ', '.join(candidate_info['Tech Stack']), conversation
+    ).questions
+    answers, scores = {}, {}
+    assessment = AssessmentState(state['resume_consistency_score'], state['resume_findings'])
+    question = technical_questions[0] if technical_questions else 'Fallback question'
+    for asked in range(questions):
+        answers[question] = SAMPLE_ANSWER
+        evaluation = timer.time(
+            'evaluation', evaluate_answer, question, SAMPLE_ANSWER, candidate_info['Tech Stack']
+        )
+        scores[question] = evaluation.score
+        assessment.record_answer(question, SAMPLE_ANSWER)
+        assessment.record_score(question, scores[question])
+        if asked + 1 == questions:
+            break
+        _, _, need_more, focus_areas, _ = assessment.assess()
+        if not need_more:
+            break
+        question = timer.time(
+            'focused_question', generate_focused_question,
+            candidate_info['Tech Stack'], focus_areas, list(answers.keys()), conversation
+        )
+
+    # Phase 3: recommendation and report
+    recommendation = timer.time(
+        'recommendation', generate_final_recommendation_with_llm, candidate_info, answers, scores
+    )
+    state['report'] = timer.time('report', generate_report, candidate_info, answers, scores, recommendation)
+    state.update(answers=answers, evaluation_scores=scores, technical_questions=technical_questions)
+    return state
+
+
+def run_load_test(candidates, concurrency, questions):
+    timer = PhaseTimer()
+    tracemalloc.start()
+    baseline, _ = tracemalloc.get_traced_memory()
+
+    def session(candidate_id):
+        started = time.perf_counter()
+        try:
+            state = run_candidate(candidate_id, questions, timer)
+        except Exception as e:
+            timer.record('failed_session', time.perf_counter() - started)
+            return {'error': str(e)}
+        timer.record('session', time.perf_counter() - started)
+        return state
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        sessions = list(pool.map(session, range(candidates)))
+    elapsed = time.perf_counter() - started
+
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    completed = len(timer.samples['session'])
+    return {
+        'candidates': candidates,
+        'concurrency': concurrency,
+        'completed_sessions': completed,
+        'failed_sessions': len(timer.samples['failed_session']),
+        'elapsed_seconds': round(elapsed, 3),
+        'throughput_sessions_per_second': round(completed / elapsed, 3) if elapsed else 0.0,
+        'memory': {
+            'retained_per_session_kib': round((current - baseline) / max(len(sessions), 1) / 1024, 1),
+            'peak_kib': round((peak - baseline) / 1024, 1)
+        },
+        'phases': {
+            phase: {
+                'count': len(samples),
+                'p50_ms': round(percentile(samples, 50) * 1000, 1),
+                'p95_ms': round(percentile(samples, 95) * 1000, 1),
+                'p99_ms': round(percentile(samples, 99) * 1000, 1)
+            }
+            for phase, samples in sorted(timer.samples.items())
+        },
+        'scheduler': get_llm_scheduler().snapshot()
+    }
+
+
+def isolate_stores(directory):
+    """Point every persistent store at directory so the run leaves production data untouched"""
+    RESPONSE_CACHE['path'] = os.path.join(directory, 'llm_responses.sqlite3')
+    RESUME_CACHE['directory'] = os.path.join(directory, 'resumes')
+    QUESTION_BANK['path'] = os.path.join(directory, 'question_bank')
+    QUESTION_POOLS['path'] = os.path.join(directory, 'question_pools.sqlite3')
+    SESSION_STORE.update(backend='sqlite', path=os.path.join(directory, 'sessions.sqlite3'))
+    TRACING.update(
+        jsonl_path=os.path.join(directory, 'traces.jsonl'),
+        prometheus_path=os.path.join(directory, 'metrics.prom')
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Load-test the assessment pipeline against a fake LLM backend.')
+    parser.add_argument('--candidates', type=int, default=20, help='Simulated candidates')
+    parser.add_argument('--concurrency', type=int, default=5, help='Candidates running at the same time')
+    parser.add_argument('--questions', type=int, default=5, help='Questions answered per candidate')
+    parser.add_argument('--latency-ms', type=float, default=300.0, help='Mean fake LLM latency')
+    parser.add_argument('--jitter-ms', type=float, default=100.0, help='Standard deviation of the latency')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Fraction of LLM calls that fail')
+    parser.add_argument('--reasoning-words', type=int, default=0, help='Length of a simulated <think> preamble')
+    parser.add_argument('--use-response-cache', action='store_true', help='Enable the LLM response cache (a temporary one for this run)')
+    parser.add_argument('--no-scheduler', action='store_true', help='Send LLM calls without rate limiting or retries')
+    parser.add_argument('--requests-per-minute', type=int, help='Override the scheduler request limit')
+    parser.add_argument('--tokens-per-minute', type=int, help='Override the scheduler token limit')
+    parser.add_argument('--output', help='Also write the results as JSON to this file')
+    args = parser.parse_args(argv)
+
+    RESPONSE_CACHE['enabled'] = args.use_response_cache
+    LLM_SCHEDULER['enabled'] = not args.no_scheduler
+    if args.requests_per_minute:
+        LLM_SCHEDULER['requests_per_minute'] = args.requests_per_minute
+    if args.tokens_per_minute:
+        LLM_SCHEDULER['tokens_per_minute'] = args.tokens_per_minute
+    LLMManager.set_client_factory(make_client_factory(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        reasoning_words=args.reasoning_words
+    ))
+
+    with tempfile.TemporaryDirectory(prefix='load_test_') as directory:
+        isolate_stores(directory)
+        results = run_load_test(args.candidates, args.concurrency, args.questions)
+    print(json.dumps(results, indent=2))
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as output_file:
+            json.dump(results, output_file, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,145 @@
+"""
+Headless bulk pre-screening of resumes.
+
+Runs resume text extraction and the resume consistency analysis for every
+candidate in a CSV of profiles, in parallel across a process pool, and writes
+the consolidated results to a CSV or JSON Lines file.
+
+Usage:
+    python bulk_screening.py --resumes resumes/ --profiles candidates.csv --output results.csv
+
+The profiles CSV needs the columns "Full Name", "Resume" (file name inside the
+resume folder), "Tech Stack" (comma separated), "Years of Experience" and
+"Desired Position".
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from utility.resume_processing import LocalResumeFile, RESUME_MIME_TYPES, extract_resume, analyze_resume
+
+RESULT_FIELDS = [
+    'Full Name', 'Resume', 'status', 'consistency_score', 'findings', 'diagnostics',
+    'extract_seconds', 'analysis_seconds', 'total_seconds'
+]
+
+
+def load_profiles(profiles_path):
+    """Read candidate profiles from CSV into the candidate_info shape used by the app"""
+    profiles = []
+    with open(profiles_path, newline='', encoding='utf-8') as profiles_file:
+        for row in csv.DictReader(profiles_file):
+            try:
+                years_exp = int(float(row.get('Years of Experience') or 0))
+            except ValueError:
+                years_exp = 0
+            profiles.append({
+                "Full Name": (row.get('Full Name') or '').strip(),
+                "Resume": (row.get('Resume') or '').strip(),
+                "Tech Stack": [tech.strip() for tech in (row.get('Tech Stack') or '').split(',') if tech.strip()],
+                "Years of Experience": years_exp,
+                "Desired Position": (row.get('Desired Position') or '').strip()
+            })
+    return profiles
+
+
+def screen_candidate(resume_dir, profile):
+    """Worker: extract and analyze one candidate's resume. Returns a result row."""
+    started = time.perf_counter()
+    result = {'Full Name': profile['Full Name'], 'Resume': profile['Resume']}
+    resume_path = os.path.join(resume_dir, profile['Resume'])
+
+    if not profile['Resume'] or not os.path.isfile(resume_path):
+        result.update(status='missing resume', consistency_score=None, findings=[])
+        return result
+    if os.path.splitext(resume_path)[1].lower() not in RESUME_MIME_TYPES:
+        result.update(status='unsupported format', consistency_score=None, findings=[])
+        return result
+
+    # Both steps are served from the resume cache on re-runs over the same files.
+    # Candidates are already spread across processes, so each PDF is extracted as one task.
+    digest, resume_text, diagnostics = extract_resume(LocalResumeFile(resume_path), parallel=False)
+    extracted = time.perf_counter()
+    result['extract_seconds'] = round(extracted - started, 4)
+    result['diagnostics'] = [diagnostic.message for diagnostic in diagnostics]
+    if not resume_text.strip():
+        result.update(status='no text extracted', consistency_score=None, findings=[])
+        return result
+
+    complete = not any(diagnostic.code == 'resume_truncated' for diagnostic in diagnostics)
+    consistency_score, findings = analyze_resume(digest, resume_text, profile, complete=complete)
+    finished = time.perf_counter()
+    result.update(
+        status='ok',
+        consistency_score=round(consistency_score, 4),
+        findings=findings,
+        analysis_seconds=round(finished - extracted, 4),
+        total_seconds=round(finished - started, 4)
+    )
+    return result
+
+
+def write_results(results, output_path):
+    """Write results as JSON Lines (.jsonl/.json) or CSV (anything else)"""
+    if output_path.endswith(('.jsonl', '.json')):
+        with open(output_path, 'w', encoding='utf-8') as output_file:
+            for result in results:
+                output_file.write(json.dumps(result) + '\n')
+        return
+
+    with open(output_path, 'w', newline='', encoding='utf-8') as output_file:
+        writer = csv.DictWriter(output_file, fieldnames=RESULT_FIELDS, extrasaction='ignore')
+        writer.writeheader()
+        for result in results:
+            writer.writerow({
+                **result,
+                'findings': ' | '.join(result.get('findings', [])),
+                'diagnostics': ' | '.join(result.get('diagnostics', []))
+            })
+
+
+def run_screening(resume_dir, profiles, workers=None):
+    """Screen all profiles across a process pool; results keep the order of the profiles"""
+    results = [None] * len(profiles)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(screen_candidate, resume_dir, profile): index for index, profile in enumerate(profiles)}
+        for future in as_completed(futures):
+            index = futures[future]
+            try:
+                results[index] = future.result()
+            except Exception as e:
+                profile = profiles[index]
+                results[index] = {
+                    'Full Name': profile['Full Name'],
+                    'Resume': profile['Resume'],
+                    'status': f'error: {e}',
+                    'consistency_score': None,
+                    'findings': []
+                }
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Pre-screen a folder of resumes against candidate profiles.')
+    parser.add_argument('--resumes', required=True, help='Folder containing PDF/DOCX resumes')
+    parser.add_argument('--profiles', required=True, help='CSV of candidate profiles')
+    parser.add_argument('--output', default='screening_results.csv', help='Results file (.csv or .jsonl)')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes (default: CPU count)')
+    args = parser.parse_args(argv)
+
+    profiles = load_profiles(args.profiles)
+    started = time.perf_counter()
+    results = run_screening(args.resumes, profiles, args.workers)
+    elapsed = time.perf_counter() - started
+    write_results(results, args.output)
+
+    screened = sum(1 for result in results if result['status'] == 'ok')
+    print(f"Screened {screened}/{len(results)} candidates in {elapsed:.1f}s -> {args.output}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
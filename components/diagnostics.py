@@ -0,0 +1,12 @@
+import streamlit as st
+
+
+def render_diagnostics(diagnostics):
+    """Show diagnostics returned by the core API as Streamlit messages"""
+    for diagnostic in diagnostics:
+        if diagnostic.level == 'error':
+            st.error(diagnostic.message)
+        elif diagnostic.level == 'warning':
+            st.warning(diagnostic.message)
+        else:
+            st.info(diagnostic.message)
@@ -1,5 +1,7 @@
 import streamlit as st
-from config.settings import CONFIDENCE_THRESHOLDS
+from configuration.settings import CONFIDENCE_THRESHOLDS
+from utility.tracing import get_tracer
+from LLM_models.scheduler import get_llm_scheduler
 
 def create_progress_container():
     """Creates a container for progress metrics that can be updated dynamically"""
@@ -27,8 +29,8 @@ def update_assessment_progress(container, is_admin_view=False):
     """
     metrics = get_display_metrics(is_admin_view)
     
-    with container:
-        container.empty()  # Clear previous content
+    container.empty()  # Clear previous content
+    with container.container():
         col1, col2 = st.columns(2)
         
         with col1:
@@ -36,4 +38,22 @@ def update_assessment_progress(container, is_admin_view=False):
         
         if is_admin_view and "confidence_level" in metrics:
             with col2:
-                st.metric("Internal Confidence", f"{metrics['confidence_level']*100:.1f}%")    
\ No newline at end of file
+                st.metric("Internal Confidence", f"{metrics['confidence_level']*100:.1f}%")
+        
+        if is_admin_view:
+            render_pipeline_metrics()
+
+
+def render_pipeline_metrics():
+    """Admin-only table of per-stage latency, token usage and cache hit rate across recent sessions"""
+    with st.expander("Pipeline Metrics"):
+        stages = get_tracer().aggregates()
+        if not stages:
+            st.caption("No pipeline activity recorded yet.")
+            return
+        st.dataframe(stages, use_container_width=True, hide_index=True)
+        scheduler = get_llm_scheduler().snapshot()
+        st.caption(
+            f"LLM scheduler: {scheduler['active']} in flight, {scheduler['waiting']} waiting, "
+            f"{scheduler.get('retries', 0)} retries, {scheduler.get('rejected', 0) + scheduler.get('timed_out', 0)} rejected"
+        )    
\ No newline at end of file
@@ -1,3 +1,5 @@
+import os
+
 # Initialize session state variables
 def initialize_session_state():
     session_vars = {
@@ -37,4 +39,114 @@ CONFIDENCE_THRESHOLDS = {
     'experience_mismatch_penalty': -0.2 # Penalty for experience discrepancy
 }
 
-CONVERSATION_MEMORY_LENGTH = 10
\ No newline at end of file
+CONVERSATION_MEMORY_LENGTH = 10
+
+RESPONSE_CACHE = {
+    'enabled': True,
+    'path': '.cache/llm_responses.sqlite3',  # Local SQLite store for LLM responses
+    'ttl_seconds': 7 * 24 * 60 * 60,         # Entries older than a week are refetched
+    'max_bytes': 50 * 1024 * 1024            # Least recently used entries are evicted above this size
+}
+
+WORKER_POOL_SIZE = 8  # Background threads shared by all sessions for LLM work off the UI path
+
+BATCH_EVALUATION = {
+    'max_prompt_tokens': 6000,          # Prompt budget for one batched evaluation call
+    'response_tokens_per_answer': 350,  # Expected response size per answer, checked against max_tokens
+    'chars_per_token': 4                # Rough ratio used to estimate token counts
+}
+
+# Skill taxonomy data file: skills grouped by category, with aliases and parent categories
+SKILL_TAXONOMY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'skill_taxonomy.json')
+
+RESUME_CACHE = {
+    'enabled': True,
+    'directory': '.cache/resumes'  # One JSON file per uploaded resume, named by its SHA-256
+}
+
+RESUME_EXTRACTION = {
+    'max_bytes': 10 * 1024 * 1024,  # Larger uploads are rejected before parsing
+    'max_pages': 30,                # PDF pages past this are ignored
+    'max_chars': 200_000,           # Extracted text is cut off after this many characters
+    'parallel_min_pages': 8,        # PDFs with at least this many pages are split across several workers
+    'pages_per_task': 4,            # Pages extracted by one worker task
+    'workers': min(4, os.cpu_count() or 1),
+    'task_timeout_seconds': 20,     # Page ranges still running after this are dropped and their worker restarted
+    'spool_threshold_bytes': 1024 * 1024  # Non-Streamlit uploads above this are spooled to disk and mmapped
+}
+
+QUESTION_BANK = {
+    'enabled': True,
+    'path': '.cache/question_bank',             # Chroma store for questions added at runtime
+    'curated_path': 'vector_store',             # Curated Chroma store shipped with the app; only read
+    'collection': 'technical_questions',
+    'embedding_model': 'all-MiniLM-L6-v2',      # sentence-transformers model used for question embeddings
+    'max_distance': 0.75,                       # Cosine distance above which a stored question is not a match
+    'candidates_per_level': 5                   # Nearest questions per difficulty to pick one from at random
+}
+
+DUPLICATE_DETECTION = {
+    'mode': 'auto',               # 'embedding', 'minhash', or 'auto' (embeddings if sentence-transformers is installed)
+    'embedding_threshold': 0.85,  # Cosine similarity at which two questions count as duplicates
+    'hyperplane_bits': 12,        # Random-hyperplane LSH: bits per table
+    'hyperplane_tables': 6,
+    'minhash_threshold': 0.7,     # Estimated Jaccard similarity of content words; same cut-off as similar_questions
+    'minhash_bands': 16,          # 16 bands x 4 rows = 64 hash functions; pairs from ~0.5 similarity are compared
+    'minhash_rows': 4
+}
+
+QUESTION_POOLS = {
+    'enabled': True,
+    'path': '.cache/question_pools.sqlite3',  # Pre-generated questions per normalized tech stack, and stack demand
+    'top_stacks': 10,                         # Stacks the pool builder fills by default, most requested first
+    'rounds_per_stack': 4,                    # Generation rounds per stack; each adds one question per difficulty
+    'min_per_difficulty': 2                   # Pools with fewer questions at any difficulty are not served
+}
+
+# Process-wide admission control for Groq calls. Limits apply per model; set
+# them to the account's published rate limits.
+LLM_SCHEDULER = {
+    'enabled': True,
+    'requests_per_minute': 30,
+    'tokens_per_minute': 30000,
+    'max_concurrent': 8,              # Calls in flight at once across all sessions
+    'max_queue': 64,                  # Calls waiting beyond this fail fast instead of queueing
+    'queue_timeout_seconds': 60,      # Longest a call waits for a slot
+    'completion_tokens_estimate': 800,  # Reserved per call for the response, corrected once it arrives
+    'chars_per_token': 4,
+    'max_retries': 3,                 # Retries for rate-limit and transient server errors
+    'backoff_base_seconds': 1.0,      # Backoff doubles per retry; the actual sleep is a random fraction of it
+    'backoff_max_seconds': 20.0,
+    # Lower runs first: evaluations ahead of question generation, reports last,
+    # speculative prefetches only when nothing else is waiting
+    'priorities': {'evaluation': 0, 'conversation': 1, 'recommendation': 2, 'report': 3, 'prefetch': 4}
+}
+
+TRACING = {
+    'enabled': True,
+    'buffer_size': 5000,                       # Most recent spans kept in memory for the admin metrics panel
+    'jsonl_path': '.cache/traces.jsonl',       # Finished spans are appended here
+    'jsonl_max_bytes': 50 * 1024 * 1024,       # Rotated to traces.jsonl.1 (one backup kept) at this size; None to disable
+    'prometheus_path': '.cache/metrics.prom',  # Prometheus text format, e.g. for the node exporter textfile collector
+    'export_interval_seconds': 30
+}
+
+# Checkpoints of interview sessions, so a reconnecting browser resumes where it
+# left off on any replica. All replicas must share the store: a SQLite file on
+# shared storage, or Redis for replicas on different hosts.
+SESSION_STORE = {
+    'enabled': True,
+    'backend': os.environ.get('SESSION_STORE_BACKEND', 'sqlite'),  # 'sqlite' or 'redis'
+    'path': os.environ.get('SESSION_STORE_PATH', '.cache/sessions.sqlite3'),
+    'redis_url': os.environ.get('SESSION_STORE_REDIS_URL', 'redis://localhost:6379/0'),
+    'ttl_seconds': 7 * 24 * 3600  # Sessions not checkpointed for this long are discarded
+}
+
+SCREENING_API = {
+    # Clients authenticate with one of these keys (Authorization: Bearer <key> or X-API-Key);
+    # with none configured every request is refused
+    'api_keys': [key.strip() for key in os.environ.get('SCREENING_API_KEYS', '').split(',') if key.strip()],
+    'max_resume_bytes': RESUME_EXTRACTION['max_bytes'],  # Decoded size limit for resume_base64
+    'max_live_sessions': 1000,  # Sessions kept in memory per worker; others are reloaded from the session store
+    'max_questions': 15         # Same cap as the Streamlit app
+}
@@ -1,9 +1,26 @@
 import json
+import hashlib
 from datetime import datetime
-from models.llm_manager import LLMManager
+from LLM_models.llm_manager import LLMManager
+from utility.tracing import traced
 import streamlit as st
+
+def assessment_digest(candidate_info, answers, evaluation_scores):
+    """Stable digest of the assessment inputs, used to key the report-stage cache"""
+    payload = json.dumps(
+        {
+            "candidate_info": candidate_info,
+            "answers": answers,
+            "evaluation_scores": evaluation_scores
+        },
+        sort_keys=True,
+        default=str
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+@traced('report')
 def generate_report(candidate_info, answers, evaluation_scores, recommendation):
-    report_llm = LLMManager.get_llm('report')
+    report_llm = LLMManager.get_cached_llm('report')
     
     prompt = f"""
     Generate a comprehensive assessment report for:
@@ -22,8 +39,14 @@ def generate_report(candidate_info, answers, evaluation_scores, recommendation):
     """
     
     try:
-        report_content = report_llm.predict(prompt)
-        report_json = json.loads(report_content)
+        report_content = LLMManager.predict(report_llm, prompt)
+        try:
+            report_json = json.loads(report_content)
+        except json.JSONDecodeError:
+            # Don't keep serving a response that can't be parsed
+            if hasattr(report_llm, 'invalidate'):
+                report_llm.invalidate(prompt)
+            raise
         
         # Add metadata
         report_json["Report Generated"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
@@ -45,4 +68,22 @@ def generate_report(candidate_info, answers, evaluation_scores, recommendation):
                 "scores": evaluation_scores,
                 "recommendation": recommendation
             }
-        }, indent=4)
\ No newline at end of file
+        }, indent=4)
+
+
+def generate_text_report(candidate_info, answers, technical_questions, avg_score, recommendation):
+    """Build the plain-text version of the assessment report"""
+    return f"""
+            TalentScout Assessment Report
+            Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+
+            Candidate Information:
+            {json.dumps(candidate_info, indent=2)}
+
+            Technical Assessment Results:
+            Average Score: {avg_score*100:.1f}%
+            Questions Completed: {len(answers)}/{len(technical_questions)}
+
+            Recommendation:
+            {recommendation}
+            """
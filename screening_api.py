@@ -0,0 +1,441 @@
+"""
+Headless HTTP API for candidate screenings, e.g. for an applicant tracking system.
+
+Drives the same pipeline as the Streamlit app: resume screening, initial and
+focused question generation, background answer evaluation, the confidence
+assessment and the final report. Pipeline calls block, so they run in the
+server's thread pool while the event loop keeps serving other candidates; LLM
+clients and the LLM scheduler are shared by every session in the process.
+
+Each session's live state (conversation chain, running evaluations) is kept in
+memory by the worker that served it, and its progress is checkpointed to the
+session store after every step (see utility/session_store.py). Every request
+checks the cached copy against the stored revision and reloads it if another
+worker or replica has advanced the session, so workers can be scaled out as
+long as they share the store. Requests for one session are serialized within a
+worker; if two workers race, the checkpoint of the slower one is rejected and
+its request fails with 409 without changing the session. Sessions started here
+can also be opened in the app with ?session=<session_id>.
+
+Every request must carry one of the keys in SCREENING_API_KEYS (comma separated),
+as "Authorization: Bearer <key>" or "X-API-Key: <key>".
+
+Run (GROQ_API_KEY and SCREENING_API_KEYS in the environment):
+    uvicorn screening_api:app --host 0.0.0.0 --port 8000 --workers 4
+
+Endpoints:
+    POST /sessions                         Start a session: candidate details and a base64 PDF/DOCX resume
+    GET  /sessions/{session_id}/question   The current question (generated if needed), or completed
+    POST /sessions/{session_id}/answers    Answer or skip the current question
+    GET  /sessions/{session_id}/report     Decision, recommendation and report once the assessment is complete
+"""
+import asyncio
+import base64
+import binascii
+import hmac
+import io
+import json
+import os
+import threading
+import uuid
+import weakref
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from fastapi import Depends, FastAPI, Header, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, Field
+from configuration.settings import CONFIDENCE_THRESHOLDS, SCREENING_API
+from LLM_models.llm_manager import get_session_conversation
+from LLM_models.scheduler import SchedulerBusyError
+from report.report_generator import generate_report, generate_text_report, assessment_digest
+from technical_assessment.async_evaluation import submit_evaluation, collect_evaluations
+from technical_assessment.question_bank import warm_up_question_bank
+from technical_assessment.confidence import AssessmentState
+from technical_assessment.evaluation import generate_final_recommendation_with_llm
+from technical_assessment.question_dedup import DuplicateQuestionIndex
+from technical_assessment.question_generation import get_initial_questions, generate_focused_question
+from utility.resume_processing import RESUME_MIME_TYPES, screen_resume
+from utility.session_store import (
+    load_session, checkpoint_session, stored_revision, get_session_store, StaleSessionError
+)
+from utility.validators import validate_email, validate_phone, validate_tech_stack, normalize_tech_stack
+
+
+@asynccontextmanager
+async def lifespan(app):
+    # Load the question bank's embedding model before sessions need it
+    warm_up_question_bank()
+    yield
+
+
+def require_api_key(authorization: str = Header(None), x_api_key: str = Header(None)):
+    """Reject requests without one of the configured API keys"""
+    if not SCREENING_API['api_keys']:
+        raise HTTPException(status_code=503, detail='No API keys are configured; set SCREENING_API_KEYS')
+    presented = x_api_key
+    if authorization and authorization.lower().startswith('bearer '):
+        presented = authorization[len('bearer '):].strip()
+    if not presented or not any(
+        hmac.compare_digest(presented.encode('utf-8'), key.encode('utf-8')) for key in SCREENING_API['api_keys']
+    ):
+        raise HTTPException(status_code=401, detail='Invalid or missing API key', headers={'WWW-Authenticate': 'Bearer'})
+
+
+app = FastAPI(title='TalentScout Screening API', lifespan=lifespan, dependencies=[Depends(require_api_key)])
+
+
+class StartSessionRequest(BaseModel):
+    full_name: str
+    email: str
+    phone: str
+    years_of_experience: int = Field(0, ge=0, le=50)
+    desired_position: str
+    location: str
+    tech_stack: str = Field(..., description='Comma separated, e.g. "Python, Django, PostgreSQL"')
+    resume_filename: str = Field(..., description='Name of the resume file; .pdf or .docx')
+    # Rejected before decoding when the encoded resume is over the size limit
+    resume_base64: str = Field(..., max_length=4 * -(-SCREENING_API['max_resume_bytes'] // 3))
+
+
+class AnswerRequest(BaseModel):
+    answer: str = ''
+    skip: bool = False
+
+
+class UploadedResume(io.BytesIO):
+    """Resume received in a request, with the name and type attributes of a Streamlit upload"""
+
+    def __init__(self, data, name):
+        super().__init__(data)
+        self.name = name
+        self.type = RESUME_MIME_TYPES.get(os.path.splitext(name)[1].lower(), 'application/octet-stream')
+
+
+# session_id -> state dict, least recently used first; touched from the thread pool
+_live_sessions = OrderedDict()
+_live_sessions_lock = threading.Lock()
+_session_locks = weakref.WeakValueDictionary()
+
+
+def _session_lock(session_id):
+    """Requests for one session are handled one at a time"""
+    lock = _session_locks.get(session_id)
+    if lock is None:
+        lock = _session_locks[session_id] = asyncio.Lock()
+    return lock
+
+
+def _new_state(candidate_info, consistency_score, findings):
+    return {
+        'candidate_info': candidate_info,
+        'resume_consistency_score': consistency_score,
+        'resume_findings': findings,
+        'current_question': None,
+        'technical_questions': [],
+        'current_question_index': 0,
+        'questions_asked': 0,
+        'answers': {},
+        'evaluation_scores': {},
+        'evaluation_feedback': {},
+        'last_submitted_question': None,
+        'assessment_completed': False,
+        'recommendation': None
+    }
+
+
+def _attach_live_objects(state):
+    """Add the objects that are not checkpointed; answers still unscored are evaluated again"""
+    state['pending_evaluations'] = {}
+    state['evaluation_diagnostics'] = {}
+    state['question_index'] = DuplicateQuestionIndex()
+    state['assessment'] = AssessmentState.replay(
+        state['evaluation_scores'],
+        state['answers'],
+        resume_consistency_score=state.get('resume_consistency_score', 1.0),
+        resume_findings=state.get('resume_findings', [])
+    )
+    for question, answer in state['answers'].items():
+        if question not in state['evaluation_scores']:
+            submit_evaluation(state['pending_evaluations'], question, answer, state['candidate_info']["Tech Stack"])
+
+
+def _remember(session_id, state):
+    """
+    Keep a session's live state, evicting the least recently used sessions above
+    max_live_sessions. Sessions with evaluations not yet collected are kept:
+    their results are not checkpointed, so a reload would evaluate them again.
+    """
+    with _live_sessions_lock:
+        _live_sessions[session_id] = state
+        _live_sessions.move_to_end(session_id)
+        excess = len(_live_sessions) - SCREENING_API['max_live_sessions']
+        if excess > 0:
+            evictable = [
+                evicted_id for evicted_id, evicted in _live_sessions.items()
+                if evicted_id != session_id and not evicted['pending_evaluations']
+            ]
+            for evicted_id in evictable[:excess]:
+                del _live_sessions[evicted_id]
+
+
+def _forget(session_id):
+    with _live_sessions_lock:
+        _live_sessions.pop(session_id, None)
+
+
+def _get_state(session_id):
+    """
+    Live state of a session, resumed from the session store if this worker does
+    not hold it or holds an older revision than the store
+    """
+    with _live_sessions_lock:
+        state = _live_sessions.get(session_id)
+    if state is not None and get_session_store() is not None:
+        if stored_revision(session_id) != state.get('session_revision'):
+            state = None
+    if state is None:
+        snapshot = load_session(session_id)
+        if snapshot is None or not snapshot[1].get('candidate_info'):
+            raise HTTPException(status_code=404, detail='Unknown or expired session')
+        revision, state = snapshot
+        state['session_revision'] = revision
+        _attach_live_objects(state)
+    _remember(session_id, state)
+    return state
+
+
+def _checkpoint(session_id, state):
+    """
+    Save the session's progress. Without a stored checkpoint other workers would
+    serve an older copy, so a failed save fails the request and the in-memory
+    copy is dropped. A stale copy raises StaleSessionError (answered with 409).
+    """
+    try:
+        stored = checkpoint_session(session_id, state)
+    except StaleSessionError:
+        _forget(session_id)
+        raise
+    if not stored and get_session_store() is not None:
+        _forget(session_id)
+        raise HTTPException(status_code=503, detail='The session could not be saved; try again shortly')
+
+
+def _collect(state, wait_for):
+    collect_evaluations(
+        state['pending_evaluations'],
+        state['evaluation_scores'],
+        state['evaluation_feedback'],
+        state['answers'],
+        wait_for=wait_for,
+        assessment=state['assessment'],
+        diagnostics=state['evaluation_diagnostics']
+    )
+
+
+def _start_session(request):
+    validation_errors = []
+    if not request.full_name.strip():
+        validation_errors.append("Full Name is required")
+    if not validate_email(request.email):
+        validation_errors.append("Valid Email Address is required")
+    if not validate_phone(request.phone):
+        validation_errors.append("Valid Phone Number is required")
+    if not request.desired_position.strip():
+        validation_errors.append("Desired Position is required")
+    if not request.location.strip():
+        validation_errors.append("Location is required")
+    if not validate_tech_stack(request.tech_stack):
+        validation_errors.append("At least one Technology in Tech Stack is required")
+    if os.path.splitext(request.resume_filename)[1].lower() not in RESUME_MIME_TYPES:
+        validation_errors.append("Resume must be a PDF or DOCX file")
+    try:
+        resume_data = base64.b64decode(request.resume_base64, validate=True)
+    except (binascii.Error, ValueError):
+        resume_data = b''
+    if not resume_data:
+        validation_errors.append("Resume is required (base64 encoded)")
+    if validation_errors:
+        raise HTTPException(status_code=422, detail=validation_errors)
+
+    candidate_info = {
+        "Full Name": request.full_name,
+        "Email": request.email,
+        "Phone": request.phone,
+        "Years of Experience": request.years_of_experience,
+        "Desired Position": request.desired_position,
+        "Location": request.location,
+        "Tech Stack": normalize_tech_stack(request.tech_stack)
+    }
+    _, consistency_score, findings, diagnostics = screen_resume(
+        UploadedResume(resume_data, request.resume_filename), candidate_info
+    )
+    if consistency_score is None:
+        raise HTTPException(status_code=422, detail=[diagnostic.message for diagnostic in diagnostics])
+
+    session_id = uuid.uuid4().hex
+    state = _new_state(candidate_info, consistency_score, findings)
+    _attach_live_objects(state)
+    _checkpoint(session_id, state)
+    _remember(session_id, state)
+    return {
+        'session_id': session_id,
+        'resume_consistency_score': consistency_score,
+        'resume_findings': findings
+    }
+
+
+def _next_question(state, session_id):
+    """Mirrors the question step of the app: initial questions first, then focused ones"""
+    if not state['assessment_completed'] and not state['current_question']:
+        conversation = get_session_conversation(state['candidate_info'], state=state)
+        tech_stack = state['candidate_info']["Tech Stack"]
+        if state['questions_asked'] == 0:
+            technical_questions, diagnostics = get_initial_questions(tech_stack, conversation)
+            if not technical_questions:
+                raise HTTPException(
+                    status_code=502,
+                    detail=['No technical questions could be generated'] + [d.message for d in diagnostics]
+                )
+            state['technical_questions'] = technical_questions
+            state['current_question_index'] = 0
+            state['current_question'] = technical_questions[0]
+        else:
+            # The latest answer may still be evaluating; earlier scores are needed now
+            _collect(state, [q for q in state['pending_evaluations'] if q != state['last_submitted_question']])
+            confidence, decision, need_more, focus_areas, reasoning = state['assessment'].assess()
+            state['confidence_level'] = confidence
+            state['current_decision'] = decision
+            if not need_more or state['questions_asked'] >= SCREENING_API['max_questions']:
+                state['assessment_completed'] = True
+                state['final_reasoning'] = reasoning
+            else:
+                state['current_question'] = generate_focused_question(
+                    tech_stack,
+                    focus_areas,
+                    list(state['answers'].keys()),
+                    conversation,
+                    duplicate_index=state['question_index']
+                )
+        _checkpoint(session_id, state)
+
+    if state['assessment_completed']:
+        return {'session_id': session_id, 'completed': True, 'questions_asked': state['questions_asked']}
+    return {
+        'session_id': session_id,
+        'completed': False,
+        'question_number': state['questions_asked'] + 1,
+        'question': state['current_question']
+    }
+
+
+def _submit_answer(state, session_id, request):
+    if state['assessment_completed']:
+        raise HTTPException(status_code=409, detail='The assessment is already complete')
+    question = state['current_question']
+    if not question:
+        raise HTTPException(status_code=409, detail='No question is open; fetch the next question first')
+
+    if request.skip:
+        state['answers'][question] = "Skipped"
+        state['evaluation_scores'][question] = 0.0
+        state['assessment'].record_answer(question, "Skipped")
+        state['assessment'].record_score(question, 0.0)
+        if state['assessment'].skipped_count >= CONFIDENCE_THRESHOLDS['skip_threshold']:
+            state['current_decision'] = "No Hire"
+            state['assessment_completed'] = True
+    else:
+        if not request.answer.strip():
+            raise HTTPException(status_code=422, detail='Please provide an answer, or set skip')
+        state['answers'][question] = request.answer
+        state['assessment'].record_answer(question, request.answer)
+        # Evaluated in the background; the score is collected when the next question is prepared
+        submit_evaluation(state['pending_evaluations'], question, request.answer, state['candidate_info']["Tech Stack"])
+        state['last_submitted_question'] = question
+
+    state['questions_asked'] += 1
+    state['current_question'] = None
+    _checkpoint(session_id, state)
+    return {
+        'session_id': session_id,
+        'questions_asked': state['questions_asked'],
+        'completed': state['assessment_completed']
+    }
+
+
+def _report(state, session_id):
+    if not state['assessment_completed']:
+        raise HTTPException(status_code=409, detail='The assessment is still in progress')
+
+    # The report needs every score
+    _collect(state, list(state['pending_evaluations']))
+    candidate_info, answers, scores = state['candidate_info'], state['answers'], state['evaluation_scores']
+    total_questions = len(state['technical_questions'])
+    avg_score = sum(scores.values()) / total_questions if scores and total_questions > 0 else 0
+
+    # Same cache as the app's report stage, so either can serve a finished session
+    digest = assessment_digest(candidate_info, answers, scores)
+    report_cache = state.get('report_cache')
+    if not report_cache or report_cache['digest'] != digest:
+        if scores:
+            recommendation = generate_final_recommendation_with_llm(candidate_info, answers, scores)
+        else:
+            recommendation = "No questions evaluated yet."
+        report_cache = {
+            'digest': digest,
+            'recommendation': recommendation,
+            'report': generate_report(candidate_info, answers, scores, recommendation),
+            'text_report': generate_text_report(
+                candidate_info, answers, state['technical_questions'], avg_score, recommendation
+            )
+        }
+        state['report_cache'] = report_cache
+        state['recommendation'] = recommendation
+        _checkpoint(session_id, state)
+
+    return {
+        'session_id': session_id,
+        'decision': state.get('current_decision'),
+        'average_score': avg_score,
+        'recommendation': report_cache['recommendation'],
+        'report': json.loads(report_cache['report'])
+    }
+
+
+@app.exception_handler(SchedulerBusyError)
+async def scheduler_busy(request: Request, error: SchedulerBusyError):
+    return JSONResponse(status_code=503, content={'detail': str(error)}, headers={'Retry-After': '5'})
+
+
+@app.exception_handler(StaleSessionError)
+async def stale_session(request: Request, error: StaleSessionError):
+    return JSONResponse(
+        status_code=409,
+        content={'detail': 'The session was updated by another request; fetch the current question again'}
+    )
+
+
+@app.post('/sessions', status_code=201)
+async def start_session(request: StartSessionRequest):
+    return await run_in_threadpool(_start_session, request)
+
+
+@app.get('/sessions/{session_id}/question')
+async def next_question(session_id: str):
+    async with _session_lock(session_id):
+        state = await run_in_threadpool(_get_state, session_id)
+        return await run_in_threadpool(_next_question, state, session_id)
+
+
+@app.post('/sessions/{session_id}/answers')
+async def submit_answer(session_id: str, request: AnswerRequest):
+    async with _session_lock(session_id):
+        state = await run_in_threadpool(_get_state, session_id)
+        return await run_in_threadpool(_submit_answer, state, session_id, request)
+
+
+@app.get('/sessions/{session_id}/report')
+async def report(session_id: str):
+    async with _session_lock(session_id):
+        state = await run_in_threadpool(_get_state, session_id)
+        return await run_in_threadpool(_report, state, session_id)
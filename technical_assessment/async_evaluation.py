@@ -0,0 +1,99 @@
+import threading
+from technical_assessment.evaluation import evaluate_answer, evaluate_answers_batch, fallback_evaluation
+from utility.background import get_worker_pool
+from utility.diagnostics import warning
+
+
+class EvaluationJob:
+    """An answer evaluation running on the worker pool"""
+
+    def __init__(self):
+        self.score = None
+        self.scored = threading.Event()  # Set once the score is known or the job has ended
+        self.future = None
+
+    def _on_score(self, score):
+        self.score = score
+        self.scored.set()
+
+
+def submit_evaluation(pending, question, answer, tech_stack):
+    """
+    Queue an answer for evaluation on the background worker pool.
+
+    Args:
+        pending: Mapping of question -> EvaluationJob for evaluations still in flight
+        question, answer, tech_stack: Inputs for evaluate_answer
+    """
+    job = EvaluationJob()
+    job.future = get_worker_pool().submit(
+        evaluate_answer, question, answer, tech_stack, job._on_score
+    )
+    job.future.add_done_callback(lambda _: job.scored.set())
+    pending[question] = job
+
+
+def collect_evaluations(pending, evaluation_scores, evaluation_feedback, answers, wait_for=None, assessment=None,
+                        diagnostics=None):
+    """
+    Move evaluation results from pending into evaluation_scores/evaluation_feedback.
+
+    Only the scores for questions in wait_for are waited on, and only until the
+    score has been parsed from the streaming response; the feedback can still be
+    arriving. Anything else is collected if it is already available.
+    Pass wait_for=pending (or any iterable of its keys) to wait for every score.
+    Scores are also recorded in assessment (an AssessmentState), if given, and
+    the diagnostics of finished evaluations are stored in diagnostics (question -> list).
+
+    Returns:
+        list: Questions whose evaluation finished during this call
+    """
+    for question in wait_for or []:
+        if question in pending:
+            pending[question].scored.wait()
+
+    finished = []
+    for question, job in list(pending.items()):
+        if job.future.done():
+            try:
+                score, feedback, problems = job.future.result()
+            except Exception as e:
+                score, feedback = fallback_evaluation(answers.get(question, ''))
+                problems = [warning('evaluation_failed', f"Using fallback evaluation due to: {str(e)}")]
+            if diagnostics is not None and problems:
+                diagnostics[question] = problems
+            evaluation_scores[question] = score
+            evaluation_feedback[question] = feedback
+            del pending[question]
+            finished.append(question)
+        elif job.score is not None:
+            # Score is in, feedback is still streaming; keep the job pending
+            score = evaluation_scores[question] = job.score
+        else:
+            continue
+        if assessment is not None:
+            assessment.record_score(question, score)
+    return finished
+
+
+def settle_pending_in_batch(pending, evaluation_scores, evaluation_feedback, answers, tech_stack, assessment=None,
+                            diagnostics=None):
+    """
+    Finish all outstanding evaluations, e.g. when the assessment completes early.
+    Jobs still waiting for a worker are cancelled and scored together in one
+    batched call; jobs already running are waited on.
+    """
+    queued = [question for question, job in pending.items() if job.future.cancel()]
+    if queued:
+        results = evaluate_answers_batch([(q, answers[q]) for q in queued], tech_stack)
+        for question, (score, feedback) in zip(queued, results):
+            evaluation_scores[question] = score
+            evaluation_feedback[question] = feedback
+            del pending[question]
+            if assessment is not None:
+                assessment.record_score(question, score)
+
+    collect_evaluations(
+        pending, evaluation_scores, evaluation_feedback, answers, wait_for=list(pending),
+        assessment=assessment, diagnostics=diagnostics
+    )
@@ -0,0 +1,160 @@
+from collections import namedtuple
+from fractions import Fraction
+from configuration.settings import CONFIDENCE_THRESHOLDS
+from utility.skill_taxonomy import get_skill_taxonomy
+
+SKIPPED_ANSWER = "Skipped"
+DEFAULT_FOCUS_AREAS = ["problem-solving", "technical depth", "implementation details"]
+
+ConfidenceAssessment = namedtuple(
+    'ConfidenceAssessment', ['confidence_level', 'decision', 'need_more_questions', 'focus_areas', 'reasoning']
+)
+
+
+def extract_technical_terms(text):
+    """Helper function to extract technical terms from text, as canonical skills in order of appearance"""
+    hits = get_skill_taxonomy().index.scan(text)
+    # Single-letter aliases (C, R) are too ambiguous to steer question focus
+    return list(dict.fromkeys(hit.skill for hit in hits if len(hit.alias) > 1))
+
+
+def _score_band(score):
+    if score >= 0.9:
+        return 'perfect'
+    if score >= 0.7:
+        return 'good'
+    if score >= 0.6:
+        return 'fair'
+    return 'poor'
+
+
+class AssessmentState:
+    """
+    Running confidence assessment for one interview.
+
+    Record each answer and each score as it arrives; every update is O(1) in
+    the number of questions asked. assess() then gives the same result as
+    scanning all scores and answers again. The score total is kept as an exact
+    fraction, adjustments are derived from per-band counts and focus-area ties
+    are broken by topic name, so the result does not depend on the order of
+    updates: replay() of a stored session reproduces the live decisions exactly.
+
+    A score recorded again for the same question (e.g. the early score from a
+    streaming evaluation, then the final one) replaces the earlier score.
+    """
+
+    def __init__(self, resume_consistency_score=1.0, resume_findings=()):
+        self.resume_consistency_score = resume_consistency_score
+        self.resume_findings = list(resume_findings)
+        self.skipped_count = 0
+        self.score_total = Fraction(0)
+        self.band_counts = {'perfect': 0, 'good': 0, 'fair': 0, 'poor': 0}
+        self._scores = {}
+        self._answered = set()
+        # topic -> {(question, term position)} over questions scored below 0.7
+        self._weak_topics = {}
+
+    @classmethod
+    def replay(cls, evaluation_scores, answers, resume_consistency_score=1.0, resume_findings=()):
+        """Rebuild the state of a stored session from its scores and answers"""
+        state = cls(resume_consistency_score, resume_findings)
+        for question, answer in answers.items():
+            state.record_answer(question, answer)
+        for question, score in evaluation_scores.items():
+            state.record_score(question, score)
+        return state
+
+    @property
+    def scored_count(self):
+        return len(self._scores)
+
+    @property
+    def average_score(self):
+        return float(self.score_total / len(self._scores)) if self._scores else 0.0
+
+    def record_answer(self, question, answer):
+        if question in self._answered:
+            return
+        self._answered.add(question)
+        if answer == SKIPPED_ANSWER:
+            self.skipped_count += 1
+
+    def record_score(self, question, score):
+        previous = self._scores.get(question)
+        if previous == score:
+            return
+        if previous is not None:
+            self._remove_score(question, previous)
+        self._scores[question] = score
+        self.score_total += Fraction(score)
+        self.band_counts[_score_band(score)] += 1
+        if score < 0.7:
+            for position, topic in enumerate(extract_technical_terms(question.lower())):
+                self._weak_topics.setdefault(topic, set()).add((question, position))
+
+    def _remove_score(self, question, score):
+        self.score_total -= Fraction(score)
+        self.band_counts[_score_band(score)] -= 1
+        if score < 0.7:
+            for position, topic in enumerate(extract_technical_terms(question.lower())):
+                mentions = self._weak_topics[topic]
+                mentions.discard((question, position))
+                if not mentions:
+                    del self._weak_topics[topic]
+
+    def focus_areas(self, limit=3):
+        """Topics of the weakest answers, most frequent first (ties: alphabetical)"""
+        ranked = sorted(self._weak_topics.items(), key=lambda item: (-len(item[1]), item[0]))
+        return [topic for topic, _ in ranked[:limit]] or list(DEFAULT_FOCUS_AREAS)
+
+    def confidence(self):
+        """Confidence from the average score, resume consistency and per-answer adjustments"""
+        base_confidence = self.average_score * 0.7 * self.resume_consistency_score
+        adjustments = (
+            self.band_counts['perfect'] * CONFIDENCE_THRESHOLDS['perfect_answer']
+            + self.band_counts['good'] * CONFIDENCE_THRESHOLDS['good_answer']
+            + self.band_counts['poor'] * CONFIDENCE_THRESHOLDS['poor_answer']
+            + self.skipped_count * CONFIDENCE_THRESHOLDS['skip_penalty']
+        )
+        return min(max(base_confidence + adjustments, CONFIDENCE_THRESHOLDS['min_confidence']),
+                   CONFIDENCE_THRESHOLDS['max_confidence'])
+
+    def assess(self):
+        """
+        Returns: ConfidenceAssessment (confidence_level, decision, need_more_questions, focus_areas, reasoning)
+        """
+        if not self._scores:
+            return ConfidenceAssessment(0.0, "Need More Information", True, [], "Initial assessment needed")
+
+        avg_score = self.average_score
+        final_confidence = self.confidence()
+        need_more_questions = True
+        focus_areas = []
+        decision = "Need More Information"
+        reasoning = ""
+
+        # Early termination conditions
+        if self.skipped_count >= CONFIDENCE_THRESHOLDS['skip_threshold']:
+            decision = "No Hire"
+            need_more_questions = False
+            reasoning = "Too many skipped questions indicates lack of knowledge or preparation"
+        elif self.band_counts['poor'] >= CONFIDENCE_THRESHOLDS['poor_answer_threshold']:
+            decision = "No Hire"
+            need_more_questions = False
+            reasoning = "Multiple poor answers indicate insufficient technical knowledge"
+        elif self.band_counts['perfect'] >= 3 and avg_score >= 0.85:
+            decision = "Strong Hire"
+            need_more_questions = False
+            reasoning = "Consistent excellent performance across multiple questions"
+        elif final_confidence >= CONFIDENCE_THRESHOLDS['completion_threshold']:
+            need_more_questions = False
+            decision = "Strong Hire" if avg_score >= 0.85 else "Hire" if avg_score >= 0.75 else "Lean Hire"
+            reasoning = f"Sufficient confidence reached with average score of {avg_score*100:.1f}%"
+        else:
+            focus_areas = self.focus_areas()
+
+        # Add resume findings to reasoning if significant discrepancies found
+        if self.resume_consistency_score < 0.8 and self.resume_findings:
+            reasoning += "\nNote: Some inconsistencies found between resume and provided information."
+
+        return ConfidenceAssessment(final_confidence, decision, need_more_questions, focus_areas, reasoning)
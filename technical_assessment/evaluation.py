@@ -1,11 +1,17 @@
 import json
-import streamlit as st
-from config.settings import CONFIDENCE_THRESHOLDS
-from models.llm_manager import LLMManager
+from configuration.settings import BATCH_EVALUATION
+from LLM_models.llm_manager import LLMManager
+from utility.diagnostics import warning
+from utility.json_extraction import IncrementalJSONParser, extract_json
+from utility.tracing import traced
+from technical_assessment.confidence import AssessmentState, extract_technical_terms
 from datetime import datetime
-from collections import Counter
+from collections import Counter, namedtuple
 import traceback
 
+# Result of evaluating one answer; diagnostics lists any problems (e.g. a fallback score)
+EvaluationResult = namedtuple('EvaluationResult', ['score', 'feedback', 'diagnostics'])
+
 def fallback_evaluation(answer):
     """Provide a basic evaluation when LLM evaluation fails"""
     # Basic scoring based on answer length and complexity
@@ -29,9 +35,54 @@ def fallback_evaluation(answer):
     return final_score, feedback
 
 
-def evaluate_answer_with_llm(question, answer, tech_stack):
-    """Evaluate answer using LLM with improved response handling"""
-    evaluation_llm = LLMManager.get_llm('evaluation')
+# Weights of the rubric dimensions in the final answer score
+EVALUATION_WEIGHTS = {
+    'technical_accuracy': 0.4,
+    'completeness': 0.2,
+    'clarity': 0.2,
+    'best_practices': 0.2
+}
+
+DIMENSION_LABELS = {
+    'technical_accuracy': 'Technical Accuracy',
+    'completeness': 'Completeness',
+    'clarity': 'Clarity',
+    'best_practices': 'Best Practices'
+}
+
+
+def collect_rubric_feedback(evaluation):
+    """Feedback lines from a parsed rubric evaluation; a truncated response may be missing some of it"""
+    feedback = [
+        f"{label}: {evaluation.get(key, {}).get('feedback', 'No feedback provided')}"
+        for key, label in DIMENSION_LABELS.items()
+    ]
+    feedback.append(f"\nOverall: {evaluation.get('overall_feedback', 'No overall feedback provided')}")
+    return feedback
+
+
+def score_rubric_evaluation(evaluation):
+    """Weighted 0-1 score from a parsed rubric evaluation, or None if a dimension score is missing"""
+    try:
+        return sum(
+            float(evaluation[key]['score']) / 100 * weight
+            for key, weight in EVALUATION_WEIGHTS.items()
+        )
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+@traced('evaluation')
+def evaluate_answer(question, answer, tech_stack, on_score=None):
+    """
+    Evaluate answer using LLM with improved response handling.
+    The response is parsed while it streams; on_score(score) is called as soon as
+    every dimension score has arrived, before the feedback text is complete.
+    Safe to call from worker threads and processes: problems are reported in the
+    result's diagnostics instead of being shown.
+    Returns: EvaluationResult
+    """
+    evaluation_llm = LLMManager.get_cached_llm('evaluation')
     
     prompt = f"""You are an expert technical interviewer evaluating a candidate's response. You must return your evaluation in the exact JSON format specified below.
 
@@ -68,61 +119,186 @@ Your response must be in this exact JSON format with no additional text before o
 
 Remember: Return only valid JSON, no other text."""
     
+    # Normalized dimension scores (0-1 range), filled in while the response streams
+    dimension_scores = {}
+    
+    def record_score(path, value):
+        if len(path) != 2 or path[1] != 'score' or path[0] not in EVALUATION_WEIGHTS:
+            return
+        try:
+            dimension_scores[path[0]] = float(value) / 100
+        except (TypeError, ValueError):
+            return
+        if on_score and len(dimension_scores) == len(EVALUATION_WEIGHTS):
+            on_score(sum(dimension_scores[k] * w for k, w in EVALUATION_WEIGHTS.items()))
+    
     try:
-        # Get LLM response
-        response = evaluation_llm.predict(prompt)
+        # Parse the JSON out of whatever wraps it (reasoning, code fences) as it arrives
+        parser = IncrementalJSONParser(on_value=record_score)
+        for chunk in LLMManager.stream(evaluation_llm, prompt):
+            parser.feed(chunk)
+        evaluation = parser.result()
         
-        # Clean the response - remove any potential markdown formatting or extra text
-        response = response.strip()
-        if response.startswith('```json'):
-            response = response[7:]
-        if response.endswith('```'):
-            response = response[:-3]
-        response = response.strip()
+        if evaluation is None or len(dimension_scores) < len(EVALUATION_WEIGHTS):
+            # If no usable scores came back, create a default structured response
+            # and make sure the unusable response is not served again
+            if hasattr(evaluation_llm, 'invalidate'):
+                evaluation_llm.invalidate(prompt)
+            diagnostic = warning('evaluation_format', "AI response formatting issue. Using simplified evaluation.")
+            return EvaluationResult(*fallback_evaluation(answer), [diagnostic])
         
-        # Try to parse the JSON
-        try:
-            evaluation = json.loads(response)
-        except json.JSONDecodeError:
-            # If JSON parsing fails, create a default structured response
-            st.warning("AI response formatting issue. Using simplified evaluation.")
-            return fallback_evaluation(answer)
+        # Calculate final score as weighted average
+        final_score = sum(dimension_scores[k] * w for k, w in EVALUATION_WEIGHTS.items())
         
-        # Calculate normalized scores (0-1 range)
-        scores = {
-            'technical_accuracy': float(evaluation['technical_accuracy']['score']) / 100,
-            'completeness': float(evaluation['completeness']['score']) / 100,
-            'clarity': float(evaluation['clarity']['score']) / 100,
-            'best_practices': float(evaluation['best_practices']['score']) / 100
-        }
+        return EvaluationResult(final_score, collect_rubric_feedback(evaluation), [])
         
-        # Collect feedback
-        feedback = [
-            f"Technical Accuracy: {evaluation['technical_accuracy']['feedback']}",
-            f"Completeness: {evaluation['completeness']['feedback']}",
-            f"Clarity: {evaluation['clarity']['feedback']}",
-            f"Best Practices: {evaluation['best_practices']['feedback']}",
-            f"\nOverall: {evaluation['overall_feedback']}"
-        ]
+    except Exception as e:
+        diagnostic = warning('evaluation_failed', f"Using fallback evaluation due to: {str(e)}")
+        return EvaluationResult(*fallback_evaluation(answer), [diagnostic])
+
+
+def evaluate_answer_with_llm(question, answer, tech_stack, on_score=None):
+    """evaluate_answer without the diagnostics. Returns: (score, feedback)"""
+    result = evaluate_answer(question, answer, tech_stack, on_score)
+    return result.score, result.feedback
+
+def estimate_tokens(text):
+    """Rough token count used for prompt budgeting"""
+    return len(text) // BATCH_EVALUATION['chars_per_token'] + 1
+
+
+def build_batch_evaluation_prompt(qa_items, tech_stack):
+    """Prompt asking for rubric scores for several (index, question, answer) items in one response"""
+    answers_block = "\n\n".join(
+        f"Answer {index}:\nQuestion: {question}\nCandidate's Answer: {answer}"
+        for index, question, answer in qa_items
+    )
+    return f"""You are an expert technical interviewer evaluating several candidate responses. You must return your evaluation in the exact JSON format specified below.
+
+Relevant Technologies: {', '.join(tech_stack)}
+
+{answers_block}
+
+Evaluate each answer independently across these dimensions:
+1. Technical Accuracy
+2. Completeness
+3. Clarity
+4. Best Practices
+
+Your response must be a JSON array with one object per answer, in this exact format with no additional text before or after:
+[
+    {{
+        "index": <answer number>,
+        "technical_accuracy": {{"score": <number between 0-100>, "feedback": "<specific feedback>"}},
+        "completeness": {{"score": <number between 0-100>, "feedback": "<specific feedback>"}},
+        "clarity": {{"score": <number between 0-100>, "feedback": "<specific feedback>"}},
+        "best_practices": {{"score": <number between 0-100>, "feedback": "<specific feedback>"}},
+        "overall_feedback": "<summarizing feedback>"
+    }}
+]
+
+Remember: Return only valid JSON, no other text."""
+
+
+def split_evaluation_batches(qa_items, tech_stack, max_prompt_tokens, max_response_tokens):
+    """
+    Greedily pack (index, question, answer) items into batches whose prompt fits
+    max_prompt_tokens and whose expected response fits max_response_tokens.
+    """
+    base_tokens = estimate_tokens(build_batch_evaluation_prompt([], tech_stack))
+    per_answer_response = BATCH_EVALUATION['response_tokens_per_answer']
+    
+    batches = []
+    current, prompt_tokens = [], base_tokens
+    for item in qa_items:
+        item_tokens = estimate_tokens(f"{item[1]}\n{item[2]}") + 20
+        fits_prompt = prompt_tokens + item_tokens <= max_prompt_tokens
+        fits_response = (len(current) + 1) * per_answer_response <= max_response_tokens
+        if current and not (fits_prompt and fits_response):
+            batches.append(current)
+            current, prompt_tokens = [], base_tokens
+        current.append(item)
+        prompt_tokens += item_tokens
+    if current:
+        batches.append(current)
+    return batches
+
+
+@traced('batch_evaluation')
+def evaluate_answers_batch(qa_pairs, tech_stack, max_prompt_tokens=None):
+    """
+    Score several answers with as few LLM calls as possible.
+    
+    Args:
+        qa_pairs: List of (question, answer) tuples
+        tech_stack: Candidate's technologies
+        max_prompt_tokens: Prompt budget per call (defaults to BATCH_EVALUATION)
         
-        # Calculate final score as weighted average
-        weights = {
-            'technical_accuracy': 0.4,
-            'completeness': 0.2,
-            'clarity': 0.2,
-            'best_practices': 0.2
-        }
-        final_score = sum(scores[k] * weights[k] for k in weights)
+    Returns:
+        list: (score, feedback) per pair, in input order. Skipped answers score 0;
+        answers missing from a batch response are evaluated individually.
+    """
+    evaluation_llm = LLMManager.get_cached_llm('evaluation')
+    max_prompt_tokens = max_prompt_tokens or BATCH_EVALUATION['max_prompt_tokens']
+    max_response_tokens = LLMManager.get_config('evaluation')['max_tokens']
+    
+    results = [None] * len(qa_pairs)
+    to_score = []
+    for index, (question, answer) in enumerate(qa_pairs):
+        if answer == "Skipped":
+            results[index] = (0.0, ["Question was skipped"])
+        else:
+            to_score.append((index + 1, question, answer))
+    
+    for batch in split_evaluation_batches(to_score, tech_stack, max_prompt_tokens, max_response_tokens):
+        prompt = build_batch_evaluation_prompt(batch, tech_stack)
+        try:
+            evaluations = extract_json(LLMManager.predict(evaluation_llm, prompt), container='[') or []
+        except Exception:
+            evaluations = []
         
-        return final_score, feedback
+        sent = {index - 1 for index, _, _ in batch}
+        scored = 0
+        for evaluation in evaluations:
+            if not isinstance(evaluation, dict):
+                continue
+            score = score_rubric_evaluation(evaluation)
+            try:
+                position = int(evaluation.get('index')) - 1
+            except (TypeError, ValueError):
+                continue
+            if score is not None and position in sent and results[position] is None:
+                results[position] = (score, collect_rubric_feedback(evaluation))
+                scored += 1
         
-    except Exception as e:
-        st.warning(f"Using fallback evaluation due to: {str(e)}")
-        return fallback_evaluation(answer)
+        if scored < len(batch):
+            # Unparsable or incomplete: make sure the response is not served again
+            if hasattr(evaluation_llm, 'invalidate'):
+                evaluation_llm.invalidate(prompt)
+    
+    # Anything the batched calls did not return gets its own evaluation
+    for index, (question, answer) in enumerate(qa_pairs):
+        if results[index] is None:
+            results[index] = evaluate_answer_with_llm(question, answer, tech_stack)
+    return results
+
+
+def rescore_session(answers, tech_stack):
+    """
+    Re-evaluate a stored session's answers in batched calls.
+    Returns: (evaluation_scores, evaluation_feedback) keyed by question
+    """
+    questions = list(answers.keys())
+    results = evaluate_answers_batch([(q, answers[q]) for q in questions], tech_stack)
+    evaluation_scores = {q: score for q, (score, _) in zip(questions, results)}
+    evaluation_feedback = {q: feedback for q, (_, feedback) in zip(questions, results)}
+    return evaluation_scores, evaluation_feedback
 
-def generate_detailed_feedback_with_llm(answers, tech_stack):
-    """Generate comprehensive feedback using LLM"""
-    feedback_llm = LLMManager.get_llm('evaluation')
+
+@traced('detailed_feedback')
+def generate_detailed_feedback_with_llm(answers, tech_stack, on_text=None):
+    """Generate comprehensive feedback using LLM, streaming it to on_text(text_so_far) if given"""
+    feedback_llm = LLMManager.get_cached_llm('evaluation')
     
     answers_summary = "\n".join([f"Q: {q}\nA: {a}" for q, a in answers.items()])
     
@@ -143,15 +319,19 @@ def generate_detailed_feedback_with_llm(answers, tech_stack):
     """
     
     try:
-        detailed_feedback = feedback_llm.predict(prompt)
+        detailed_feedback = LLMManager.predict(feedback_llm, prompt, on_text=on_text)
         return detailed_feedback
     except Exception as e:
         return f"Error generating detailed feedback: {str(e)}"
 
 
-def generate_final_recommendation_with_llm(candidate_info, answers, scores):
-    """Generate final recommendation using LLM with enhanced prompting and fallback"""
-    recommendation_llm = LLMManager.get_llm('recommendation')
+@traced('recommendation')
+def generate_final_recommendation_with_llm(candidate_info, answers, scores, on_text=None):
+    """
+    Generate final recommendation using LLM with enhanced prompting and fallback.
+    If on_text is given the recommendation is streamed to on_text(text_so_far).
+    """
+    recommendation_llm = LLMManager.get_cached_llm('recommendation')
     
     # Calculate key metrics for context
     avg_score = sum(scores.values()) / len(scores) if scores else 0
@@ -193,7 +373,7 @@ You MUST fill out all sections in detail. Keep your response professional and co
 """
 
     try:
-        recommendation = recommendation_llm.predict(prompt)
+        recommendation = LLMManager.predict(recommendation_llm, prompt, on_text=on_text)
         
         # Verify if the response has all required sections
         required_sections = [
@@ -206,6 +386,8 @@ You MUST fill out all sections in detail. Keep your response professional and co
         
         if not all(section in recommendation for section in required_sections):
             # If missing sections, try one more time with a more forceful prompt
+            if hasattr(recommendation_llm, 'invalidate'):
+                recommendation_llm.invalidate(prompt)
             return generate_fallback_recommendation(candidate_info, answers, scores)
             
         return recommendation
@@ -263,113 +445,14 @@ Note: This recommendation is based on quantitative assessment scores and candida
     return recommendation
 
 
-def assess_confidence_level(evaluation_scores, answers, conversation):
+def assess_confidence(evaluation_scores, answers, resume_consistency_score=1.0, resume_findings=()):
     """
-    Enhanced confidence assessment that considers answer quality and skips
-    Returns: (confidence_level, decision, need_more_questions, focus_areas, reasoning)
+    Confidence assessment from a session's scores and answers plus its resume
+    screening result. For a live session keep an AssessmentState instead.
+    Returns: ConfidenceAssessment (confidence_level, decision, need_more_questions, focus_areas, reasoning)
     """
-    if not evaluation_scores:
-        return 0.0, "Need More Information", True, [], "Initial assessment needed"
-    
-    # Count skips and analyze answers
-    skipped_count = sum(1 for ans in answers.values() if ans == "Skipped")
-    scores_list = list(evaluation_scores.values())
-    poor_answers = sum(1 for score in scores_list if score < 0.6)
-    perfect_answers = sum(1 for score in scores_list if score >= 0.9)
-    
-    # Calculate base confidence
-    avg_score = sum(scores_list) / len(scores_list) if scores_list else 0
-    base_confidence = avg_score * 0.7  # Base confidence from average score
-
-    # Include resume consistency in confidence calculation
-    resume_consistency_score = st.session_state.get('resume_consistency_score', 1.0)
-    base_confidence *= resume_consistency_score
-    
-    # Apply penalties and bonuses
-    confidence_adjustments = 0.0
-    for score in scores_list:
-        if score >= 0.9:
-            confidence_adjustments += CONFIDENCE_THRESHOLDS['perfect_answer']
-        elif score >= 0.7:
-            confidence_adjustments += CONFIDENCE_THRESHOLDS['good_answer']
-        elif score < 0.6:
-            confidence_adjustments += CONFIDENCE_THRESHOLDS['poor_answer']
-    
-    # Apply skip penalties
-    confidence_adjustments += skipped_count * CONFIDENCE_THRESHOLDS['skip_penalty']
-    
-    # Calculate final confidence
-    final_confidence = min(max(base_confidence + confidence_adjustments, 
-                             CONFIDENCE_THRESHOLDS['min_confidence']),
-                         CONFIDENCE_THRESHOLDS['max_confidence'])
-    
-    # Determine decision and whether to continue
-    need_more_questions = True
-    focus_areas = []
-    decision = "Need More Information"
-    reasoning = ""
-    
-    # Early termination conditions
-    if skipped_count >= CONFIDENCE_THRESHOLDS['skip_threshold']:
-        decision = "No Hire"
-        need_more_questions = False
-        reasoning = "Too many skipped questions indicates lack of knowledge or preparation"
-    elif poor_answers >= CONFIDENCE_THRESHOLDS['poor_answer_threshold']:
-        decision = "No Hire"
-        need_more_questions = False
-        reasoning = "Multiple poor answers indicate insufficient technical knowledge"
-    elif perfect_answers >= 3 and avg_score >= 0.85:
-        decision = "Strong Hire"
-        need_more_questions = False
-        reasoning = "Consistent excellent performance across multiple questions"
-    elif final_confidence >= CONFIDENCE_THRESHOLDS['completion_threshold']:
-        need_more_questions = False
-        decision = "Strong Hire" if avg_score >= 0.85 else "Hire" if avg_score >= 0.75 else "Lean Hire"
-        reasoning = f"Sufficient confidence reached with average score of {avg_score*100:.1f}%"
-    else:
-        # Determine focus areas for next questions
-        focus_areas = determine_focus_areas(evaluation_scores, answers)
-
-    # Add resume findings to reasoning if significant discrepancies found
-    if resume_consistency_score < 0.8:
-        findings = st.session_state.get('resume_findings', [])
-        if findings:
-            reasoning += "\nNote: Some inconsistencies found between resume and provided information."
-        
-    return final_confidence, decision, need_more_questions, focus_areas, reasoning
+    return AssessmentState.replay(evaluation_scores, answers, resume_consistency_score, resume_findings).assess()
 
 def determine_focus_areas(evaluation_scores, answers):
     """Helper function to determine areas needing more investigation"""
-    focus_areas = []
-    
-    # Analyze answer patterns
-    low_score_topics = []
-    for question, score in evaluation_scores.items():
-        if score < 0.7:
-            # Extract key technical terms from the question
-            question_lower = question.lower()
-            technical_terms = extract_technical_terms(question_lower)
-            low_score_topics.extend(technical_terms)
-    
-    # Identify most common weak areas
-    if low_score_topics:
-        from collections import Counter
-        topic_counts = Counter(low_score_topics)
-        focus_areas = [topic for topic, count in topic_counts.most_common(3)]
-    
-    # Add general areas if specific topics aren't clear
-    if not focus_areas:
-        focus_areas = ["problem-solving", "technical depth", "implementation details"]
-    
-    return focus_areas
-
-def extract_technical_terms(text):
-    """Helper function to extract technical terms from text"""
-    common_tech_terms = {
-        'algorithm', 'data structure', 'optimization', 'complexity',
-        'database', 'architecture', 'design pattern', 'api',
-        'performance', 'scalability', 'security', 'testing',
-        'debugging', 'implementation', 'framework', 'library'
-    }
-    
-    return [term for term in common_tech_terms if term in text]
+    return AssessmentState.replay(evaluation_scores, answers).focus_areas()
@@ -0,0 +1,81 @@
+from technical_assessment.evaluation import determine_focus_areas
+from technical_assessment.question_generation import build_focused_question_prompt, is_repeated_question
+from utility.background import get_worker_pool
+from LLM_models.llm_manager import strip_reasoning
+from LLM_models.scheduler import ScheduledLLM, get_llm_scheduler
+
+
+def _generate_question(llm, messages):
+    """
+    Worker: ask the conversation model for a question without touching the chain memory.
+    Speculative calls run in the scheduler's lowest priority class.
+    """
+    return strip_reasoning(ScheduledLLM(llm, 'prefetch', get_llm_scheduler()).invoke(messages).content)
+
+
+class QuestionPrefetcher:
+    """
+    Speculatively generates the next focused question while the candidate is answering.
+    
+    The next focus areas depend on the score of the answer being typed, so one
+    question is prepared for each likely outcome: the current scores as they
+    stand, and the current question scored as weak. Once the real score is in,
+    take() returns the prefetched question whose focus areas match, if any.
+    """
+
+    def __init__(self):
+        self._question = None
+        self._pending = {}
+
+    def schedule(self, current_question, tech_stack, evaluation_scores, answers, conversation):
+        """Start background generation for the question that follows current_question"""
+        if current_question == self._question:
+            return
+        self.cancel()
+        self._question = current_question
+        
+        previous_questions = list(answers.keys()) + [current_question]
+        scenarios = [
+            dict(evaluation_scores),
+            {**evaluation_scores, current_question: 0.0}
+        ]
+        
+        # Snapshot the history here; the chain memory is only used from the UI thread
+        history = conversation.memory.load_memory_variables({})['history']
+        for scores in scenarios:
+            focus_areas = tuple(determine_focus_areas(scores, answers))
+            key = (focus_areas, tuple(previous_questions))
+            if key in self._pending:
+                continue
+            prompt = build_focused_question_prompt(tech_stack, list(focus_areas), previous_questions)
+            messages = conversation.prompt.format_messages(history=history, input=prompt)
+            self._pending[key] = (prompt, get_worker_pool().submit(_generate_question, conversation.llm, messages))
+
+    def take(self, focus_areas, previous_questions, conversation, duplicate_index=None):
+        """
+        Return the prefetched question for these focus areas, or None on a miss
+        or if it repeats an earlier question.
+        A hit is recorded in the conversation memory as if it had been asked directly.
+        """
+        entry = self._pending.pop((tuple(focus_areas), tuple(previous_questions)), None)
+        self.cancel()
+        if entry is None:
+            return None
+        
+        prompt, future = entry
+        try:
+            question = future.result()
+        except Exception:
+            return None
+        if not question or is_repeated_question(question, previous_questions, duplicate_index):
+            return None
+        
+        conversation.memory.save_context({'input': prompt}, {'response': question})
+        return question
+
+    def cancel(self):
+        """Drop outstanding speculative work"""
+        for _, future in self._pending.values():
+            future.cancel()
+        self._pending = {}
+        self._question = None
@@ -0,0 +1,247 @@
+"""
+Question bank backed by Chroma stores of embedded technical questions.
+
+Questions generated for earlier candidates, plus any curated ones, are stored
+with sentence-transformers embeddings and tagged with their tech stack, topic
+and difficulty (1-5, matching the five-step progression of the initial
+question prompt). New sessions are served their initial questions by
+nearest-neighbour lookup when the bank covers every difficulty level for the
+candidate's stack; otherwise the questions are generated by the LLM and added
+to the bank.
+
+Curated questions ship with the app in vector_store/ and are only read (from a
+private copy, as Chroma writes to any store it opens); questions added at
+runtime go to the store under .cache/. The embedding model takes seconds to
+load, so call warm_up_question_bank() at startup; sessions do not wait for it.
+
+Import curated questions (a JSON list of {"question", "tech_stack", "difficulty", "topic"})
+into the runtime store, or with --curated into the shipped one:
+    python -m technical_assessment.question_bank --import curated_questions.json [--curated]
+"""
+import argparse
+import hashlib
+import json
+import os
+import random
+import re
+import shutil
+import sys
+import tempfile
+import threading
+from configuration.settings import QUESTION_BANK
+from utility.background import get_worker_pool
+from utility.skill_taxonomy import get_skill_taxonomy
+
+try:
+    import chromadb
+    from chromadb.utils.embedding_functions import SentenceTransformerEmbeddingFunction
+except ImportError:  # The bank is optional; sessions fall back to LLM generation
+    chromadb = None
+
+DIFFICULTY_LABELS = {
+    1: 'basic concept',
+    2: 'fundamentals application',
+    3: 'practical scenario',
+    4: 'problem solving',
+    5: 'advanced concepts'
+}
+_QUESTION_PREFIX = re.compile(r'^\s*question\s*\d+\s*[:.)-]\s*', re.IGNORECASE)
+
+
+def strip_question_prefix(question):
+    """'Question 3: How would...' -> 'How would...'"""
+    return _QUESTION_PREFIX.sub('', question).strip()
+
+
+def stack_skills(tech_stack):
+    """Canonical skills of a tech stack, in the order given"""
+    taxonomy = get_skill_taxonomy()
+    return list(dict.fromkeys(taxonomy.canonicalize(tech) for tech in tech_stack if tech.strip()))
+
+
+def question_topic(question, skills):
+    """The first stack skill the question mentions, or the first skill of the stack"""
+    for hit in get_skill_taxonomy().index.scan(question):
+        if hit.skill in skills:
+            return hit.skill
+    return skills[0] if skills else ''
+
+
+class QuestionBank:
+    """
+    Embedding index of technical questions in a writable Chroma collection at
+    path, searched together with the same collection in the read-only store at
+    curated_path, if given.
+    """
+
+    def __init__(self, path, collection_name, embedding_model, curated_path=None):
+        self._embed = SentenceTransformerEmbeddingFunction(model_name=embedding_model)
+        self._client = chromadb.PersistentClient(path=path)
+        self._collection = self._client.get_or_create_collection(
+            name=collection_name,
+            embedding_function=self._embed,
+            metadata={'hnsw:space': 'cosine'}
+        )
+        self._collections = [self._collection]
+        self._curated_copy = None
+        if curated_path and os.path.isdir(curated_path):
+            self._curated_copy = tempfile.TemporaryDirectory(prefix='question_bank_')
+            copy_path = os.path.join(self._curated_copy.name, 'store')
+            shutil.copytree(curated_path, copy_path)
+            try:
+                curated_client = chromadb.PersistentClient(path=copy_path)
+                self._collections.append(
+                    curated_client.get_collection(name=collection_name, embedding_function=self._embed)
+                )
+            except Exception:
+                pass  # Nothing curated for this collection, or an unreadable store: serve runtime questions only
+
+    def count(self):
+        return sum(collection.count() for collection in self._collections)
+
+    def add_questions(self, tech_stack, questions, source='generated', difficulties=None, topics=None):
+        """
+        Store questions for a tech stack. Without explicit difficulties the list
+        is taken to follow the initial question progression (easiest first).
+        """
+        skills = stack_skills(tech_stack)
+        texts = [strip_question_prefix(question) for question in questions]
+        ids, documents, metadatas = [], [], []
+        for position, text in enumerate(texts):
+            if not text:
+                continue
+            difficulty = difficulties[position] if difficulties else min(position + 1, len(DIFFICULTY_LABELS))
+            ids.append(hashlib.sha1(text.lower().encode('utf-8')).hexdigest())
+            documents.append(text)
+            metadatas.append({
+                'difficulty': int(difficulty),
+                'topic': topics[position] if topics else question_topic(text, skills),
+                'stack': ', '.join(skills),
+                'source': source
+            })
+        if ids:
+            self._collection.upsert(ids=ids, documents=documents, metadatas=metadatas)
+        return len(ids)
+
+    def select_questions(self, tech_stack):
+        """
+        One question per difficulty level for the stack, formatted like the LLM
+        output ("Question N: ..."), or None if any level has no close match.
+        """
+        skills = stack_skills(tech_stack)
+        if not skills or not self.count():
+            return None
+        topic_filter = {'topic': {'$in': skills}} if len(skills) > 1 else {'topic': skills[0]}
+
+        questions = []
+        for difficulty, label in DIFFICULTY_LABELS.items():
+            query_embeddings = self._embed([f"{label} question about {', '.join(skills)}"])
+            matches = []
+            for collection in self._collections:
+                result = collection.query(
+                    query_embeddings=query_embeddings,
+                    n_results=QUESTION_BANK['candidates_per_level'],
+                    where={'$and': [{'difficulty': difficulty}, topic_filter]},
+                    include=['documents', 'distances']
+                )
+                matches.extend(
+                    document
+                    for document, distance in zip(result['documents'][0], result['distances'][0])
+                    if distance <= QUESTION_BANK['max_distance']
+                    and document not in questions and document not in matches
+                )
+            if not matches:
+                return None
+            questions.append(random.choice(matches))
+
+        return [f"Question {number}: {question}" for number, question in enumerate(questions, 1)]
+
+
+_question_bank = None
+_question_bank_lock = threading.Lock()
+_question_bank_failed = False
+_warm_up = None
+_warm_up_lock = threading.Lock()
+
+
+def get_question_bank(wait=True):
+    """
+    Return the process-wide question bank, or None if it is disabled, chromadb
+    is not installed or the store cannot be opened. With wait=False, return
+    None rather than block while the bank (and its embedding model) is still
+    loading; the load is started in the background if it was not yet.
+    """
+    global _question_bank, _question_bank_failed
+    if not QUESTION_BANK['enabled'] or chromadb is None or _question_bank_failed:
+        return None
+    if _question_bank is None and not wait:
+        warm_up_question_bank()
+        return None
+    if _question_bank is None:
+        with _question_bank_lock:
+            if _question_bank is None and not _question_bank_failed:
+                try:
+                    _question_bank = QuestionBank(
+                        QUESTION_BANK['path'], QUESTION_BANK['collection'], QUESTION_BANK['embedding_model'],
+                        curated_path=QUESTION_BANK['curated_path']
+                    )
+                except Exception:
+                    _question_bank_failed = True
+    return _question_bank
+
+
+def warm_up_question_bank():
+    """Open the question bank and load its embedding model in the background, e.g. at startup"""
+    global _warm_up
+    if not QUESTION_BANK['enabled'] or chromadb is None:
+        return
+    with _warm_up_lock:
+        if _warm_up is None:
+            _warm_up = get_worker_pool().submit(get_question_bank)
+
+
+def import_curated_questions(path, bank=None):
+    """Add curated questions from a JSON file to bank (default: the runtime bank); returns the number stored"""
+    bank = bank or get_question_bank()
+    if bank is None:
+        raise RuntimeError("Question bank is unavailable (disabled or chromadb not installed)")
+    with open(path, encoding='utf-8') as curated_file:
+        entries = json.load(curated_file)
+
+    stored = 0
+    for entry in entries:
+        tech_stack = entry['tech_stack']
+        if isinstance(tech_stack, str):
+            tech_stack = [tech.strip() for tech in tech_stack.split(',')]
+        topic = get_skill_taxonomy().canonicalize(entry['topic']) if entry.get('topic') else None
+        stored += bank.add_questions(
+            tech_stack,
+            [entry['question']],
+            source='curated',
+            difficulties=[entry['difficulty']],
+            topics=[topic] if topic else None
+        )
+    return stored
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Manage the technical question bank.')
+    parser.add_argument('--import', dest='import_path', help='JSON file of curated questions to add')
+    parser.add_argument('--curated', action='store_true', help='Write to the shipped store instead of the runtime one')
+    args = parser.parse_args(argv)
+
+    if args.curated and chromadb is not None:
+        bank = QuestionBank(QUESTION_BANK['curated_path'], QUESTION_BANK['collection'], QUESTION_BANK['embedding_model'])
+    else:
+        bank = get_question_bank()
+    if bank is None:
+        print("Question bank is unavailable (disabled or chromadb not installed)")
+        return 1
+    if args.import_path:
+        print(f"Imported {import_curated_questions(args.import_path, bank)} questions")
+    print(f"Question bank holds {bank.count()} questions")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
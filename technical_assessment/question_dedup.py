@@ -0,0 +1,208 @@
+"""
+Per-session duplicate detection for interview questions.
+
+Each asked question is added to a locality-sensitive hash index, so checking a
+new question only compares it with the few earlier questions that share a
+bucket instead of with every question asked. With sentence-transformers
+installed, questions are embedded and bucketed by random hyperplanes, which
+catches paraphrases; otherwise MinHash signatures over content words are used.
+"""
+import hashlib
+import random
+import re
+import threading
+from collections import defaultdict
+from configuration.settings import DUPLICATE_DETECTION, QUESTION_BANK
+
+try:
+    import numpy as np
+    from sentence_transformers import SentenceTransformer
+except ImportError:  # No-model mode only
+    SentenceTransformer = None
+
+_STOPWORDS = {
+    'a', 'an', 'and', 'are', 'as', 'at', 's', 'be', 'between', 'by', 'can', 'could', 'describe', 'do', 'does',
+    'explain', 'for', 'from', 'how', 'i', 'if', 'in', 'into', 'is', 'it', 'its', 'of', 'on', 'or', 'our', 'such',
+    'that', 'the', 'their', 'them', 'these', 'they', 'this', 'those', 'to', 'use', 'using', 'we', 'what', 'when',
+    'where', 'which', 'why', 'will', 'with', 'would', 'you', 'your'
+}
+_WORD = re.compile(r'[a-z0-9+#.]+')
+_MERSENNE_PRIME = (1 << 61) - 1
+
+_embedding_model = None
+_embedding_model_lock = threading.Lock()
+
+
+def get_embedding_model():
+    """Process-wide sentence-transformers model, loaded on first use"""
+    global _embedding_model
+    if _embedding_model is None:
+        with _embedding_model_lock:
+            if _embedding_model is None:
+                _embedding_model = SentenceTransformer(QUESTION_BANK['embedding_model'])
+    return _embedding_model
+
+
+def _stem(word):
+    """Crude suffix stripping so 'threads'/'thread', 'queries'/'query' and 'caching'/'cach(e)' compare equal"""
+    if len(word) > 4 and word.endswith('ies'):
+        return word[:-3] + 'y'
+    if len(word) > 5 and word.endswith('ing'):
+        return word[:-3]
+    if len(word) > 4 and word.endswith('ed'):
+        return word[:-2]
+    if len(word) > 4 and word.endswith('es') and word[:-2].endswith(('ss', 'x', 'ch', 'sh')):
+        return word[:-2]
+    if len(word) > 3 and word.endswith('s') and not word.endswith('ss'):
+        return word[:-1]
+    return word
+
+
+def question_shingles(question):
+    """
+    Content words of a question, crudely stemmed. Word order is ignored so
+    reordered paraphrases still share their shingles.
+    """
+    words = (word.strip('.') for word in _WORD.findall(question.lower()))
+    # Stopwords are dropped before stemming too, or 'does' would survive as 'doe'
+    stems = (_stem(word) for word in words if word not in _STOPWORDS)
+    return {stem for stem in stems if stem and stem not in _STOPWORDS}
+
+
+class MinHashLSH:
+    """MinHash signatures over question shingles, banded for sublinear candidate lookup"""
+
+    def __init__(self, bands, rows, threshold, seed=17):
+        self.bands = bands
+        self.rows = rows
+        self.threshold = threshold
+        generator = random.Random(seed)
+        self._permutations = [
+            (generator.randrange(1, _MERSENNE_PRIME), generator.randrange(0, _MERSENNE_PRIME))
+            for _ in range(bands * rows)
+        ]
+        self._buckets = defaultdict(list)
+        self._signatures = {}
+
+    def _signature(self, question):
+        hashes = [
+            int.from_bytes(hashlib.blake2b(shingle.encode('utf-8'), digest_size=8).digest(), 'big')
+            for shingle in question_shingles(question)
+        ]
+        if not hashes:
+            return None
+        return tuple(min((a * value + b) % _MERSENNE_PRIME for value in hashes) for a, b in self._permutations)
+
+    def _band_keys(self, signature):
+        return [(band, signature[band * self.rows:(band + 1) * self.rows]) for band in range(self.bands)]
+
+    def add(self, question):
+        signature = self._signature(question)
+        if signature is None:
+            return
+        self._signatures[question] = signature
+        for key in self._band_keys(signature):
+            self._buckets[key].append(question)
+
+    def find_duplicate(self, question):
+        signature = self._signature(question)
+        if signature is None:
+            return None
+        candidates = {earlier for key in self._band_keys(signature) for earlier in self._buckets.get(key, ())}
+        for earlier in candidates:
+            matches = sum(a == b for a, b in zip(signature, self._signatures[earlier]))
+            if matches / len(signature) >= self.threshold:
+                return earlier
+        return None
+
+
+class HyperplaneLSH:
+    """Question embeddings bucketed by random-hyperplane signatures, verified by cosine similarity"""
+
+    def __init__(self, model, bits, tables, threshold, seed=17):
+        self.model = model
+        self.threshold = threshold
+        dimension = model.get_sentence_embedding_dimension()
+        self._planes = np.random.default_rng(seed).standard_normal((tables, bits, dimension))
+        self._weights = 1 << np.arange(bits)
+        self._buckets = defaultdict(list)
+        self._embeddings = {}
+
+    def _embed(self, question):
+        return self.model.encode(question, normalize_embeddings=True)
+
+    def _bucket_keys(self, embedding):
+        codes = ((self._planes @ embedding) > 0) @ self._weights
+        return list(enumerate(codes.tolist()))
+
+    def add(self, question):
+        embedding = self._embed(question)
+        self._embeddings[question] = embedding
+        for key in self._bucket_keys(embedding):
+            self._buckets[key].append(question)
+
+    def find_duplicate(self, question):
+        embedding = self._embed(question)
+        candidates = {earlier for key in self._bucket_keys(embedding) for earlier in self._buckets.get(key, ())}
+        best, best_similarity = None, self.threshold
+        for earlier in candidates:
+            similarity = float(self._embeddings[earlier] @ embedding)
+            if similarity >= best_similarity:
+                best, best_similarity = earlier, similarity
+        return best
+
+
+class DuplicateQuestionIndex:
+    """
+    Index of the questions asked in one session.
+
+    Call sync() with the questions asked so far (cheap for questions already
+    indexed) and find_duplicate()/is_duplicate() for a candidate question.
+    """
+
+    def __init__(self, mode=None):
+        mode = mode or DUPLICATE_DETECTION['mode']
+        if mode == 'auto':
+            mode = 'embedding' if SentenceTransformer is not None else 'minhash'
+        self.mode = mode
+        self._index = None  # Built on first use, so creating a session does not load the model
+        self._questions = set()
+        self._lock = threading.Lock()  # Prefetch workers check questions while the UI thread adds them
+
+    def _get_index(self):
+        if self._index is None:
+            if self.mode == 'embedding':
+                self._index = HyperplaneLSH(
+                    get_embedding_model(),
+                    DUPLICATE_DETECTION['hyperplane_bits'],
+                    DUPLICATE_DETECTION['hyperplane_tables'],
+                    DUPLICATE_DETECTION['embedding_threshold']
+                )
+            else:
+                self._index = MinHashLSH(
+                    DUPLICATE_DETECTION['minhash_bands'],
+                    DUPLICATE_DETECTION['minhash_rows'],
+                    DUPLICATE_DETECTION['minhash_threshold']
+                )
+        return self._index
+
+    def add(self, question):
+        with self._lock:
+            if question and question not in self._questions:
+                self._questions.add(question)
+                self._get_index().add(question)
+
+    def sync(self, questions):
+        """Add every question not indexed yet"""
+        for question in questions:
+            self.add(question)
+
+    def find_duplicate(self, question):
+        """The earlier question that question duplicates, or None"""
+        with self._lock:
+            if question in self._questions:
+                return question
+            return self._get_index().find_duplicate(question)
+
+    def is_duplicate(self, question):
+        return self.find_duplicate(question) is not None
@@ -1,9 +1,65 @@
-import streamlit as st
 from langchain.chains import ConversationChain
+from configuration.settings import RESPONSE_CACHE
+from LLM_models.llm_manager import LLMManager, StreamingTextHandler, strip_reasoning
+from LLM_models.scheduler import get_llm_scheduler
+from technical_assessment.question_bank import get_question_bank
+from technical_assessment.question_pools import get_question_pool_store
+from utility.diagnostics import error
+from utility.background import get_worker_pool
+from utility.tracing import get_tracer, traced, annotate_span
+from collections import namedtuple
 import re
 
+# Result of the question set functions; problems are reported in diagnostics (see utility.diagnostics)
+QuestionSet = namedtuple('QuestionSet', ['questions', 'diagnostics'])
+
+
+def predict_conversation(conversation, prompt, callbacks=None):
+    """Run a prompt through the conversation chain under the process-wide LLM scheduler"""
+    return get_llm_scheduler().call(
+        'conversation', conversation.llm.model_name, prompt,
+        conversation.predict, input=prompt, callbacks=callbacks
+    )
+
+
+def predict_with_response_cache(conversation, prompt):
+    """
+    Run a prompt through the conversation, serving it from the response cache
+    when the conversation has no history yet (so the output only depends on
+    the persona and the prompt). Cached answers are still written to memory.
+    """
+    if not RESPONSE_CACHE['enabled'] or conversation.memory.load_memory_variables({}).get('history'):
+        return predict_conversation(conversation, prompt)
+    
+    cache = LLMManager.get_response_cache()
+    key = cache.make_key(
+        conversation.llm.model_name,
+        'conversation',
+        {
+            'temperature': conversation.llm.temperature,
+            'max_tokens': conversation.llm.max_tokens,
+            'system_prompt': conversation.prompt.messages[0].prompt.template
+        },
+        prompt
+    )
+    response = cache.get(key)
+    if response is not None:
+        get_tracer().record({'name': 'llm.conversation', 'model': conversation.llm.model_name, 'cache_hit': True})
+        conversation.memory.save_context({'input': prompt}, {'response': response})
+        return response
+    
+    response = predict_conversation(conversation, prompt)
+    if response:
+        cache.set(key, response)
+    return response
+
 # Function to generate technical questions
+@traced('question_generation')
 def generate_technical_questions(tech_stack, conversation):
+    """
+    Five questions of increasing difficulty for a tech stack (comma-separated string).
+    Returns: QuestionSet (questions, diagnostics); questions is empty if none could be generated
+    """
     prompt = f"""
     Based on the tech stack: {tech_stack}, generate 5 questions with increasing difficulty:
 
@@ -31,21 +87,61 @@ def generate_technical_questions(tech_stack, conversation):
     """
    
     try:
-        response = conversation.predict(input=prompt)
-        
-        questions = []
-        for line in response.splitlines():
-            if line.strip().startswith('Question'):
-                questions.append(line.strip())
-        
-        return questions[:5]  # Ensure we only return 5 questions
+        response = predict_with_response_cache(conversation, prompt)
     except Exception as e:
-        st.error(f"Error generating questions: {str(e)}")
-        return ["Error generating questions. Please try again."]
+        annotate_span(error=type(e).__name__)
+        return QuestionSet([], [error('question_generation_failed', f"Error generating questions: {str(e)}")])
+    
+    questions = []
+    for line in response.splitlines():
+        if line.strip().startswith('Question'):
+            questions.append(line.strip())
+    
+    if not questions:
+        return QuestionSet([], [error('question_generation_empty', "The model returned no questions in the expected format")])
+    return QuestionSet(questions[:5], [])  # Ensure we only return 5 questions
 
 
-def generate_focused_question(tech_stack, focus_areas, previous_questions, conversation):
-    """Generate a new question based on focus areas and previous questions"""
+@traced('initial_questions')
+def get_initial_questions(tech_stack, conversation):
+    """
+    Initial five questions for a tech stack (list of technologies). In order of
+    preference: sampled from the pre-generated pool for the stack, served from
+    the question bank when it covers the stack, or generated by the LLM and
+    added to the bank in the background for later candidates.
+    Returns: QuestionSet (questions, diagnostics); questions is empty if none could be generated
+    """
+    pool_store = get_question_pool_store()
+    if pool_store:
+        try:
+            pool_store.record_demand(tech_stack)
+            questions = pool_store.sample_questions(tech_stack)
+        except Exception:
+            questions = None
+        if questions:
+            annotate_span(source='pool', cache_hit=True)
+            return QuestionSet(questions, [])
+    
+    # Sessions arriving while the embedding model is still loading skip the bank
+    bank = get_question_bank(wait=False)
+    if bank:
+        try:
+            questions = bank.select_questions(tech_stack)
+        except Exception:
+            questions = None
+        if questions:
+            annotate_span(source='bank', cache_hit=True)
+            return QuestionSet(questions, [])
+    
+    annotate_span(source='llm')
+    generated = generate_technical_questions(', '.join(tech_stack), conversation)
+    if bank and len(generated.questions) == 5:
+        get_worker_pool().submit(bank.add_questions, tech_stack, generated.questions)
+    return generated
+
+
+def build_focused_question_prompt(tech_stack, focus_areas, previous_questions):
+    """Build the prompt asking for one focused follow-up question"""
     focus_areas_str = ", ".join(focus_areas) if focus_areas else "general technical knowledge"
     
     prompt = f"""
@@ -63,14 +159,38 @@ def generate_focused_question(tech_stack, focus_areas, previous_questions, conve
     
     Return ONLY the question text, no additional formatting or commentary.
     """
+    return prompt
+
+
+def is_repeated_question(question, previous_questions, duplicate_index=None):
+    """
+    True if question repeats or paraphrases one already asked. Uses the session's
+    DuplicateQuestionIndex when given, else the pairwise word-overlap check.
+    """
+    if duplicate_index is not None:
+        duplicate_index.sync(previous_questions)
+        return duplicate_index.is_duplicate(question)
+    return any(similar_questions(question, prev_q) for prev_q in previous_questions)
+
+
+@traced('focused_question')
+def generate_focused_question(tech_stack, focus_areas, previous_questions, conversation, on_text=None,
+                              duplicate_index=None):
+    """
+    Generate a new question based on focus areas and previous questions.
+    If on_text is given the question is streamed to on_text(text_so_far) as it is generated.
+    """
+    prompt = build_focused_question_prompt(tech_stack, focus_areas, previous_questions)
+    callbacks = [StreamingTextHandler(on_text)] if on_text else None
     
     try:
-        new_question = conversation.predict(input=prompt).strip()
+        new_question = strip_reasoning(predict_conversation(conversation, prompt, callbacks))
         # Verify it's not too similar to previous questions
-        if any(similar_questions(new_question, prev_q) for prev_q in previous_questions):
+        if is_repeated_question(new_question, previous_questions, duplicate_index):
             # Try one more time with explicit differentiation
             prompt += "\nIMPORTANT: Question must be substantially different from previous questions!"
-            new_question = conversation.predict(input=prompt).strip()
+            callbacks = [StreamingTextHandler(on_text)] if on_text else None
+            new_question = strip_reasoning(predict_conversation(conversation, prompt, callbacks))
         
         return new_question
     except Exception as e:
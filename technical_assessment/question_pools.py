@@ -0,0 +1,212 @@
+"""
+Pre-generated question pools for the most requested tech stacks.
+
+Every session start records its normalized tech stack, so the stacks
+candidates actually list can be ranked by demand. The pool builder generates
+graded questions (difficulty 1-5, following the initial question prompt) for
+the top stacks ahead of time, and sessions with a pooled stack sample their
+initial questions from the pool instead of waiting on the LLM. The least-served
+questions are preferred so consecutive candidates see different sets.
+
+Fill pools for the top stacks (run from the repository root, e.g. nightly):
+    python -m technical_assessment.question_pools --top 10 --rounds 4
+
+Fill a specific stack:
+    python -m technical_assessment.question_pools --stack "Python, Django, PostgreSQL"
+"""
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import threading
+import time
+from configuration.settings import QUESTION_POOLS
+from technical_assessment.question_bank import DIFFICULTY_LABELS, stack_skills, strip_question_prefix
+
+
+def stack_key(tech_stack):
+    """Order-independent key of a tech stack: its canonical skills, sorted"""
+    return ', '.join(sorted(stack_skills(tech_stack)))
+
+
+class QuestionPoolStore:
+    """SQLite store of pooled questions and per-stack demand"""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS pool_questions (
+                stack TEXT NOT NULL,
+                difficulty INTEGER NOT NULL,
+                question TEXT NOT NULL,
+                served INTEGER NOT NULL DEFAULT 0,
+                created REAL NOT NULL,
+                PRIMARY KEY (stack, question)
+            );
+            CREATE INDEX IF NOT EXISTS idx_pool_stack ON pool_questions (stack, difficulty, served);
+            CREATE TABLE IF NOT EXISTS stack_demand (
+                stack TEXT PRIMARY KEY,
+                requests INTEGER NOT NULL,
+                last_requested REAL NOT NULL
+            );
+        """)
+        self._conn.commit()
+
+    def record_demand(self, tech_stack):
+        key = stack_key(tech_stack)
+        if not key:
+            return
+        with self._lock:
+            self._conn.execute(
+                """INSERT INTO stack_demand (stack, requests, last_requested) VALUES (?, 1, ?)
+                   ON CONFLICT (stack) DO UPDATE SET requests = requests + 1, last_requested = excluded.last_requested""",
+                (key, time.time())
+            )
+            self._conn.commit()
+
+    def top_stacks(self, limit):
+        """Most requested stack keys with their request counts"""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT stack, requests FROM stack_demand ORDER BY requests DESC, last_requested DESC LIMIT ?",
+                (limit,)
+            ).fetchall()
+
+    def add_questions(self, key, questions_by_difficulty):
+        """Store questions given as (difficulty, question) pairs; returns how many were new"""
+        now = time.time()
+        with self._lock:
+            before = self._conn.total_changes
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO pool_questions (stack, difficulty, question, created) VALUES (?, ?, ?, ?)",
+                [(key, difficulty, question, now) for difficulty, question in questions_by_difficulty]
+            )
+            self._conn.commit()
+            return self._conn.total_changes - before
+
+    def pool_sizes(self, key):
+        """Mapping of difficulty -> number of pooled questions for a stack key"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT difficulty, COUNT(*) FROM pool_questions WHERE stack = ? GROUP BY difficulty", (key,)
+            ).fetchall()
+        return dict(rows)
+
+    def questions(self, key):
+        with self._lock:
+            return [row[0] for row in self._conn.execute(
+                "SELECT question FROM pool_questions WHERE stack = ?", (key,)
+            )]
+
+    def sample_questions(self, tech_stack):
+        """
+        One pooled question per difficulty for the stack, formatted like the LLM
+        output ("Question N: ..."), or None if the pool is missing or too small.
+        Within each difficulty a question is drawn at random from the least served
+        ones, and the draw is counted.
+        """
+        key = stack_key(tech_stack)
+        sizes = self.pool_sizes(key)
+        if any(sizes.get(difficulty, 0) < QUESTION_POOLS['min_per_difficulty'] for difficulty in DIFFICULTY_LABELS):
+            return None
+
+        selected = []
+        with self._lock:
+            for difficulty in DIFFICULTY_LABELS:
+                rows = self._conn.execute(
+                    """SELECT question FROM pool_questions
+                       WHERE stack = ? AND difficulty = ? AND served = (
+                           SELECT MIN(served) FROM pool_questions WHERE stack = ? AND difficulty = ?
+                       )""",
+                    (key, difficulty, key, difficulty)
+                ).fetchall()
+                choices = [row[0] for row in rows if row[0] not in selected]
+                if not choices:
+                    return None
+                selected.append(random.choice(choices))
+            self._conn.executemany(
+                "UPDATE pool_questions SET served = served + 1 WHERE stack = ? AND question = ?",
+                [(key, question) for question in selected]
+            )
+            self._conn.commit()
+        return [f"Question {number}: {question}" for number, question in enumerate(selected, 1)]
+
+
+_pool_store = None
+_pool_store_lock = threading.Lock()
+
+
+def get_question_pool_store():
+    """Return the process-wide question pool store, or None if pools are disabled"""
+    global _pool_store
+    if not QUESTION_POOLS['enabled']:
+        return None
+    if _pool_store is None:
+        with _pool_store_lock:
+            if _pool_store is None:
+                _pool_store = QuestionPoolStore(QUESTION_POOLS['path'])
+    return _pool_store
+
+
+def build_pool(store, tech_stack, rounds):
+    """
+    Generate rounds sets of graded questions for a stack and add them to its pool.
+    One conversation is used for all rounds, so each round sees the questions
+    already generated and produces new ones.
+    """
+    # Imported here so serving pools does not pull in the LLM stack
+    from LLM_models.llm_manager import get_session_conversation
+    from technical_assessment.question_dedup import DuplicateQuestionIndex
+    from technical_assessment.question_generation import generate_technical_questions
+
+    key = stack_key(tech_stack)
+    duplicate_index = DuplicateQuestionIndex()
+    duplicate_index.sync(store.questions(key))
+    conversation = get_session_conversation({'Tech Stack': tech_stack}, state={})
+
+    added = 0
+    for _ in range(rounds):
+        questions = generate_technical_questions(', '.join(tech_stack), conversation).questions
+        if len(questions) != len(DIFFICULTY_LABELS):
+            continue
+        fresh = []
+        for difficulty, question in enumerate(questions, 1):
+            text = strip_question_prefix(question)
+            if text and not duplicate_index.is_duplicate(text):
+                duplicate_index.add(text)
+                fresh.append((difficulty, text))
+        added += store.add_questions(key, fresh)
+    return added
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Pre-generate question pools for popular tech stacks.')
+    parser.add_argument('--top', type=int, default=QUESTION_POOLS['top_stacks'], help='Fill the N most requested stacks')
+    parser.add_argument('--stack', action='append', default=[], help='Comma separated stack to fill (repeatable)')
+    parser.add_argument('--rounds', type=int, default=QUESTION_POOLS['rounds_per_stack'], help='Generation rounds per stack')
+    args = parser.parse_args(argv)
+
+    store = QuestionPoolStore(QUESTION_POOLS['path'])
+    stacks = [[tech.strip() for tech in stack.split(',') if tech.strip()] for stack in args.stack]
+    if not stacks:
+        stacks = [key.split(', ') for key, _ in store.top_stacks(args.top)]
+    if not stacks:
+        print("No stack demand recorded yet; pass --stack to fill a pool")
+        return 1
+
+    for tech_stack in stacks:
+        added = build_pool(store, tech_stack, args.rounds)
+        sizes = store.pool_sizes(stack_key(tech_stack))
+        print(f"{stack_key(tech_stack)}: +{added} questions, pool per difficulty {dict(sorted(sizes.items()))}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
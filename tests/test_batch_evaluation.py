@@ -0,0 +1,61 @@
+import json
+import pytest
+
+pytest.importorskip('langchain')
+
+from technical_assessment import evaluation
+from LLM_models.llm_manager import LLMManager
+
+
+class RecordingLLM:
+    """Returns canned batch responses and records which prompts were invalidated"""
+
+    def __init__(self, batch_response):
+        self.batch_response = batch_response
+        self.invalidated = []
+
+    def predict(self, prompt):
+        if 'JSON array with one object per answer' in prompt:
+            return self.batch_response
+        return 'not json'
+
+    def invalidate(self, prompt):
+        self.invalidated.append(prompt)
+
+
+def _rubric(index):
+    dimension = {'score': 80, 'feedback': 'Solid'}
+    return {
+        'index': index,
+        'technical_accuracy': dimension,
+        'completeness': dimension,
+        'clarity': dimension,
+        'best_practices': dimension,
+        'overall_feedback': 'Good'
+    }
+
+
+QA_PAIRS = [
+    ('How do Python generators work?', 'They yield values lazily.'),
+    ('When would you index a PostgreSQL column?', 'When it is filtered on often.')
+]
+
+
+def _evaluate(monkeypatch, llm):
+    monkeypatch.setattr(LLMManager, 'get_cached_llm', classmethod(lambda cls, llm_type, **kwargs: llm))
+    return evaluation.evaluate_answers_batch(QA_PAIRS, ['Python', 'PostgreSQL'])
+
+
+def test_complete_batch_response_is_kept(monkeypatch):
+    llm = RecordingLLM(json.dumps([_rubric(1), _rubric(2)]))
+    results = _evaluate(monkeypatch, llm)
+    assert [score for score, _ in results] == pytest.approx([0.8, 0.8])
+    assert not any('JSON array' in prompt for prompt in llm.invalidated)
+
+
+@pytest.mark.parametrize('batch_response', [json.dumps([_rubric(1)]), 'Sorry, I cannot do that'])
+def test_incomplete_batch_response_is_invalidated(monkeypatch, batch_response):
+    llm = RecordingLLM(batch_response)
+    results = _evaluate(monkeypatch, llm)
+    assert len(results) == len(QA_PAIRS)
+    assert any('JSON array with one object per answer' in prompt for prompt in llm.invalidated)
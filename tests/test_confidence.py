@@ -0,0 +1,36 @@
+import itertools
+
+from technical_assessment.confidence import AssessmentState
+
+SCORES = {
+    "How does caching affect database performance?": 0.4,
+    "When is an algorithm's complexity worth optimizing?": 0.5,
+    "How do you test api security?": 0.3,
+    "Describe your debugging process": 0.9
+}
+ANSWERS = {question: "An answer" for question in SCORES}
+
+
+def test_focus_areas_do_not_depend_on_scoring_order():
+    expected = AssessmentState.replay(SCORES, ANSWERS).focus_areas()
+    for order in itertools.permutations(SCORES):
+        state = AssessmentState()
+        for question in order:
+            state.record_answer(question, ANSWERS[question])
+            state.record_score(question, SCORES[question])
+        assert state.focus_areas() == expected
+        assert state.assess() == AssessmentState.replay(SCORES, ANSWERS).assess()
+
+
+def test_focus_area_ties_are_broken_by_name():
+    # Every weak topic is mentioned once, so all are tied
+    assert AssessmentState.replay(SCORES, ANSWERS).focus_areas() == ['algorithm', 'api', 'caching']
+
+
+def test_rescored_question_replaces_its_topics():
+    state = AssessmentState()
+    question = "How do you test api security?"
+    state.record_score(question, 0.3)
+    state.record_score(question, 0.95)
+    assert state.scored_count == 1
+    assert state.focus_areas() == ['problem-solving', 'technical depth', 'implementation details']
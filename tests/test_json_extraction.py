@@ -0,0 +1,70 @@
+import json
+import os
+import pytest
+
+from utility.json_extraction import IncrementalJSONParser, extract_json
+
+FIXTURES = os.path.join(os.path.dirname(__file__), 'fixtures', 'llm_responses')
+RESPONSES = sorted(name[:-len('.txt')] for name in os.listdir(FIXTURES) if name.endswith('.txt'))
+
+
+def load_fixture(name):
+    """Return (raw response, expected parse, container) for a fixture response"""
+    with open(os.path.join(FIXTURES, f'{name}.txt'), encoding='utf-8') as response_file:
+        response = response_file.read()
+    with open(os.path.join(FIXTURES, f'{name}.expected.json'), encoding='utf-8') as expected_file:
+        expected = json.load(expected_file)
+    return response, expected, '[' if isinstance(expected, list) else '{'
+
+
+def feed_in_chunks(response, size, container):
+    values = []
+    parser = IncrementalJSONParser(on_value=lambda path, value: values.append((path, value)), container=container)
+    for start in range(0, len(response), size):
+        parser.feed(response[start:start + size])
+    return parser, values
+
+
+@pytest.mark.parametrize('name', RESPONSES)
+def test_whole_response(name):
+    response, expected, container = load_fixture(name)
+    assert extract_json(response, container=container) == expected
+
+
+@pytest.mark.parametrize('size', [1, 3, 7, 64])
+@pytest.mark.parametrize('name', RESPONSES)
+def test_chunk_fed_response(name, size):
+    response, expected, container = load_fixture(name)
+    parser, values = feed_in_chunks(response, size, container)
+    assert parser.result() == expected
+    # The streamed values do not depend on how the response was split
+    assert values == feed_in_chunks(response, len(response), container)[1]
+
+
+def test_values_are_streamed_with_their_paths():
+    response, _, container = load_fixture('fenced')
+    parser, values = feed_in_chunks(response, 5, container)
+    assert parser.done
+    assert (('technical_accuracy', 'score'), 85) in values
+    assert (('completeness', 'feedback'), 'Misses send()') in values
+    assert parser.values[('overall_feedback',)] == 'Good answer'
+
+
+def test_think_block_split_across_chunks_is_skipped():
+    response, expected, container = load_fixture('think_wrapped')
+    split = response.index('<think>') + 3
+    parser = IncrementalJSONParser(container=container)
+    parser.feed(response[:split])
+    parser.feed(response[split:])
+    assert parser.result() == expected
+
+
+def test_truncated_response_reports_not_done():
+    response, _, container = load_fixture('truncated')
+    parser, values = feed_in_chunks(response, 4, container)
+    assert not parser.done
+    assert (('completeness', 'score'), 50) in values
+
+
+def test_response_without_json():
+    assert extract_json('I cannot evaluate this answer.') is None
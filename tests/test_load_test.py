@@ -0,0 +1,34 @@
+import pytest
+
+pytest.importorskip('langchain')
+
+from benchmarks import load_test
+from benchmarks.fake_llm import make_client_factory
+from configuration import settings
+from LLM_models.llm_manager import LLMManager
+
+
+@pytest.fixture
+def restored_settings(monkeypatch):
+    # main() reconfigures the settings for its run; put them back afterwards
+    for store in (settings.RESPONSE_CACHE, settings.RESUME_CACHE, settings.QUESTION_BANK,
+                  settings.QUESTION_POOLS, settings.SESSION_STORE, settings.TRACING, settings.LLM_SCHEDULER):
+        for key, value in list(store.items()):
+            monkeypatch.setitem(store, key, value)
+    monkeypatch.setattr(LLMManager, '_response_cache', None)
+    try:
+        yield
+    finally:
+        LLMManager.set_client_factory(None)
+
+
+def test_fake_clients_do_not_report_real_model_names():
+    client = make_client_factory(latency_ms=0, jitter_ms=0)(llm_type='evaluation', model_name='llama-3.3-70b-versatile')
+    assert client.model_name == 'fake-llama-3.3-70b-versatile'
+
+
+def test_load_test_leaves_production_stores_untouched(tmp_path, monkeypatch, restored_settings):
+    monkeypatch.chdir(tmp_path)
+    load_test.main(['--candidates', '1', '--questions', '1', '--latency-ms', '0', '--jitter-ms', '0',
+                    '--use-response-cache'])
+    assert list(tmp_path.iterdir()) == []
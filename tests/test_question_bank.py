@@ -0,0 +1,96 @@
+import hashlib
+import os
+import pytest
+
+chromadb = pytest.importorskip('chromadb')
+
+from configuration import settings
+from technical_assessment import question_bank
+from technical_assessment.question_bank import QuestionBank, strip_question_prefix
+
+QUESTIONS = [
+    "Question 1: What is a Python decorator?",
+    "Question 2: How does Python's garbage collection work?",
+    "Question 3: How would you cache Python function results in a web app?",
+    "Question 4: How would you find a memory leak in a Python service?",
+    "Question 5: Compare Python threads with asyncio for IO-bound work."
+]
+
+
+class WordHashEmbedding(chromadb.EmbeddingFunction):
+    """Bag-of-words hashing embedding, so tests need no sentence-transformers model"""
+
+    def __init__(self, model_name=None):
+        pass
+
+    def __call__(self, input):
+        vectors = []
+        for text in input:
+            vector = [0.0] * 64
+            for word in text.lower().split():
+                vector[int(hashlib.md5(word.encode()).hexdigest(), 16) % 64] += 1.0
+            vectors.append(vector)
+        return vectors
+
+
+@pytest.fixture
+def bank_settings(tmp_path, monkeypatch):
+    monkeypatch.setattr(question_bank, 'SentenceTransformerEmbeddingFunction', WordHashEmbedding)
+    monkeypatch.setitem(settings.QUESTION_BANK, 'path', str(tmp_path / 'runtime'))
+    monkeypatch.setitem(settings.QUESTION_BANK, 'curated_path', str(tmp_path / 'curated'))
+    # Every question in the bank is close enough for these tests
+    monkeypatch.setitem(settings.QUESTION_BANK, 'max_distance', 2.0)
+    return settings.QUESTION_BANK
+
+
+def open_bank(config, path=None, curated=True):
+    return QuestionBank(
+        path or config['path'], config['collection'], config['embedding_model'],
+        curated_path=config['curated_path'] if curated else None
+    )
+
+
+def snapshot(directory):
+    return {
+        name: os.path.getmtime(os.path.join(root, name))
+        for root, _, names in os.walk(directory) for name in names
+    }
+
+
+def test_strip_question_prefix():
+    assert strip_question_prefix("Question 3: How would you scale it?") == "How would you scale it?"
+    assert strip_question_prefix("question 2) What is a closure?") == "What is a closure?"
+
+
+def test_generated_questions_are_served_to_later_sessions(bank_settings):
+    bank = open_bank(bank_settings)
+    assert bank.select_questions(['Python']) is None
+
+    assert bank.add_questions(['Python'], QUESTIONS) == 5
+    selected = bank.select_questions(['python'])
+    assert selected == QUESTIONS
+
+
+def test_curated_store_is_searched_but_never_written(bank_settings):
+    curated = open_bank(bank_settings, path=bank_settings['curated_path'], curated=False)
+    curated.add_questions(['Python'], QUESTIONS, source='curated')
+    del curated
+    before = snapshot(bank_settings['curated_path'])
+
+    bank = open_bank(bank_settings)
+    assert bank.count() == 5
+    assert bank.select_questions(['Python']) == QUESTIONS
+    bank.add_questions(['Python'], ["Question 1: What is a Python generator?"])
+
+    assert snapshot(bank_settings['curated_path']) == before
+    assert os.path.isdir(bank_settings['path'])
+
+
+def test_sessions_do_not_wait_for_the_bank_to_load(bank_settings, monkeypatch):
+    monkeypatch.setattr(question_bank, '_question_bank', None)
+    monkeypatch.setattr(question_bank, '_question_bank_failed', False)
+    monkeypatch.setattr(question_bank, '_warm_up', None)
+
+    assert question_bank.get_question_bank(wait=False) is None
+    question_bank._warm_up.result(timeout=30)
+    assert question_bank.get_question_bank(wait=False) is question_bank._question_bank is not None
@@ -0,0 +1,54 @@
+import pytest
+
+from technical_assessment.question_dedup import DuplicateQuestionIndex, question_shingles
+
+NEAR_DUPLICATES = [
+    ("How does Python's garbage collector handle reference cycles?",
+     "How does the garbage collector in Python handle reference cycles?"),
+    ("What is the difference between a process and a thread in Python?",
+     "In Python, what is the difference between a thread and a process?"),
+    ("How would you optimize a slow PostgreSQL query?",
+     "How would you optimize slow PostgreSQL queries?"),
+    ("Explain how React's virtual DOM improves performance.",
+     "How does the virtual DOM in React improve performance?"),
+    ("What are Python decorators and when would you use them?",
+     "When would you use decorators in Python, and what are they?"),
+    ("How do you handle database migrations in Django?",
+     "How would you handle Django database migrations?")
+]
+
+# Same stack and topic, but asking something else; these must not be rejected
+DISTINCT = [
+    ("How does Python's garbage collector handle reference cycles?",
+     "How does Python manage memory for large lists?"),
+    ("How would you optimize a slow PostgreSQL query?",
+     "How would you design indexes for a PostgreSQL table with frequent writes?"),
+    ("What are Python decorators?", "What are Python generators?"),
+    ("How do you handle database migrations in Django?", "How do you handle authentication in Django?"),
+    ("How does the virtual DOM in React improve performance?",
+     "How does React state management affect performance?"),
+    ("How would you scale a Django application?", "How would you test a Django application?"),
+    ("What is the difference between a process and a thread in Python?",
+     "What is the difference between a list and a tuple in Python?")
+]
+
+
+def minhash_index(*questions):
+    index = DuplicateQuestionIndex(mode='minhash')
+    index.sync(questions)
+    return index
+
+
+@pytest.mark.parametrize('earlier, candidate', NEAR_DUPLICATES)
+def test_near_duplicates_are_detected(earlier, candidate):
+    assert minhash_index(earlier).find_duplicate(candidate) == earlier
+
+
+@pytest.mark.parametrize('earlier, candidate', DISTINCT)
+def test_distinct_questions_on_the_same_topic_are_kept(earlier, candidate):
+    assert not minhash_index(earlier).is_duplicate(candidate)
+
+
+def test_stopwords_are_not_stemmed_into_content_words():
+    assert question_shingles("How does it work?") == {'work'}
+    assert question_shingles("Which queries are slow?") == {'query', 'slow'}
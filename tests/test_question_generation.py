@@ -0,0 +1,66 @@
+import os
+import sqlite3
+import pytest
+
+pytest.importorskip('langchain')
+
+from benchmarks.fake_llm import make_client_factory
+from configuration import settings
+from LLM_models.llm_manager import LLMManager, get_session_conversation
+from technical_assessment import question_generation
+
+CANDIDATE = {'Years of Experience': 4, 'Desired Position': 'Backend Engineer', 'Tech Stack': ['Python']}
+
+
+@pytest.fixture
+def cache_path(tmp_path, monkeypatch):
+    path = str(tmp_path / 'llm_responses.sqlite3')
+    monkeypatch.setitem(settings.RESPONSE_CACHE, 'path', path)
+    monkeypatch.setattr(LLMManager, '_response_cache', None)
+    LLMManager.set_client_factory(make_client_factory(latency_ms=0, jitter_ms=0))
+    try:
+        yield path
+    finally:
+        LLMManager.set_client_factory(None)
+
+
+def test_generation_failure_is_a_diagnostic_not_a_question(monkeypatch):
+    def unavailable(conversation, prompt):
+        raise ConnectionError("model unavailable")
+
+    monkeypatch.setattr(question_generation, 'predict_with_response_cache', unavailable)
+    questions, diagnostics = question_generation.generate_technical_questions('Python', conversation=None)
+
+    assert questions == []
+    assert [(d.level, d.code) for d in diagnostics] == [('error', 'question_generation_failed')]
+    assert 'model unavailable' in diagnostics[0].message
+    assert not hasattr(question_generation, 'st')
+
+
+def test_unformatted_response_is_a_diagnostic(monkeypatch):
+    monkeypatch.setattr(question_generation, 'predict_with_response_cache', lambda conversation, prompt: 'Sure!')
+    questions, diagnostics = question_generation.generate_technical_questions('Python', conversation=None)
+
+    assert questions == []
+    assert [d.code for d in diagnostics] == ['question_generation_empty']
+
+
+def test_conversation_prompts_skip_disabled_response_cache(cache_path, monkeypatch):
+    monkeypatch.setitem(settings.RESPONSE_CACHE, 'enabled', False)
+    conversation = get_session_conversation(CANDIDATE, state={})
+
+    questions, diagnostics = question_generation.generate_technical_questions('Python', conversation)
+
+    assert len(questions) == 5 and diagnostics == []
+    assert LLMManager._response_cache is None
+    assert not os.path.exists(cache_path)
+
+
+def test_conversation_prompts_use_enabled_response_cache(cache_path, monkeypatch):
+    monkeypatch.setitem(settings.RESPONSE_CACHE, 'enabled', True)
+    conversation = get_session_conversation(CANDIDATE, state={})
+
+    question_generation.generate_technical_questions('Python', conversation)
+
+    with sqlite3.connect(cache_path) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0] == 1
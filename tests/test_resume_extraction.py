@@ -0,0 +1,96 @@
+import io
+import time
+import pytest
+
+PyPDF2 = pytest.importorskip('PyPDF2')
+docx = pytest.importorskip('docx')
+
+from configuration import settings
+from utility import resume_extraction
+from utility.resume_buffer import ResumeBuffer
+from utility.resume_extraction import DOCX_MIME_TYPE, PDF_MIME_TYPE, ResumeTruncatedError, iter_resume_text
+
+
+def blank_pdf(pages):
+    writer = PyPDF2.PdfWriter()
+    for _ in range(pages):
+        writer.add_blank_page(width=612, height=792)
+    output = io.BytesIO()
+    writer.write(output)
+    return output.getvalue()
+
+
+def docx_bytes(paragraphs):
+    document = docx.Document()
+    for paragraph in paragraphs:
+        document.add_paragraph(paragraph)
+    output = io.BytesIO()
+    document.save(output)
+    return output.getvalue()
+
+
+def stuck_on_a_page(path, start, stop):
+    time.sleep(60)
+
+
+def read_all(data, file_type, parallel=True):
+    """Return (pieces, error) for a resume; error is the ResumeTruncatedError raised, if any"""
+    pieces = []
+    with ResumeBuffer(memoryview(data)) as buffer:
+        try:
+            for piece in iter_resume_text(buffer, file_type, parallel):
+                pieces.append(piece)
+        except ResumeTruncatedError as e:
+            return pieces, e
+    return pieces, None
+
+
+@pytest.mark.parametrize('parallel', [True, False])
+def test_pdf_pages_are_extracted_in_order(parallel, monkeypatch):
+    monkeypatch.setitem(settings.RESUME_EXTRACTION, 'parallel_min_pages', 4)
+    monkeypatch.setitem(settings.RESUME_EXTRACTION, 'pages_per_task', 2)
+    pieces, error = read_all(blank_pdf(5), PDF_MIME_TYPE, parallel)
+    assert pieces == ['\n'] * 5
+    assert error is None
+
+
+def test_pages_past_max_pages_are_reported(monkeypatch):
+    monkeypatch.setitem(settings.RESUME_EXTRACTION, 'max_pages', 3)
+    pieces, error = read_all(blank_pdf(5), PDF_MIME_TYPE)
+    assert len(pieces) == 3
+    assert 'first 3 of 5' in str(error)
+
+
+def test_text_past_max_chars_is_reported(monkeypatch):
+    monkeypatch.setitem(settings.RESUME_EXTRACTION, 'max_chars', 10)
+    pieces, error = read_all(docx_bytes(['Python developer', 'Django']), DOCX_MIME_TYPE)
+    assert ''.join(pieces) == 'Python dev'
+    assert error is not None
+
+
+def test_text_exactly_max_chars_is_complete(monkeypatch):
+    monkeypatch.setitem(settings.RESUME_EXTRACTION, 'max_chars', len('Python\n'))
+    pieces, error = read_all(docx_bytes(['Python']), DOCX_MIME_TYPE)
+    assert ''.join(pieces) == 'Python\n'
+    assert error is None
+
+
+@pytest.mark.parametrize('parallel', [True, False])
+def test_timed_out_extraction_recycles_the_pool(parallel, monkeypatch):
+    monkeypatch.setitem(settings.RESUME_EXTRACTION, 'task_timeout_seconds', 0.5)
+    monkeypatch.setattr(resume_extraction, 'extract_pdf_pages', stuck_on_a_page)
+    stuck_pool = resume_extraction.get_extraction_pool()
+    stuck_pool.submit(int).result()  # Start a worker so there is one to stop
+    workers = list(stuck_pool._processes.values())
+
+    pieces, error = read_all(blank_pdf(2), PDF_MIME_TYPE, parallel)
+
+    assert pieces == []
+    assert 'took longer than 0.5s' in str(error)
+    for worker in workers:
+        worker.join(timeout=5)
+        assert not worker.is_alive()
+
+    monkeypatch.undo()
+    assert resume_extraction.get_extraction_pool() is not stuck_pool
+    assert read_all(blank_pdf(2), PDF_MIME_TYPE, parallel) == (['\n', '\n'], None)
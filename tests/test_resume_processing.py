@@ -0,0 +1,45 @@
+import pytest
+
+pytest.importorskip('PyPDF2')
+pytest.importorskip('docx')
+
+from utility import resume_cache, resume_processing
+from utility.resume_extraction import ResumeTruncatedError
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    cache = resume_cache.ResumeCache(str(tmp_path / 'cache'))
+    monkeypatch.setattr(resume_processing, 'get_resume_cache', lambda: cache)
+    return cache
+
+
+@pytest.fixture
+def upload(tmp_path):
+    path = tmp_path / 'resume.pdf'
+    path.write_bytes(b'%PDF-1.4 placeholder')
+    return resume_processing.LocalResumeFile(str(path))
+
+
+def test_truncated_extraction_is_reported_and_not_cached(cache, upload, monkeypatch):
+    def timed_out_pages(buffer, file_type, parallel=True):
+        yield 'Page one: Python, Django\n'
+        raise ResumeTruncatedError("a page range timed out")
+
+    monkeypatch.setattr(resume_processing, 'iter_resume_text', timed_out_pages)
+    extraction = resume_processing.extract_resume(upload)
+
+    assert extraction.text == 'Page one: Python, Django\n'
+    assert [diagnostic.code for diagnostic in extraction.diagnostics] == ['resume_truncated']
+    assert cache.get_text(extraction.digest) is None
+
+
+def test_complete_extraction_is_cached(cache, upload, monkeypatch):
+    def pages(buffer, file_type, parallel=True):
+        yield 'Page one: Python, Django\n'
+
+    monkeypatch.setattr(resume_processing, 'iter_resume_text', pages)
+    extraction = resume_processing.extract_resume(upload)
+
+    assert extraction.diagnostics == []
+    assert cache.get_text(extraction.digest) == 'Page one: Python, Django\n'
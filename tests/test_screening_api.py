@@ -0,0 +1,188 @@
+import base64
+import io
+import pytest
+
+pytest.importorskip('fastapi')
+pytest.importorskip('langchain')
+docx = pytest.importorskip('docx')
+
+from fastapi.testclient import TestClient
+import screening_api
+from benchmarks.fake_llm import make_client_factory
+from configuration import settings
+from LLM_models.llm_manager import LLMManager
+from technical_assessment import question_generation
+from utility import session_store
+
+
+def _resume_base64():
+    document = docx.Document()
+    for line in (
+        'Jane Doe - Backend Engineer',
+        'Skills: Python, Django, PostgreSQL',
+        'Backend Engineer, Acme Corp, Jan 2018 - Present',
+        'Built Django services backed by PostgreSQL.'
+    ):
+        document.add_paragraph(line)
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return base64.b64encode(buffer.getvalue()).decode('ascii')
+
+
+CANDIDATE = {
+    'full_name': 'Jane Doe',
+    'email': 'jane@example.com',
+    'phone': '+14155550123',
+    'years_of_experience': 6,
+    'desired_position': 'Backend Engineer',
+    'location': 'Berlin',
+    'tech_stack': 'Python, Django, PostgreSQL',
+    'resume_filename': 'jane.docx'
+}
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    # Keep every store in the temporary directory and the LLM local
+    monkeypatch.setitem(settings.SESSION_STORE, 'backend', 'sqlite')
+    monkeypatch.setitem(settings.SESSION_STORE, 'path', str(tmp_path / 'sessions.sqlite3'))
+    monkeypatch.setitem(settings.RESUME_CACHE, 'enabled', False)
+    monkeypatch.setitem(settings.RESPONSE_CACHE, 'enabled', False)
+    monkeypatch.setitem(settings.QUESTION_POOLS, 'enabled', False)
+    monkeypatch.setitem(settings.QUESTION_BANK, 'enabled', False)
+    monkeypatch.setitem(settings.TRACING, 'jsonl_path', None)
+    monkeypatch.setitem(settings.TRACING, 'prometheus_path', None)
+    monkeypatch.setitem(settings.SCREENING_API, 'api_keys', ['test-key'])
+    monkeypatch.setattr(session_store, '_session_store', None)
+    screening_api._live_sessions.clear()
+    LLMManager.set_client_factory(make_client_factory(latency_ms=0, jitter_ms=0))
+    try:
+        yield TestClient(screening_api.app, headers={'Authorization': 'Bearer test-key'})
+    finally:
+        LLMManager.set_client_factory(None)
+        screening_api._live_sessions.clear()
+
+
+def _start(client):
+    response = client.post('/sessions', json={**CANDIDATE, 'resume_base64': _resume_base64()})
+    assert response.status_code == 201, response.text
+    return response.json()['session_id']
+
+
+def test_session_runs_from_start_to_report(client):
+    session_id = _start(client)
+
+    assert client.get(f'/sessions/{session_id}/report').status_code == 409
+
+    asked = 0
+    while True:
+        question = client.get(f'/sessions/{session_id}/question').json()
+        if question['completed']:
+            break
+        assert question['question_number'] == asked + 1
+        assert question['question']
+        answer = client.post(
+            f'/sessions/{session_id}/answers',
+            json={'answer': 'Django ORM queries are tuned with select_related and PostgreSQL indexes.'}
+        )
+        assert answer.status_code == 200, answer.text
+        asked += 1
+        assert asked <= settings.SCREENING_API['max_questions']
+
+    report = client.get(f'/sessions/{session_id}/report')
+    assert report.status_code == 200, report.text
+    body = report.json()
+    assert body['recommendation']
+    assert body['report']['Candidate Information']['Full Name'] == 'Jane Doe'
+    assert len(body['report']['Technical Assessment']) == asked
+
+
+def test_invalid_start_is_rejected(client):
+    response = client.post('/sessions', json={**CANDIDATE, 'email': 'nope', 'resume_base64': ''})
+    assert response.status_code == 422
+
+
+@pytest.mark.parametrize('headers', [
+    {'Authorization': ''},
+    {'Authorization': 'Bearer wrong-key'},
+    {'Authorization': '', 'X-API-Key': 'wrong-key'}
+])
+def test_requests_without_a_valid_key_are_rejected(client, headers):
+    assert client.post('/sessions', json={**CANDIDATE, 'resume_base64': _resume_base64()}, headers=headers).status_code == 401
+    assert client.get('/sessions/anything/question', headers=headers).status_code == 401
+    assert client.get('/sessions/anything/report', headers=headers).status_code == 401
+    assert client.post('/sessions/anything/answers', json={'skip': True}, headers=headers).status_code == 401
+
+
+def test_api_key_header_is_accepted(client):
+    session_id = _start(client)
+    response = client.get(f'/sessions/{session_id}/question', headers={'Authorization': '', 'X-API-Key': 'test-key'})
+    assert response.status_code == 200
+
+
+def test_requests_are_refused_without_configured_keys(client, monkeypatch):
+    monkeypatch.setitem(settings.SCREENING_API, 'api_keys', [])
+    assert client.get('/sessions/anything/question').status_code == 503
+
+
+def test_oversized_resume_is_rejected(client, monkeypatch):
+    oversized = base64.b64encode(b'x' * (settings.SCREENING_API['max_resume_bytes'] + 1)).decode('ascii')
+    response = client.post('/sessions', json={**CANDIDATE, 'resume_base64': oversized})
+    assert response.status_code == 422
+
+
+def test_sessions_with_pending_evaluations_are_not_evicted(client, monkeypatch):
+    monkeypatch.setitem(settings.SCREENING_API, 'max_live_sessions', 1)
+    busy = _start(client)
+    client.get(f'/sessions/{busy}/question')
+    client.post(f'/sessions/{busy}/answers', json={'answer': 'Python generators yield lazily.'})
+    assert screening_api._live_sessions[busy]['pending_evaluations']
+
+    idle = _start(client)
+    assert busy in screening_api._live_sessions
+
+    newest = _start(client)
+    assert idle not in screening_api._live_sessions
+    assert {busy, newest} <= set(screening_api._live_sessions)
+
+
+def test_failed_question_generation_is_a_gateway_error(client, monkeypatch):
+    def unavailable(conversation, prompt):
+        raise ConnectionError("model unavailable")
+
+    session_id = _start(client)
+    monkeypatch.setattr(question_generation, 'predict_with_response_cache', unavailable)
+    response = client.get(f'/sessions/{session_id}/question')
+
+    assert response.status_code == 502
+    assert 'Error generating questions: model unavailable' in response.json()['detail']
+
+
+def test_session_advanced_elsewhere_is_reloaded(client):
+    session_id = _start(client)
+    first = client.get(f'/sessions/{session_id}/question').json()['question']
+
+    # Another worker moves the session on
+    revision, state = session_store.load_session(session_id)
+    state['session_revision'] = revision
+    state['current_question'] = 'Question from another worker'
+    assert session_store.checkpoint_session(session_id, state)
+
+    current = client.get(f'/sessions/{session_id}/question').json()['question']
+    assert current != first
+    assert current == 'Question from another worker'
+
+
+def test_stale_checkpoint_is_a_conflict(client):
+    session_id = _start(client)
+    client.get(f'/sessions/{session_id}/question')
+    cached = screening_api._live_sessions[session_id]
+
+    revision, state = session_store.load_session(session_id)
+    state['session_revision'] = revision
+    assert session_store.checkpoint_session(session_id, state)
+
+    # The cached copy is now behind the store: saving it must not succeed
+    with pytest.raises(session_store.StaleSessionError):
+        screening_api._checkpoint(session_id, cached)
+    assert session_id not in screening_api._live_sessions
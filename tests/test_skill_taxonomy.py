@@ -0,0 +1,30 @@
+import pytest
+
+from configuration.settings import SKILL_TAXONOMY_PATH
+from technical_assessment.confidence import extract_technical_terms
+from utility.skill_taxonomy import SkillTaxonomy
+
+# The fixed term list extract_technical_terms used before the taxonomy existed;
+# focus areas must still be found for every one of them
+LEGACY_TECH_TERMS = [
+    'algorithm', 'data structure', 'optimization', 'complexity',
+    'database', 'architecture', 'design pattern', 'api',
+    'performance', 'scalability', 'security', 'testing',
+    'debugging', 'implementation', 'framework', 'library'
+]
+
+
+@pytest.fixture(scope='module')
+def taxonomy():
+    return SkillTaxonomy.from_file(SKILL_TAXONOMY_PATH)
+
+
+@pytest.mark.parametrize('term', LEGACY_TECH_TERMS)
+def test_taxonomy_covers_legacy_terms(taxonomy, term):
+    assert taxonomy.canonicalize(term) == term
+    assert taxonomy.category(term) is not None
+
+
+@pytest.mark.parametrize('term', LEGACY_TECH_TERMS)
+def test_legacy_terms_are_extracted(term):
+    assert term in extract_technical_terms(f"how would you approach the {term} of this service?")
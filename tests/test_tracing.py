@@ -0,0 +1,49 @@
+import json
+
+from configuration.settings import TRACING
+from utility.tracing import Tracer
+
+
+def make_tracer(tmp_path, **overrides):
+    settings = {
+        **TRACING,
+        'jsonl_path': str(tmp_path / 'traces.jsonl'),
+        'prometheus_path': None,
+        'export_interval_seconds': 3600,
+        **overrides
+    }
+    return Tracer(settings)
+
+
+def write_spans(tracer, count):
+    for number in range(count):
+        tracer.record({'name': 'question_generation', 'number': number})
+    tracer.export()
+
+
+def read_numbers(path):
+    with open(path, encoding='utf-8') as trace_file:
+        return [json.loads(line)['number'] for line in trace_file]
+
+
+def test_jsonl_is_rotated_keeping_one_backup(tmp_path):
+    tracer = make_tracer(tmp_path, jsonl_max_bytes=200)
+    path = tmp_path / 'traces.jsonl'
+
+    write_spans(tracer, 3)
+    first_batch = read_numbers(path)
+    write_spans(tracer, 3)
+    assert read_numbers(str(path) + '.1') == first_batch
+    write_spans(tracer, 3)
+
+    assert sorted(entry.name for entry in tmp_path.iterdir()) == ['traces.jsonl', 'traces.jsonl.1']
+    assert read_numbers(path) == [0, 1, 2]
+    assert read_numbers(str(path) + '.1') == [0, 1, 2]
+
+
+def test_jsonl_below_the_limit_is_appended(tmp_path):
+    tracer = make_tracer(tmp_path, jsonl_max_bytes=10 * 1024 * 1024)
+    write_spans(tracer, 2)
+    write_spans(tracer, 2)
+    assert read_numbers(tmp_path / 'traces.jsonl') == [0, 1, 0, 1]
+    assert not (tmp_path / 'traces.jsonl.1').exists()
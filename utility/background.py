@@ -0,0 +1,19 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from configuration.settings import WORKER_POOL_SIZE
+
+_worker_pool = None
+_worker_pool_lock = threading.Lock()
+
+
+def get_worker_pool():
+    """Return the process-wide thread pool used for background LLM work"""
+    global _worker_pool
+    if _worker_pool is None:
+        with _worker_pool_lock:
+            if _worker_pool is None:
+                _worker_pool = ThreadPoolExecutor(
+                    max_workers=WORKER_POOL_SIZE,
+                    thread_name_prefix='talentscout-worker'
+                )
+    return _worker_pool
@@ -0,0 +1,14 @@
+from collections import namedtuple
+
+# A problem met while producing a result, for the caller to surface however it
+# reports things (a Streamlit message, a log line, a column in a results file).
+# level is 'info', 'warning' or 'error'; code is a stable identifier for the problem.
+Diagnostic = namedtuple('Diagnostic', ['level', 'code', 'message'])
+
+
+def warning(code, message):
+    return Diagnostic('warning', code, message)
+
+
+def error(code, message):
+    return Diagnostic('error', code, message)
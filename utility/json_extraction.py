@@ -0,0 +1,183 @@
+import json
+import re
+
+THINK_BLOCK = re.compile(r'<think>.*?</think>', re.DOTALL)
+TRAILING_COMMA = re.compile(r',\s*([}\]])')
+LITERALS = {'true': True, 'false': False, 'null': None}
+
+
+class IncrementalJSONParser:
+    """
+    Streaming, tolerant parser for a JSON object (or array, with container='[')
+    embedded in LLM output.
+
+    Text before the object (reasoning blocks, code fences, chatter) is skipped.
+    Scalar values are reported through on_value(path, value) as soon as they are
+    complete, where path is the tuple of keys/indexes leading to the value, e.g.
+    ('clarity', 'score'). result() returns the parsed object, repairing common
+    truncation (unterminated strings, missing closing brackets, trailing commas).
+    """
+
+    def __init__(self, on_value=None, container='{'):
+        self.on_value = on_value
+        self._container = container
+        self.values = {}
+        self._preamble = ''
+        self._raw = []
+        self._length = 0
+        self._started = False
+        self._done = False
+        self._stack = []          # [opening char, current key or index]
+        self._expect_key = False
+        self._in_string = False
+        self._escape = False
+        self._string = []
+        self._string_is_key = False
+        self._scalar = []
+        self._safe_points = []    # (raw length, closers) where the prefix can be closed validly
+
+    @property
+    def done(self):
+        """True once the outermost object has been closed"""
+        return self._done
+
+    def feed(self, chunk):
+        """Consume the next chunk of model output"""
+        if self._done or not chunk:
+            return
+        if not self._started:
+            chunk = self._find_start(chunk)
+            if chunk is None:
+                return
+        for char in chunk:
+            self._raw.append(char)
+            self._length += 1
+            self._consume(char)
+            if self._done:
+                break
+
+    def result(self):
+        """Return the parsed object (repaired if truncated), or None if nothing usable was seen"""
+        if not self._started:
+            return None
+        raw = ''.join(self._raw)
+        candidates = [raw, TRAILING_COMMA.sub(r'\1', raw)]
+        if not self._done:
+            if self._in_string and not self._string_is_key:
+                # Keep the partial string value, e.g. feedback cut off mid-sentence
+                candidates.append(raw + '"' + self._closers())
+            for position, closers in reversed(self._safe_points):
+                candidates.append(TRAILING_COMMA.sub(r'\1', raw[:position].rstrip().rstrip(',') + closers))
+                break
+        for candidate in candidates:
+            try:
+                return json.loads(candidate)
+            except json.JSONDecodeError:
+                continue
+        return None
+
+    def _find_start(self, chunk):
+        self._preamble += chunk
+        visible = THINK_BLOCK.sub('', self._preamble)
+        think_start = visible.find('<think>')
+        search_area = visible if think_start == -1 else visible[:think_start]
+        start = search_area.find(self._container)
+        if start == -1:
+            if think_start == -1:
+                # Keep a short tail in case a <think> tag is split across chunks
+                self._preamble = visible[-len('<think>'):]
+            return None
+        self._started = True
+        self._preamble = ''
+        return visible[start:]
+
+    def _path(self):
+        return tuple(entry[1] for entry in self._stack)
+
+    def _closers(self):
+        return ''.join('}' if entry[0] == '{' else ']' for entry in reversed(self._stack))
+
+    def _mark_safe(self):
+        self._safe_points.append((self._length, self._closers()))
+
+    def _emit(self, value):
+        path = self._path()
+        self.values[path] = value
+        if self.on_value:
+            self.on_value(path, value)
+        self._mark_safe()
+
+    def _finish_scalar(self):
+        if not self._scalar:
+            return
+        token = ''.join(self._scalar).strip()
+        self._scalar = []
+        if token in LITERALS:
+            self._emit(LITERALS[token])
+            return
+        try:
+            self._emit(int(token))
+        except ValueError:
+            try:
+                self._emit(float(token))
+            except ValueError:
+                pass
+
+    def _consume(self, char):
+        if self._in_string:
+            if self._escape:
+                self._escape = False
+                self._string.append(char)
+            elif char == '\\':
+                self._escape = True
+                self._string.append(char)
+            elif char == '"':
+                self._in_string = False
+                try:
+                    text = json.loads('"' + ''.join(self._string) + '"')
+                except json.JSONDecodeError:
+                    text = ''.join(self._string)
+                if self._string_is_key and self._stack:
+                    self._stack[-1][1] = text
+                else:
+                    self._emit(text)
+            else:
+                self._string.append(char)
+            return
+
+        if char == '"':
+            self._in_string = True
+            self._string = []
+            self._string_is_key = bool(self._stack) and self._stack[-1][0] == '{' and self._expect_key
+        elif char in '{[':
+            self._stack.append([char, None if char == '{' else 0])
+            self._expect_key = char == '{'
+            self._mark_safe()
+        elif char in '}]':
+            self._finish_scalar()
+            if self._stack:
+                self._stack.pop()
+            self._expect_key = False
+            if not self._stack:
+                self._done = True
+            self._mark_safe()
+        elif char == ':':
+            self._expect_key = False
+        elif char == ',':
+            self._finish_scalar()
+            if self._stack and self._stack[-1][0] == '{':
+                self._expect_key = True
+                self._stack[-1][1] = None
+            elif self._stack:
+                self._stack[-1][1] += 1
+        elif char.isspace():
+            self._finish_scalar()
+        else:
+            self._scalar.append(char)
+
+
+def extract_json(text, container='{'):
+    """Locate and parse the JSON object (or array) in a complete LLM response, repairing truncation"""
+    parser = IncrementalJSONParser(container=container)
+    parser.feed(text)
+    return parser.result()
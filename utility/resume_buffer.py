@@ -0,0 +1,127 @@
+import io
+import mmap
+import os
+import shutil
+import tempfile
+from configuration.settings import RESUME_EXTRACTION
+
+
+class BufferStream(io.RawIOBase):
+    """Seekable read-only stream over a memoryview; reads copy only the bytes asked for"""
+
+    def __init__(self, view):
+        self._view = view
+        self._position = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def readinto(self, target):
+        count = max(0, min(len(target), len(self._view) - self._position))
+        target[:count] = self._view[self._position:self._position + count]
+        self._position += count
+        return count
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_SET:
+            position = offset
+        elif whence == io.SEEK_CUR:
+            position = self._position + offset
+        elif whence == io.SEEK_END:
+            position = len(self._view) + offset
+        else:
+            raise ValueError(f"Invalid whence: {whence}")
+        if position < 0:
+            raise ValueError("Negative seek position")
+        self._position = position
+        return position
+
+    def tell(self):
+        return self._position
+
+
+class ResumeBuffer:
+    """
+    Read-only view of a resume's bytes, shared by hashing and the PDF/DOCX
+    readers without copying the upload.
+
+    Streamlit uploads are viewed in place through getbuffer(), files on disk are
+    memory-mapped, and other file objects are read into memory or, above
+    spool_threshold_bytes, spooled to a temporary file that is memory-mapped.
+    Use as a context manager; the view is released on exit.
+    """
+
+    def __init__(self, view, path=None, cleanup=()):
+        self.view = view
+        self.path = path  # File holding the same bytes, if there is one
+        self._cleanup = list(cleanup)
+
+    @classmethod
+    def open(cls, resume_file):
+        """Buffer for an uploaded file, a LocalResumeFile or any binary file object"""
+        path = getattr(resume_file, 'path', None)
+        if path:
+            return cls.from_path(path)
+        if hasattr(resume_file, 'getbuffer'):
+            return cls(resume_file.getbuffer())
+        return cls.from_stream(resume_file)
+
+    @classmethod
+    def from_path(cls, path, remove=False):
+        file = open(path, 'rb')
+        cleanup = [file.close]
+        if remove:
+            cleanup.append(lambda: os.remove(path))
+        if os.fstat(file.fileno()).st_size == 0:
+            return cls(memoryview(b''), path, cleanup)
+        mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(memoryview(mapped), path, [mapped.close, *cleanup])
+
+    @classmethod
+    def from_stream(cls, stream):
+        threshold = RESUME_EXTRACTION['spool_threshold_bytes']
+        head = stream.read(threshold + 1)
+        if len(head) <= threshold:
+            return cls(memoryview(head))
+        fd, path = tempfile.mkstemp(suffix='.resume')
+        with os.fdopen(fd, 'wb') as spool:
+            spool.write(head)
+            del head
+            shutil.copyfileobj(stream, spool)
+        return cls.from_path(path, remove=True)
+
+    def __len__(self):
+        return len(self.view)
+
+    def stream(self):
+        """New independent file object over the buffer, for PyPDF2 and python-docx"""
+        return io.BufferedReader(BufferStream(self.view))
+
+    def spool_path(self):
+        """Path of a file with the buffer's bytes, written once if the buffer is in memory"""
+        if self.path is None:
+            fd, path = tempfile.mkstemp(suffix='.resume')
+            with os.fdopen(fd, 'wb') as spool:
+                spool.write(self.view)
+            self.path = path
+            self._cleanup.append(lambda: os.remove(path))
+        return self.path
+
+    def close(self):
+        # The view must be released before the mmap or BytesIO behind it can close or resize
+        self.view.release()
+        for cleanup in self._cleanup:
+            try:
+                cleanup()
+            except (OSError, BufferError):
+                pass
+        self._cleanup = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
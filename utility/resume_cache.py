@@ -0,0 +1,115 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from datetime import date
+from configuration.settings import CONFIDENCE_THRESHOLDS, RESUME_CACHE
+from utility.skill_taxonomy import get_skill_taxonomy
+
+# Bump when text extraction or the consistency analysis changes in a way that
+# makes previously cached results stale
+EXTRACTION_VERSION = 2
+ANALYSIS_VERSION = 2
+
+
+def resume_digest(data):
+    """SHA-256 of the uploaded resume bytes"""
+    return hashlib.sha256(data).hexdigest()
+
+
+def analysis_fingerprint(candidate_info):
+    """
+    Key for a cached analysis: the candidate details it was computed against plus
+    everything that changes the outcome (thresholds, taxonomy, analysis version,
+    and the month, since ongoing roles count up to the current date).
+    """
+    payload = json.dumps(
+        {
+            'candidate': {
+                key: candidate_info.get(key)
+                for key in ("Tech Stack", "Years of Experience", "Desired Position")
+            },
+            'thresholds': CONFIDENCE_THRESHOLDS,
+            'taxonomy': get_skill_taxonomy().version,
+            'version': ANALYSIS_VERSION,
+            'as_of': date.today().strftime('%Y-%m')
+        },
+        sort_keys=True,
+        default=str
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class ResumeCache:
+    """
+    Local disk cache of extracted resume text and consistency analyses,
+    keyed by the SHA-256 of the uploaded file.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, digest):
+        return os.path.join(self.directory, f"{digest}.json")
+
+    def _load(self, digest):
+        try:
+            with open(self._path(digest), encoding='utf-8') as entry_file:
+                entry = json.load(entry_file)
+        except (OSError, ValueError):
+            return None
+        if entry.get('extraction_version') != EXTRACTION_VERSION:
+            return None
+        return entry
+
+    def _store(self, digest, entry):
+        # Write to a temporary file first so readers never see a partial entry
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as entry_file:
+            json.dump(entry, entry_file)
+        os.replace(temp_path, self._path(digest))
+
+    def get_text(self, digest):
+        entry = self._load(digest)
+        return entry['text'] if entry else None
+
+    def set_text(self, digest, text):
+        with self._lock:
+            entry = self._load(digest) or {'extraction_version': EXTRACTION_VERSION, 'analyses': {}}
+            entry['text'] = text
+            self._store(digest, entry)
+
+    def get_analysis(self, digest, fingerprint):
+        """Cached (consistency_score, findings), or None"""
+        entry = self._load(digest)
+        if not entry or fingerprint not in entry.get('analyses', {}):
+            return None
+        consistency_score, findings = entry['analyses'][fingerprint]
+        return consistency_score, findings
+
+    def set_analysis(self, digest, fingerprint, consistency_score, findings):
+        with self._lock:
+            entry = self._load(digest)
+            if entry is None:
+                return
+            entry.setdefault('analyses', {})[fingerprint] = [consistency_score, findings]
+            self._store(digest, entry)
+
+
+_resume_cache = None
+_resume_cache_lock = threading.Lock()
+
+
+def get_resume_cache():
+    """Return the process-wide resume cache, or None if it is disabled"""
+    global _resume_cache
+    if not RESUME_CACHE['enabled']:
+        return None
+    if _resume_cache is None:
+        with _resume_cache_lock:
+            if _resume_cache is None:
+                _resume_cache = ResumeCache(RESUME_CACHE['directory'])
+    return _resume_cache
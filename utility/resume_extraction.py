@@ -0,0 +1,161 @@
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+import PyPDF2
+import docx
+from configuration.settings import RESUME_EXTRACTION
+
+PDF_MIME_TYPE = "application/pdf"
+DOCX_MIME_TYPE = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+
+
+class ResumeTooLargeError(ValueError):
+    """Raised for uploads above RESUME_EXTRACTION['max_bytes']"""
+
+
+class ResumeTruncatedError(RuntimeError):
+    """Raised after the text extracted so far when the rest of the resume was not read"""
+
+
+_extraction_pool = None
+_extraction_pool_lock = threading.Lock()
+
+
+def get_extraction_pool():
+    """Return the process pool used to extract pages of PDFs"""
+    global _extraction_pool
+    if _extraction_pool is None:
+        with _extraction_pool_lock:
+            if _extraction_pool is None:
+                _extraction_pool = ProcessPoolExecutor(max_workers=RESUME_EXTRACTION['workers'])
+    return _extraction_pool
+
+
+def recycle_extraction_pool(pool):
+    """
+    Stop pool's workers, including one stuck on a page, and let the next
+    get_extraction_pool() start a new pool. A running task cannot be cancelled,
+    so its process is terminated; other extractions on the pool see
+    BrokenProcessPool and resubmit to the new one.
+    """
+    global _extraction_pool
+    with _extraction_pool_lock:
+        if _extraction_pool is pool:
+            _extraction_pool = None
+    processes = list((pool._processes or {}).values())
+    pool.shutdown(wait=False, cancel_futures=True)
+    for process in processes:
+        process.terminate()
+
+
+def extract_pdf_pages(path, start, stop):
+    """Worker: text of pages [start, stop) of the PDF at path, one string per page"""
+    with open(path, 'rb') as pdf_file:
+        reader = PyPDF2.PdfReader(pdf_file)
+        return [reader.pages[number].extract_text() or '' for number in range(start, stop)]
+
+
+def iter_pdf_text(buffer, parallel=True):
+    """
+    Yield the text of each PDF page, newline terminated, in page order.
+
+    Only the first max_pages pages are read. Pages are extracted in the
+    extraction pool so that a pathological page is bounded by
+    task_timeout_seconds; long documents are split into page ranges that are
+    extracted in parallel, so callers can work on the opening pages while the
+    rest is parsed. Without parallel the document is one task. Workers open the
+    PDF from a file rather than receiving a copy of its bytes.
+
+    Raises:
+        ResumeTruncatedError: after the pages extracted so far, if a page range
+        did not finish within task_timeout_seconds or the PDF has more than
+        max_pages pages
+    """
+    total_pages = len(PyPDF2.PdfReader(buffer.stream()).pages)
+    page_count = min(total_pages, RESUME_EXTRACTION['max_pages'])
+    if page_count == 0:
+        return
+
+    if parallel and page_count >= RESUME_EXTRACTION['parallel_min_pages']:
+        step = RESUME_EXTRACTION['pages_per_task']
+    else:
+        step = page_count
+    ranges = [(start, min(start + step, page_count)) for start in range(0, page_count, step)]
+    timeout = RESUME_EXTRACTION['task_timeout_seconds']
+    path = buffer.spool_path()
+    pool = get_extraction_pool()
+    futures = [pool.submit(extract_pdf_pages, path, start, stop) for start, stop in ranges]
+    resubmitted = False
+    try:
+        for number in range(len(ranges)):
+            try:
+                pages = futures[number].result(timeout=timeout)
+            except BrokenProcessPool:
+                # Another extraction timed out and recycled the pool; move what is left to the new one
+                if resubmitted:
+                    raise
+                resubmitted = True
+                pool = get_extraction_pool()
+                futures[number:] = [pool.submit(extract_pdf_pages, path, start, stop) for start, stop in ranges[number:]]
+                pages = futures[number].result(timeout=timeout)
+            for page_text in pages:
+                yield page_text + '\n'
+    except FutureTimeoutError:
+        # The worker is stuck on a pathological page; the caller keeps what was
+        # extracted so far but must know the text is incomplete
+        recycle_extraction_pool(pool)
+        raise ResumeTruncatedError(
+            f"Resume text was cut short: a page range took longer than {timeout}s to extract"
+        )
+    finally:
+        for future in futures:
+            future.cancel()
+
+    if total_pages > page_count:
+        raise ResumeTruncatedError(f"Only the first {page_count} of {total_pages} resume pages were read")
+
+
+def iter_docx_text(buffer):
+    """Yield the text of each DOCX paragraph, newline terminated"""
+    document = docx.Document(buffer.stream())
+    for paragraph in document.paragraphs:
+        yield paragraph.text + "\n"
+
+
+def iter_resume_text(buffer, file_type, parallel=True):
+    """
+    Stream the text of a PDF or DOCX resume piece by piece (pages or paragraphs),
+    stopping once max_chars characters have been produced.
+    
+    Args:
+        buffer: ResumeBuffer with the file's bytes
+
+    Raises:
+        ResumeTooLargeError: if data is larger than max_bytes
+        ResumeTruncatedError: after the text read so far, if max_chars or max_pages
+        cut the resume short or a PDF page range timed out
+        ValueError: for unsupported file types
+    """
+    if len(buffer) > RESUME_EXTRACTION['max_bytes']:
+        limit_mb = RESUME_EXTRACTION['max_bytes'] / (1024 * 1024)
+        raise ResumeTooLargeError(f"Resume is larger than the {limit_mb:g} MB limit")
+
+    if file_type == PDF_MIME_TYPE:
+        pieces = iter_pdf_text(buffer, parallel)
+    elif file_type == DOCX_MIME_TYPE:
+        pieces = iter_docx_text(buffer)
+    else:
+        raise ValueError("Unsupported file format")
+
+    remaining = RESUME_EXTRACTION['max_chars']
+    try:
+        for piece in pieces:
+            if len(piece) > remaining:
+                yield piece[:remaining]
+                raise ResumeTruncatedError(
+                    f"Resume text was cut off at {RESUME_EXTRACTION['max_chars']} characters"
+                )
+            remaining -= len(piece)
+            yield piece
+    finally:
+        pieces.close()
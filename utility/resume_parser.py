@@ -0,0 +1,174 @@
+import re
+from collections import namedtuple
+from datetime import date
+
+# Section headings as they appear in resumes, after lowercasing and dropping punctuation
+SECTION_HEADINGS = {
+    'summary': ['summary', 'profile', 'professional summary', 'objective', 'career objective', 'about me'],
+    'experience': [
+        'experience', 'work experience', 'professional experience', 'employment', 'employment history',
+        'work history', 'career history', 'relevant experience', 'industry experience'
+    ],
+    'education': ['education', 'academic background', 'academics', 'qualifications', 'education and training'],
+    'skills': [
+        'skills', 'technical skills', 'core skills', 'key skills', 'core competencies', 'technologies',
+        'tech stack', 'tools and technologies', 'skills and tools'
+    ],
+    'projects': ['projects', 'personal projects', 'key projects', 'academic projects'],
+    'certifications': ['certifications', 'certificates', 'licenses and certifications', 'courses']
+}
+_HEADING_LOOKUP = {heading: section for section, headings in SECTION_HEADINGS.items() for heading in headings}
+_MAX_HEADING_LENGTH = 40
+
+_MONTHS = {
+    'jan': 1, 'feb': 2, 'mar': 3, 'apr': 4, 'may': 5, 'jun': 6,
+    'jul': 7, 'aug': 8, 'sep': 9, 'oct': 10, 'nov': 11, 'dec': 12
+}
+
+# Every quantifier is bounded by a literal or a character class that cannot
+# overlap its neighbour, so matching is linear in the length of the line.
+_DATE = r'(?:(?P<{0}_month>jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\.?[ ,]*|(?P<{0}_num>\d{{1,2}})[/.])?(?P<{0}_year>(?:19|20)\d{{2}})'
+_DATE_RANGE = re.compile(
+    r'(?<![\w/.])' + _DATE.format('start')
+    + r'\s*(?:-|–|—|to|till|until)\s*'
+    + r'(?:(?P<ongoing>present|current|now|today|date)|' + _DATE.format('end') + r')(?!\d)'
+)
+_STATED_YEARS = re.compile(
+    r'(?<!\d)(?P<years>\d{1,2})\s*\+?\s*(?:years?|yrs?)(?:\s+of)?(?:\s+[a-z-]+){0,3}?\s+experience'
+)
+
+DateRange = namedtuple('DateRange', ['start', 'end', 'section', 'line'])  # start/end as (year, month)
+
+
+def _month_index(year, month):
+    return year * 12 + month - 1
+
+
+def _heading_section(line):
+    """Section name if the line is a heading, else None"""
+    if len(line) > _MAX_HEADING_LENGTH:
+        return None
+    normalized = ' '.join(re.sub(r'[^a-z& ]', ' ', line.lower()).replace('&', 'and').split())
+    return _HEADING_LOOKUP.get(normalized)
+
+
+def _date_from_match(match, prefix, default_month):
+    year = int(match.group(f'{prefix}_year'))
+    month = default_month
+    if match.group(f'{prefix}_month'):
+        month = _MONTHS[match.group(f'{prefix}_month')]
+    elif match.group(f'{prefix}_num') and 1 <= int(match.group(f'{prefix}_num')) <= 12:
+        month = int(match.group(f'{prefix}_num'))
+    return year, month
+
+
+def merge_ranges(ranges):
+    """Merge overlapping (start, end) month-index intervals; returns sorted disjoint intervals"""
+    merged = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+class ResumeStructure:
+    """
+    Sections, dated roles and stated experience of a resume, built by parse_resume.
+
+    Attributes:
+        sections: Mapping of section name -> text; content before the first heading is under 'header'
+        date_ranges: Every date range found, as DateRange tuples in document order
+        employment: Merged employment periods as ((year, month), (year, month)) pairs
+        stated_years: Years of experience stated in the text ("5+ years of experience")
+        as_of: Date that open-ended ranges ("2019 - present") run until
+    """
+
+    def __init__(self, sections, date_ranges, stated_years, as_of):
+        self.sections = sections
+        self.date_ranges = date_ranges
+        self.stated_years = stated_years
+        self.as_of = as_of
+
+        # Count the experience section; without one, count every range outside education
+        counted = [r for r in date_ranges if r.section == 'experience']
+        if not counted:
+            counted = [r for r in date_ranges if r.section not in ('education', 'certifications')]
+        intervals = merge_ranges(
+            (_month_index(*r.start), _month_index(*r.end)) for r in counted if r.end >= r.start
+        )
+        self.employment = [((start // 12, start % 12 + 1), (end // 12, end % 12 + 1)) for start, end in intervals]
+        self.employment_months = sum(end - start for start, end in intervals)
+
+    @property
+    def timeline_years(self):
+        """Total employed time from the merged timeline, in years"""
+        return self.employment_months / 12
+
+    def experience_years(self):
+        """
+        Best estimate of total experience: the employment timeline if the resume
+        has dated roles, otherwise the largest stated figure. None if neither exists.
+        """
+        if self.employment:
+            return round(self.timeline_years, 1)
+        if self.stated_years:
+            return max(self.stated_years)
+        return None
+
+    def to_dict(self):
+        return {
+            'sections': list(self.sections),
+            'employment': [
+                {'start': f"{start[0]}-{start[1]:02d}", 'end': f"{end[0]}-{end[1]:02d}"}
+                for start, end in self.employment
+            ],
+            'timeline_years': round(self.timeline_years, 1),
+            'stated_years': self.stated_years,
+            'experience_years': self.experience_years(),
+            'as_of': self.as_of.isoformat()
+        }
+
+
+def parse_resume(resume_text, as_of=None):
+    """
+    Split a resume into sections and extract its employment timeline in a single
+    pass over its lines.
+
+    Args:
+        resume_text: Extracted resume text
+        as_of: Date used for ongoing roles; defaults to today
+    Returns:
+        ResumeStructure
+    """
+    as_of = as_of or date.today()
+    today = (as_of.year, as_of.month)
+    section = 'header'
+    section_lines = {section: []}
+    date_ranges = []
+    stated_years = []
+
+    for raw_line in resume_text.splitlines():
+        line = raw_line.strip()
+        if not line:
+            continue
+        heading = _heading_section(line)
+        if heading:
+            section = heading
+            section_lines.setdefault(section, [])
+            continue
+        section_lines[section].append(line)
+
+        if not any(char.isdigit() for char in line):
+            continue
+        lowered = line.lower()
+        for match in _DATE_RANGE.finditer(lowered):
+            start = _date_from_match(match, 'start', 1)
+            end = today if match.group('ongoing') else _date_from_match(match, 'end', 1)
+            date_ranges.append(DateRange(start, min(end, today), section, line))
+        for match in _STATED_YEARS.finditer(lowered):
+            stated_years.append(int(match.group('years')))
+
+    sections = {name: '\n'.join(lines) for name, lines in section_lines.items() if lines}
+    return ResumeStructure(sections, date_ranges, stated_years, as_of)
@@ -1,9 +1,14 @@
-import re
-import PyPDF2
-import docx
-import io
-import streamlit as st
-from config.settings import CONFIDENCE_THRESHOLDS
+import os
+from collections import namedtuple
+from configuration.settings import CONFIDENCE_THRESHOLDS
+from utility.diagnostics import error, warning
+from utility.skill_index import contains_term
+from utility.skill_taxonomy import get_skill_taxonomy
+from utility.resume_cache import get_resume_cache, resume_digest, analysis_fingerprint
+from utility.resume_extraction import PDF_MIME_TYPE, DOCX_MIME_TYPE, ResumeTruncatedError, iter_resume_text
+from utility.resume_buffer import ResumeBuffer
+from utility.resume_parser import parse_resume
+from utility.tracing import traced, annotate_span
 
 def generate_motivation_message(resume_analysis_results):
     """Generate personalized motivation based on resume analysis"""
@@ -20,80 +25,162 @@ def generate_motivation_message(resume_analysis_results):
     
     return message
 
+RESUME_MIME_TYPES = {
+    '.pdf': PDF_MIME_TYPE,
+    '.docx': DOCX_MIME_TYPE
+}
+
+# Results of the resume functions; problems are reported in diagnostics (see utility.diagnostics)
+ResumeExtraction = namedtuple('ResumeExtraction', ['digest', 'text', 'diagnostics'])
+ResumeScreening = namedtuple('ResumeScreening', ['text', 'consistency_score', 'findings', 'diagnostics'])
+
+
+class LocalResumeFile:
+    """
+    Resume on local disk exposing the parts of Streamlit's UploadedFile that
+    extract_resume uses, for batch jobs that run outside the UI. The file is
+    memory-mapped from its path rather than read.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.name = os.path.basename(path)
+        self.type = RESUME_MIME_TYPES.get(os.path.splitext(path)[1].lower(), "application/octet-stream")
+
+    def read(self):
+        with open(self.path, 'rb') as resume_file:
+            return resume_file.read()
+
+
 def extract_text_from_resume(uploaded_file):
     """Extract text from PDF or DOCX resume"""
-    text = ""
-    try:
-        if uploaded_file.type == "application/pdf":
-            pdf_reader = PyPDF2.PdfReader(io.BytesIO(uploaded_file.read()))
-            for page in pdf_reader.pages:
-                text += page.extract_text()
-        elif uploaded_file.type == "application/vnd.openxmlformats-officedocument.wordprocessingml.document":
-            doc = docx.Document(io.BytesIO(uploaded_file.read()))
-            for paragraph in doc.paragraphs:
-                text += paragraph.text + "\n"
-        else:
-            raise ValueError("Unsupported file format")
-        return text
-    except Exception as e:
-        st.error(f"Error processing resume: {str(e)}")
-        return ""
+    return extract_resume(uploaded_file).text
+
+
+@traced('resume_extraction')
+def extract_resume(uploaded_file, parallel=True, on_text=None):
+    """
+    Extract text from a PDF or DOCX resume. Files seen before (same bytes) are
+    served from the resume cache without parsing.
+    
+    Args:
+        parallel: Split long PDFs across the extraction process pool
+        on_text: Optional callback receiving each page/paragraph as it is extracted
+                 (or the whole cached text), so analysis can start on the first pages
+    Returns: ResumeExtraction (content digest, text, diagnostics); the text is
+    empty if the file could not be read, and partial (with a resume_truncated
+    warning, and not cached) if it was cut short by a timeout, max_pages or max_chars
+    """
+    # One view of the upload serves hashing and parsing; nothing is copied
+    with ResumeBuffer.open(uploaded_file) as buffer:
+        digest = resume_digest(buffer.view)
+        cache = get_resume_cache()
+        if cache:
+            cached_text = cache.get_text(digest)
+            if cached_text is not None:
+                annotate_span(cache_hit=True)
+                if on_text:
+                    on_text(cached_text)
+                return ResumeExtraction(digest, cached_text, [])
+        
+        pieces = []
+        diagnostics = []
+        try:
+            for piece in iter_resume_text(buffer, uploaded_file.type, parallel):
+                pieces.append(piece)
+                if on_text:
+                    on_text(piece)
+        except ResumeTruncatedError as e:
+            diagnostics.append(warning('resume_truncated', str(e)))
+        except Exception as e:
+            return ResumeExtraction(digest, "", [error('resume_unreadable', f"Error processing resume: {str(e)}")])
+    
+    text = ''.join(pieces)
+    # Incomplete text would be served for this file from then on
+    if cache and text.strip() and not diagnostics:
+        cache.set_text(digest, text)
+    return ResumeExtraction(digest, text, diagnostics)
+
+
+def analyze_resume(digest, resume_text, candidate_info, found_skills=None, complete=True):
+    """
+    analyze_resume_consistency, served from the resume cache when this resume was
+    already analyzed against the same details, thresholds and taxonomy.
+    Pass complete=False for truncated text: it is analyzed but not cached.
+    Returns: (consistency_score, findings)
+    """
+    cache = get_resume_cache() if complete else None
+    fingerprint = analysis_fingerprint(candidate_info)
+    if cache:
+        cached = cache.get_analysis(digest, fingerprint)
+        if cached is not None:
+            return cached
+    
+    consistency_score, findings = analyze_resume_consistency(resume_text, candidate_info, found_skills)
+    if cache:
+        cache.set_analysis(digest, fingerprint, consistency_score, findings)
+    return consistency_score, findings
+
+
+def screen_resume(uploaded_file, candidate_info):
+    """
+    Extract and analyze a resume in one step, using the resume cache for both.
+    The skill scan runs on each page as it is extracted.
+    Returns: ResumeScreening (resume_text, consistency_score, findings, diagnostics);
+    the score is None if no text could be extracted
+    """
+    skill_index = get_skill_taxonomy().index
+    found_skills = set()
+    digest, resume_text, diagnostics = extract_resume(
+        uploaded_file, on_text=lambda piece: found_skills.update(skill_index.find_skills(piece))
+    )
+    if not resume_text.strip():
+        if not diagnostics:
+            diagnostics = [error(
+                'resume_empty',
+                "Could not read any text from the resume. Please upload a text-based PDF or DOCX file."
+            )]
+        return ResumeScreening(resume_text, None, [], diagnostics)
+    complete = not any(diagnostic.code == 'resume_truncated' for diagnostic in diagnostics)
+    consistency_score, findings = analyze_resume(digest, resume_text, candidate_info, found_skills, complete)
+    return ResumeScreening(resume_text, consistency_score, findings, diagnostics)
 
         
-def analyze_resume_consistency(resume_text, candidate_info):
+@traced('resume_analysis')
+def analyze_resume_consistency(resume_text, candidate_info, found_skills=None):
     """
     Analyze resume for consistency with provided information
+    found_skills: canonical skills already scanned from resume_text, if available
     Returns: (consistency_score, findings)
     """
     findings = []
     consistency_score = 1.0  # Start with perfect score
+    resume_lower = resume_text.lower()
     
-    # Check years of experience
-    experience_patterns = [
-        r'(\d+)[\+]?\s*(?:years?|yrs?).+?experience',
-        r'experience.+?(\d+)[\+]?\s*(?:years?|yrs?)',
-        r'(\d{4})\s*-\s*(?:present|current|now|2024)',  # Add more year patterns
-    ]
-    
+    # Check years of experience against the employment timeline
     claimed_years = candidate_info.get("Years of Experience", 0)
-    years_found = []
-    
-    # Extract years from dates
-    for pattern in experience_patterns:
-        matches = re.finditer(pattern, resume_text.lower())
-        for match in matches:
-            if match.group(1).isdigit():
-                if len(match.group(1)) == 4:  # It's a year
-                    years = 2024 - int(match.group(1))
-                    years_found.append(years)
-                else:
-                    years_found.append(int(match.group(1)))
-    
-    if years_found:
-        max_years = max(years_found)
-        if abs(max_years - claimed_years) > 2:
-            consistency_score += CONFIDENCE_THRESHOLDS['experience_mismatch_penalty']
-            findings.append(f"Experience discrepancy: Claimed {claimed_years} years, Resume suggests {max_years} years")
-    
-    # Check skills match
-    claimed_skills = set(skill.lower() for skill in candidate_info.get("Tech Stack", []))
-    found_skills = set()
+    resume_years = parse_resume(resume_text).experience_years()
+    if resume_years is not None and abs(resume_years - claimed_years) > 2:
+        consistency_score += CONFIDENCE_THRESHOLDS['experience_mismatch_penalty']
+        findings.append(f"Experience discrepancy: Claimed {claimed_years} years, Resume suggests {resume_years:g} years")
     
-    # Build comprehensive tech stack regex
-    tech_keywords = {
-        'languages': r'python|java|javascript|c\+\+|ruby|php|swift|kotlin|go|rust',
-        'frameworks': r'django|flask|spring|react|angular|vue|express|rails|laravel',
-        'databases': r'sql|mysql|postgresql|mongodb|redis|elasticsearch|cassandra',
-        'tools': r'git|docker|kubernetes|jenkins|aws|azure|gcp|terraform|ansible'
-    }
+    # Check skills match with a single scan of the resume
+    taxonomy = get_skill_taxonomy()
+    claimed_skills = [skill for skill in candidate_info.get("Tech Stack", []) if skill.strip()]
+    if found_skills is None:
+        found_skills = taxonomy.index.find_skills(resume_lower, lowered=True)
     
-    for category, pattern in tech_keywords.items():
-        matches = re.finditer(pattern, resume_text.lower())
-        for match in matches:
-            found_skills.add(match.group())
+    missing_skills = []
+    for skill in claimed_skills:
+        if taxonomy.is_known(skill):
+            if taxonomy.canonicalize(skill) not in found_skills:
+                missing_skills.append(skill.lower())
+        elif not contains_term(resume_lower, skill):
+            # Skills outside the taxonomy are looked up directly
+            missing_skills.append(skill.lower())
     
     # Compare skills
-    missing_skills = claimed_skills - found_skills
+    missing_skills = list(dict.fromkeys(missing_skills))
     if missing_skills:
         penalty = len(missing_skills) * CONFIDENCE_THRESHOLDS['skill_mismatch_penalty']
         consistency_score += penalty
@@ -102,7 +189,7 @@ def analyze_resume_consistency(resume_text, candidate_info):
     # Check position alignment
     desired_position = candidate_info.get("Desired Position", "").lower()
     position_words = set(desired_position.split())
-    position_match = any(word in resume_text.lower() for word in position_words if len(word) > 3)
+    position_match = any(word in resume_lower for word in position_words if len(word) > 3)
     
     if not position_match:
         consistency_score += CONFIDENCE_THRESHOLDS['resume_mismatch_penalty']
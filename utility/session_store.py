@@ -0,0 +1,273 @@
+"""
+Durable storage for interview sessions.
+
+The plain-data part of a session (candidate details, questions, answers, scores,
+feedback, decision and report) is checkpointed after every answer as
+zlib-compressed JSON, keyed by a session id that is kept in the page URL. A
+browser that reconnects, whether after a restart or to another replica behind
+the proxy, picks the session up from the store instead of starting over.
+
+Live objects (the conversation chain, evaluation futures, the question
+prefetcher, the duplicate index and the confidence accumulator) are not stored;
+they are rebuilt on rehydration, and answers whose evaluation was still running
+are evaluated again.
+
+Every replica must point at the same store: the SQLite backend needs a database
+file on storage they share (SESSION_STORE_PATH), and the Redis backend
+(SESSION_STORE_BACKEND=redis) works across hosts.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from configuration.settings import SESSION_STORE
+
+try:
+    import redis
+except ImportError:  # Only needed for the redis backend
+    redis = None
+
+class StaleSessionError(RuntimeError):
+    """Raised when a checkpoint is older than the stored session, i.e. it was advanced elsewhere"""
+
+
+# Bump when the meaning of a stored key changes; older snapshots are then ignored
+SNAPSHOT_VERSION = 1
+
+PERSISTED_KEYS = (
+    'chat_history',
+    'total_messages',
+    'start_time',
+    'candidate_info',
+    'resume_consistency_score',
+    'resume_findings',
+    'current_question',
+    'technical_questions',
+    'current_question_index',
+    'questions_asked',
+    'answers',
+    'evaluation_scores',
+    'evaluation_feedback',
+    'last_submitted_question',
+    'assessment_state',
+    'confidence_level',
+    'current_decision',
+    'final_reasoning',
+    'assessment_completed',
+    'recommendation',
+    'report_cache'
+)
+
+
+def encode_snapshot(state, revision):
+    """Compressed snapshot of the persisted keys present in state"""
+    payload = {key: state[key] for key in PERSISTED_KEYS if key in state}
+    document = {'version': SNAPSHOT_VERSION, 'revision': revision, 'state': payload}
+    return zlib.compress(json.dumps(document, separators=(',', ':'), default=str).encode('utf-8'))
+
+
+def decode_snapshot(blob):
+    """(revision, state) from a snapshot, or None if it is unreadable or outdated"""
+    try:
+        document = json.loads(zlib.decompress(blob).decode('utf-8'))
+    except (zlib.error, ValueError):
+        return None
+    if document.get('version') != SNAPSHOT_VERSION:
+        return None
+    return document['revision'], document['state']
+
+
+class SQLiteSessionStore:
+    """
+    Sessions in a SQLite database. WAL mode lets several app processes on the
+    same host (or a shared volume) read and write it concurrently.
+    """
+
+    def __init__(self, path, ttl_seconds):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=10)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS sessions (
+                session_id TEXT PRIMARY KEY,
+                revision INTEGER NOT NULL,
+                snapshot BLOB NOT NULL,
+                updated REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_sessions_updated ON sessions (updated);
+        """)
+        self._conn.commit()
+
+    def load(self, session_id):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT snapshot FROM sessions WHERE session_id = ? AND updated >= ?",
+                (session_id, time.time() - self.ttl_seconds)
+            ).fetchone()
+        return row[0] if row else None
+
+    def revision(self, session_id):
+        """Stored revision of a session, or None if it is not stored"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT revision FROM sessions WHERE session_id = ? AND updated >= ?",
+                (session_id, time.time() - self.ttl_seconds)
+            ).fetchone()
+        return row[0] if row else None
+
+    def save(self, session_id, revision, blob):
+        """
+        Store a snapshot unless the same or a newer revision of the session is
+        already stored. Returns whether it was stored.
+        """
+        with self._lock:
+            stored = self._conn.execute(
+                """INSERT INTO sessions (session_id, revision, snapshot, updated) VALUES (?, ?, ?, ?)
+                   ON CONFLICT (session_id) DO UPDATE SET
+                       revision = excluded.revision, snapshot = excluded.snapshot, updated = excluded.updated
+                   WHERE excluded.revision > sessions.revision""",
+                (session_id, revision, sqlite3.Binary(blob), time.time())
+            ).rowcount
+            self._conn.commit()
+        return stored > 0
+
+    def delete(self, session_id):
+        with self._lock:
+            self._conn.execute("DELETE FROM sessions WHERE session_id = ?", (session_id,))
+            self._conn.commit()
+
+    def purge_expired(self):
+        """Delete sessions not checkpointed within the TTL; returns how many were removed"""
+        with self._lock:
+            removed = self._conn.execute(
+                "DELETE FROM sessions WHERE updated < ?", (time.time() - self.ttl_seconds,)
+            ).rowcount
+            self._conn.commit()
+        return removed
+
+
+class RedisSessionStore:
+    """Sessions in Redis, for replicas on different hosts. Expiry is left to Redis."""
+
+    # Compare-and-set on the revision, so a stale replica cannot overwrite newer progress
+    _SAVE_SCRIPT = """
+        local current = tonumber(redis.call('HGET', KEYS[1], 'revision') or '-1')
+        if tonumber(ARGV[1]) <= current then
+            return 0
+        end
+        redis.call('HSET', KEYS[1], 'revision', ARGV[1], 'snapshot', ARGV[2])
+        redis.call('EXPIRE', KEYS[1], ARGV[3])
+        return 1
+    """
+
+    def __init__(self, url, ttl_seconds):
+        self.ttl_seconds = ttl_seconds
+        self._client = redis.Redis.from_url(url)
+        self._save = self._client.register_script(self._SAVE_SCRIPT)
+
+    def _key(self, session_id):
+        return f"talentscout:session:{session_id}"
+
+    def load(self, session_id):
+        return self._client.hget(self._key(session_id), 'snapshot')
+
+    def revision(self, session_id):
+        revision = self._client.hget(self._key(session_id), 'revision')
+        return int(revision) if revision is not None else None
+
+    def save(self, session_id, revision, blob):
+        return bool(self._save(keys=[self._key(session_id)], args=[revision, blob, int(self.ttl_seconds)]))
+
+    def delete(self, session_id):
+        self._client.delete(self._key(session_id))
+
+    def purge_expired(self):
+        return 0
+
+
+def _sqlite_backend():
+    return SQLiteSessionStore(SESSION_STORE['path'], SESSION_STORE['ttl_seconds'])
+
+
+def _redis_backend():
+    if redis is None:
+        raise RuntimeError("The redis session store backend requires the redis package")
+    return RedisSessionStore(SESSION_STORE['redis_url'], SESSION_STORE['ttl_seconds'])
+
+
+# Backend name -> factory; add an entry here to plug in another store
+SESSION_BACKENDS = {
+    'sqlite': _sqlite_backend,
+    'redis': _redis_backend
+}
+
+_session_store = None
+_session_store_lock = threading.Lock()
+
+
+def get_session_store():
+    """Return the process-wide session store, or None if persistence is disabled"""
+    global _session_store
+    if not SESSION_STORE['enabled']:
+        return None
+    if _session_store is None:
+        with _session_store_lock:
+            if _session_store is None:
+                _session_store = SESSION_BACKENDS[SESSION_STORE['backend']]()
+                _session_store.purge_expired()
+    return _session_store
+
+
+def load_session(session_id):
+    """(revision, state) for a stored session, or None if there is no usable snapshot"""
+    store = get_session_store()
+    if store is None or not session_id:
+        return None
+    try:
+        blob = store.load(session_id)
+    except Exception:
+        # An unreachable store means starting afresh, not failing the page
+        return None
+    return decode_snapshot(bytes(blob)) if blob else None
+
+
+def stored_revision(session_id):
+    """Revision of the stored session, or None if it is not stored (or the store is unavailable)"""
+    store = get_session_store()
+    if store is None or not session_id:
+        return None
+    try:
+        return store.revision(session_id)
+    except Exception:
+        return None
+
+
+def checkpoint_session(session_id, state):
+    """
+    Store the persisted keys of state under session_id. The revision counter is
+    kept in state['session_revision']. Returns whether the checkpoint was stored.
+
+    Raises StaleSessionError if the store already holds this or a later revision,
+    i.e. state is behind a copy of the session that was advanced elsewhere.
+    """
+    store = get_session_store()
+    if store is None or not session_id:
+        return False
+    revision = state.get('session_revision', 0) + 1
+    try:
+        stored = store.save(session_id, revision, encode_snapshot(state, revision))
+    except Exception:
+        # A failed checkpoint must not interrupt the interview; the next one retries
+        return False
+    if not stored:
+        raise StaleSessionError(f"Session {session_id} was updated elsewhere")
+    state['session_revision'] = revision
+    return True
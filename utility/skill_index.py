@@ -0,0 +1,88 @@
+import re
+from collections import namedtuple
+
+# A hit on the lowercased text: canonical skill, alias as written, and its span
+SkillHit = namedtuple('SkillHit', ['skill', 'alias', 'start', 'end'])
+
+# Skills must not be glued to surrounding word characters, so "go" does not match
+# inside "good" and "sql" does not match inside "postgresql". "+" and "#" also
+# block a match after it so "c" cannot match the start of "c++" or "c#".
+_BEFORE = r'(?<![a-z0-9])'
+_AFTER = r'(?![a-z0-9+#])'
+
+
+def _trie_pattern(node):
+    """Regex for a character trie; shared prefixes are factored so matching never retries them"""
+    alternatives = []
+    terminal = False
+    for char in sorted(node):
+        if char == '':
+            terminal = True
+            continue
+        alternatives.append(re.escape(char) + _trie_pattern(node[char]))
+    if not alternatives:
+        return ''
+    pattern = alternatives[0] if len(alternatives) == 1 else '(?:' + '|'.join(alternatives) + ')'
+    if terminal:
+        # Optional suffix is greedy, so the longest alias wins
+        pattern = '(?:' + pattern + ')?'
+    return pattern
+
+
+class SkillIndex:
+    """
+    Skill matcher compiled once from a taxonomy of canonical skills and aliases.
+    
+    All aliases are folded into a single trie-shaped regex with word-boundary
+    guards, so scanning a resume is one pass over the lowercased text.
+    """
+
+    def __init__(self, taxonomy):
+        """
+        Args:
+            taxonomy: Mapping of canonical skill name -> list of aliases
+        """
+        self.aliases = {}
+        for skill, aliases in taxonomy.items():
+            for alias in [skill, *aliases]:
+                self.aliases.setdefault(alias.lower().strip(), skill.lower())
+        
+        trie = {}
+        for alias in self.aliases:
+            node = trie
+            for char in alias:
+                node = node.setdefault(char, {})
+            node[''] = True
+        self._pattern = re.compile(_BEFORE + '(?:' + _trie_pattern(trie) + ')' + _AFTER)
+
+    def canonicalize(self, name):
+        """Canonical skill for a name or alias, or the lowercased name if it is unknown"""
+        name = name.lower().strip()
+        return self.aliases.get(name, name)
+
+    def is_known(self, name):
+        return name.lower().strip() in self.aliases
+
+    def scan(self, text, lowered=False):
+        """
+        Return every skill mention in text as SkillHit tuples, in order of position.
+        Positions refer to the lowercased text; pass lowered=True if text already is.
+        """
+        if not lowered:
+            text = text.lower()
+        return [
+            SkillHit(self.aliases[match.group()], match.group(), match.start(), match.end())
+            for match in self._pattern.finditer(text)
+        ]
+
+    def find_skills(self, text, lowered=False):
+        """Set of canonical skills mentioned in text"""
+        return {hit.skill for hit in self.scan(text, lowered)}
+
+
+def contains_term(lowered_text, term):
+    """Word-boundary search for a term that is not in the taxonomy"""
+    term = term.lower().strip()
+    if not term:
+        return False
+    return re.search(_BEFORE + re.escape(term) + _AFTER, lowered_text) is not None
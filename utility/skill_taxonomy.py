@@ -0,0 +1,86 @@
+import hashlib
+import json
+import threading
+from configuration.settings import SKILL_TAXONOMY_PATH
+from utility.skill_index import SkillIndex
+
+
+class SkillTaxonomy:
+    """
+    In-memory skill taxonomy: canonical skills, their aliases and a category hierarchy.
+
+    The data file groups skills by category; each category may name a parent
+    category. Canonicalization is a single dict lookup, and the SkillIndex used
+    to scan text is only compiled the first time it is needed.
+    """
+
+    def __init__(self, data, version=None):
+        self.version = version
+        self.parents = {name: info.get('parent') for name, info in data.get('categories', {}).items()}
+        self.categories = {}
+        self.aliases = {}
+        self._skill_aliases = {}
+        self._index = None
+        self._index_lock = threading.Lock()
+
+        for category, skills in data.get('skills', {}).items():
+            for skill, aliases in skills.items():
+                skill = skill.lower().strip()
+                self.categories.setdefault(skill, category)
+                self._skill_aliases.setdefault(skill, []).extend(aliases)
+                for alias in [skill, *aliases]:
+                    self.aliases.setdefault(alias.lower().strip(), skill)
+
+    @classmethod
+    def from_file(cls, path):
+        with open(path, 'rb') as taxonomy_file:
+            raw = taxonomy_file.read()
+        return cls(json.loads(raw), version=hashlib.sha256(raw).hexdigest()[:16])
+
+    @property
+    def index(self):
+        """SkillIndex over every skill and alias, compiled on first use"""
+        if self._index is None:
+            with self._index_lock:
+                if self._index is None:
+                    self._index = SkillIndex(self._skill_aliases)
+        return self._index
+
+    def canonicalize(self, name):
+        """Canonical skill for a name or alias, or the lowercased name if it is unknown"""
+        name = name.lower().strip()
+        return self.aliases.get(name, name)
+
+    def is_known(self, name):
+        return name.lower().strip() in self.aliases
+
+    def category(self, name):
+        """Category of a skill, or None if it is unknown"""
+        return self.categories.get(self.canonicalize(name))
+
+    def ancestors(self, name):
+        """Category of a skill followed by its parent categories, most specific first"""
+        chain = []
+        category = self.category(name)
+        while category and category not in chain:
+            chain.append(category)
+            category = self.parents.get(category)
+        return chain
+
+    def in_category(self, name, category):
+        """True if the skill belongs to category or one of its sub-categories"""
+        return category in self.ancestors(name)
+
+
+_taxonomy = None
+_taxonomy_lock = threading.Lock()
+
+
+def get_skill_taxonomy():
+    """Return the process-wide taxonomy, loading the data file on first use"""
+    global _taxonomy
+    if _taxonomy is None:
+        with _taxonomy_lock:
+            if _taxonomy is None:
+                _taxonomy = SkillTaxonomy.from_file(SKILL_TAXONOMY_PATH)
+    return _taxonomy
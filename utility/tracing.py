@@ -0,0 +1,227 @@
+import functools
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from configuration.settings import TRACING
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a list of numbers"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, int(round(pct / 100 * len(ordered))))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+class Tracer:
+    """
+    Records spans (a named stage with its wall time, prompt/completion tokens and
+    whether it was a cache hit) into a fixed-size ring buffer.
+
+    Cumulative per-stage totals are kept alongside the buffer for the
+    Prometheus export. Finished spans are appended to a JSONL file and the
+    Prometheus text file is rewritten at most every export_interval_seconds.
+    The JSONL file is rotated to <path>.1 once it reaches jsonl_max_bytes.
+    """
+
+    def __init__(self, settings):
+        self.settings = settings
+        self._lock = threading.Lock()
+        self._export_lock = threading.Lock()  # Serializes file writes and rotation
+        self._spans = deque(maxlen=settings['buffer_size'])
+        self._unexported = []
+        self._totals = defaultdict(lambda: defaultdict(float))
+        self._last_export = time.monotonic()
+        self._active = threading.local()
+
+    def current_span(self):
+        """Innermost span open on this thread (a dict that can be annotated), or None"""
+        stack = getattr(self._active, 'stack', None)
+        return stack[-1] if stack else None
+
+    @contextmanager
+    def span(self, name, **attributes):
+        """
+        Time the enclosed block as a span. The yielded dict can be updated with
+        prompt_tokens, completion_tokens, cache_hit or other attributes.
+        """
+        record = {
+            'name': name,
+            'timestamp': time.time(),
+            'prompt_tokens': 0,
+            'completion_tokens': 0,
+            'cache_hit': False,
+            'error': None,
+            **attributes
+        }
+        stack = self._active.__dict__.setdefault('stack', [])
+        stack.append(record)
+        started = time.perf_counter()
+        try:
+            yield record
+        except BaseException as e:
+            record['error'] = type(e).__name__
+            raise
+        finally:
+            record['duration_ms'] = round((time.perf_counter() - started) * 1000, 3)
+            # Not necessarily the last entry: a streaming generator may close after later spans opened
+            del stack[max(i for i, open_span in enumerate(stack) if open_span is record)]
+            self.record(record)
+
+    def record(self, record):
+        """Add a finished span"""
+        if not self.settings['enabled']:
+            return
+        record.setdefault('timestamp', time.time())
+        record.setdefault('duration_ms', 0.0)
+        with self._lock:
+            self._spans.append(record)
+            self._unexported.append(record)
+            totals = self._totals[record['name']]
+            totals['count'] += 1
+            totals['seconds'] += record['duration_ms'] / 1000
+            totals['errors'] += 1 if record.get('error') else 0
+            totals['cache_hits'] += 1 if record.get('cache_hit') else 0
+            totals['prompt_tokens'] += record.get('prompt_tokens', 0)
+            totals['completion_tokens'] += record.get('completion_tokens', 0)
+            due = time.monotonic() - self._last_export >= self.settings['export_interval_seconds']
+        if due:
+            self.export()
+
+    def spans(self):
+        with self._lock:
+            return list(self._spans)
+
+    def aggregates(self):
+        """Per-stage latency percentiles, token totals and cache hit rate over the buffered spans"""
+        by_name = defaultdict(list)
+        for record in self.spans():
+            by_name[record['name']].append(record)
+
+        rows = []
+        for name, records in sorted(by_name.items()):
+            durations = [record['duration_ms'] for record in records]
+            cache_hits = sum(1 for record in records if record.get('cache_hit'))
+            rows.append({
+                'stage': name,
+                'count': len(records),
+                'errors': sum(1 for record in records if record.get('error')),
+                'p50_ms': round(percentile(durations, 50), 1),
+                'p95_ms': round(percentile(durations, 95), 1),
+                'max_ms': round(max(durations), 1),
+                'prompt_tokens': sum(record.get('prompt_tokens', 0) for record in records),
+                'completion_tokens': sum(record.get('completion_tokens', 0) for record in records),
+                'cache_hit_rate': round(cache_hits / len(records), 3)
+            })
+        return rows
+
+    def prometheus_text(self):
+        """Cumulative per-stage totals plus buffered latency quantiles in Prometheus text format"""
+        quantiles = {row['stage']: row for row in self.aggregates()}
+        with self._lock:
+            totals = {name: dict(values) for name, values in self._totals.items()}
+
+        lines = [
+            '# HELP talentscout_stage_seconds Wall time per pipeline stage',
+            '# TYPE talentscout_stage_seconds summary'
+        ]
+        for name, values in sorted(totals.items()):
+            if name in quantiles:
+                for quantile, key in (('0.5', 'p50_ms'), ('0.95', 'p95_ms')):
+                    lines.append(
+                        f'talentscout_stage_seconds{{stage="{name}",quantile="{quantile}"}} {quantiles[name][key] / 1000}'
+                    )
+            lines.append(f'talentscout_stage_seconds_sum{{stage="{name}"}} {values["seconds"]:.6f}')
+            lines.append(f'talentscout_stage_seconds_count{{stage="{name}"}} {int(values["count"])}')
+        for metric, key, description in (
+            ('talentscout_stage_errors_total', 'errors', 'Spans that ended with an exception'),
+            ('talentscout_cache_hits_total', 'cache_hits', 'Spans served from a cache'),
+            ('talentscout_prompt_tokens_total', 'prompt_tokens', 'Prompt tokens sent to the model'),
+            ('talentscout_completion_tokens_total', 'completion_tokens', 'Completion tokens received')
+        ):
+            lines.append(f'# HELP {metric} {description}')
+            lines.append(f'# TYPE {metric} counter')
+            for name, values in sorted(totals.items()):
+                lines.append(f'{metric}{{stage="{name}"}} {int(values[key])}')
+        return '\n'.join(lines) + '\n'
+
+    def export(self):
+        """Append new spans to the JSONL file and rewrite the Prometheus file"""
+        with self._lock:
+            pending, self._unexported = self._unexported, []
+            self._last_export = time.monotonic()
+        try:
+            if self.settings.get('jsonl_path') and pending:
+                path = self.settings['jsonl_path']
+                _ensure_directory(path)
+                with self._export_lock:
+                    self._rotate_jsonl(path)
+                    with open(path, 'a', encoding='utf-8') as trace_file:
+                        for record in pending:
+                            trace_file.write(json.dumps(record, default=str) + '\n')
+            if self.settings.get('prometheus_path'):
+                path = self.settings['prometheus_path']
+                _ensure_directory(path)
+                fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path) or '.', suffix='.tmp')
+                with os.fdopen(fd, 'w', encoding='utf-8') as metrics_file:
+                    metrics_file.write(self.prometheus_text())
+                os.replace(temp_path, path)
+        except OSError:
+            # Metrics export must never break the pipeline
+            pass
+
+
+    def _rotate_jsonl(self, path):
+        """Move the JSONL file to <path>.1 (replacing the previous backup) once it reaches jsonl_max_bytes"""
+        max_bytes = self.settings.get('jsonl_max_bytes')
+        if not max_bytes:
+            return
+        try:
+            size = os.path.getsize(path)
+        except FileNotFoundError:
+            return
+        if size >= max_bytes:
+            os.replace(path, path + '.1')
+
+
+def _ensure_directory(path):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+
+_tracer = None
+_tracer_lock = threading.Lock()
+
+
+def get_tracer():
+    """Return the process-wide tracer"""
+    global _tracer
+    if _tracer is None:
+        with _tracer_lock:
+            if _tracer is None:
+                _tracer = Tracer(TRACING)
+    return _tracer
+
+
+def annotate_span(**attributes):
+    """Set attributes (e.g. cache_hit=True) on the innermost open span of this thread, if any"""
+    span = get_tracer().current_span()
+    if span is not None:
+        span.update(attributes)
+
+
+def traced(name):
+    """Decorator recording each call of the function as a span called name"""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with get_tracer().span(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -1,4 +1,6 @@
 import re
+from utility.skill_taxonomy import get_skill_taxonomy
+
 def validate_email(email):
     pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
     return bool(re.match(pattern, email))
@@ -8,6 +10,15 @@ def validate_phone(phone):
     pattern = r'^\+?1?\d{9,15}$'
     return bool(re.match(pattern, phone))
 
+def normalize_tech_stack(tech_stack):
+    """Split a comma separated tech stack, dropping blanks and aliases of a skill already listed"""
+    taxonomy = get_skill_taxonomy()
+    techs = {}
+    for tech in tech_stack.split(','):
+        tech = tech.strip()
+        if tech:
+            techs.setdefault(taxonomy.canonicalize(tech), tech)
+    return list(techs.values())
+
 def validate_tech_stack(tech_stack):
-    techs = [tech.strip() for tech in tech_stack.split(',') if tech.strip()]
-    return len(techs) > 0
+    return len(normalize_tech_stack(tech_stack)) > 0